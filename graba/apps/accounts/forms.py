@@ -138,17 +138,15 @@ class UserProfileForm(forms.ModelForm):
                 self.fields['iva_number'].initial = shop.iva_number
 
             # --- Roles ---
-            roles = Role.objects.filter(user=user, state="ACTIVE")
-            self.fields['role_types'].initial = [r.type for r in roles]
+            roles = user.roles
+            self.fields['role_types'].initial = list(roles.instances())
 
             # --- Buyer / Seller ---
-            if user.has_role("BUYER"):
-                buyer = Buyer.objects.get(role__user=user)
-                self.fields['shipping_address'].initial = buyer.shipping_address
+            if roles.is_buyer:
+                self.fields['shipping_address'].initial = roles.buyer.shipping_address
 
-            if user.has_role("SELLER"):
-                seller = Seller.objects.get(role__user=user)
-                self.fields['collection_address'].initial = seller.collection_address
+            if roles.is_seller:
+                self.fields['collection_address'].initial = roles.seller.collection_address
 
     def clean(self):
         cleaned_data = super().clean()
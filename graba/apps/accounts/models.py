@@ -2,7 +2,7 @@ from typing import Dict, Any
 
 from django.db import models
 from django.utils import timezone
-from django.db.models import Count, Avg
+from django.utils.functional import cached_property
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.validators import ( 
@@ -32,26 +32,17 @@ class User(AbstractUser):
     state = models.CharField(max_length=10, choices=STATE_CHOICES, default='ACTIVE')
     legal_type = models.CharField(max_length=10, choices=LEGAL_TYPE_CHOICES, default='PRIVATE')
 
+    @cached_property
+    def roles(self):
+        """Active roles with their Buyer/Seller rows, loaded once per instance."""
+        from .roles import load_roles
+        return load_roles(self)
+
     def has_role(self, role_name: str) -> bool:
-        return Role.objects.filter(user=self, type=role_name).exists()
+        return self.roles.has(role_name)
     
     def get_role_instances(self) -> Dict[str, Any]:
-        roles = Role.objects.filter(user=self, state='ACTIVE')
-        instances: Dict[str, Any] = {}
-        
-        ROLE_TYPE_MAP = {
-            'BUYER': Buyer,
-            'SELLER': Seller
-        }
-        
-        for role in roles:
-            model = ROLE_TYPE_MAP.get(role.type)
-            if model:
-                instance = model.object.filter(role=role).first()
-                if instance:
-                    instances[role.type] = instance
-
-        return instances
+        return self.roles.instances()
     
     def __str__(self):
         return self.username
@@ -108,10 +99,11 @@ class Seller(models.Model):
     
     @property
     def rating_stats(self):
-        return self.reviews.aggregate(
-            count=Count('id'),
-            avg=Avg('rating')
-        )
+        """Review count, average and histogram, from the rating counters."""
+        summary = getattr(self, 'rating_summary', None)
+        if summary is None:
+            return {'count': 0, 'avg': None, 'histogram': {stars: 0 for stars in range(5, 0, -1)}}
+        return {'count': summary.count, 'avg': summary.avg, 'histogram': summary.histogram}
 
     def __str__(self):
         return f"Seller {self.role.user.username}"
@@ -0,0 +1,166 @@
+"""
+Profile page data.
+
+The header of a profile (user fields, legal profile, counts and seller
+rating) is a summary built with a few queries and cached under a per-user
+version key; changes to any of its sources bump the version (see
+core.signals). The lists (auctions, favorites, reviews) are keyset
+paginated sections: the page renders their first page, and
+ProfileSectionView serves the others alone. Neither depends on how many
+rows the user has.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List
+
+from core.cache import get_version, bump_version
+from core.pagination import KeysetPaginator, KeysetPage
+
+from .models import User, Seller
+
+
+def version_key(user_id: int) -> str:
+    return f"user:{user_id}:profile:version"
+
+
+def invalidate(user_id: int):
+    bump_version(version_key(user_id))
+
+
+@dataclass(frozen=True)
+class ProfileSummary:
+    id: int
+    username: str
+    email: str
+    bio: str
+    registration_date: datetime
+    state: str
+    legal_type: str
+    first_name: str
+    last_name: str
+    shopkeeper: Dict | None
+    seller_id: int | None
+    auctions_count: int
+    favorites_count: int
+    rating: Dict | None
+
+
+def load_summary(user_id: int) -> ProfileSummary | None:
+    """
+    Builds the summary of the user (None if missing) with four queries.
+    """
+    from auctions.models import Auction
+    from favorites.models import FavoriteAuction
+
+    user = User.objects.select_related("private", "shopkeeper").filter(pk=user_id).first()
+    if user is None:
+        return None
+
+    private = getattr(user, "private", None)
+    shopkeeper = getattr(user, "shopkeeper", None)
+
+    seller = (
+        Seller.objects
+        .select_related("rating_summary")
+        .filter(role__user_id=user_id, role__type="SELLER")
+        .first()
+    )
+
+    return ProfileSummary(
+        id=user.pk,
+        username=user.username,
+        email=user.email,
+        bio=user.bio,
+        registration_date=user.registration_date,
+        state=user.state,
+        legal_type=user.legal_type,
+        first_name=private.first_name if private else user.first_name,
+        last_name=private.last_name if private else user.last_name,
+        shopkeeper={
+            "business_name": shopkeeper.business_name,
+            "headquarters_address": shopkeeper.headquarters_address,
+            "iva_number": shopkeeper.iva_number,
+        } if shopkeeper else None,
+        seller_id=seller.pk if seller else None,
+        auctions_count=Auction.objects.filter(seller=seller).count() if seller else 0,
+        favorites_count=FavoriteAuction.objects.filter(user_id=user_id).count(),
+        rating=seller.rating_stats if seller else None,
+    )
+
+
+def get_summary(user_id: int) -> ProfileSummary | None:
+    """
+    Returns the cached summary of the user, rebuilding it on a new version.
+    """
+    key = f"user:{user_id}:profile:{get_version(version_key(user_id))}"
+    summary = cache.get(key)
+    if summary is None:
+        summary = load_summary(user_id)
+        if summary is not None:
+            cache.set(key, summary, timeout=settings.ACCOUNTS_PROFILE_CACHE_TIMEOUT)
+    return summary
+
+
+# === Sections ===
+
+AUCTIONS_PER_PAGE = 3
+REVIEWS_PER_PAGE = 5
+
+# Section name: (cursor argument, page size)
+SECTIONS = {
+    "auctions": ("auc_cursor", AUCTIONS_PER_PAGE),
+    "favorites": ("fav_cursor", AUCTIONS_PER_PAGE),
+    "reviews": ("rev_cursor", REVIEWS_PER_PAGE),
+}
+
+
+def is_visible(section: str, summary: ProfileSummary, viewer) -> bool:
+    if section == "favorites":
+        # Only the owner sees their favorites
+        return viewer.is_authenticated and viewer.pk == summary.id
+    return summary.seller_id is not None
+
+
+def section_queryset(section: str, summary: ProfileSummary, viewer):
+    from auctions.models import Auction
+    from reviews.models import Review
+
+    if section == "auctions":
+        return Auction.objects.filter(seller_id=summary.seller_id).with_card_data(viewer)
+    if section == "favorites":
+        return Auction.objects.filter(favoriteauction__user_id=summary.id).with_card_data(viewer)
+    return (
+        Review.objects
+        .filter(seller_id=summary.seller_id)
+        .select_related("winner_offer__auction", "winner_offer__offer__buyer__role__user")
+    )
+
+
+def get_section_page(section: str, summary: ProfileSummary, viewer, cursor: str | None = None) -> KeysetPage:
+    """
+    Returns a page of the section with a single query.
+    Raises ValueError if the cursor is malformed.
+    """
+    _, per_page = SECTIONS[section]
+    return KeysetPaginator(section_queryset(section, summary, viewer), per_page).get_page(cursor)
+
+
+def reviewable_auctions(buyer, seller_id: int | None) -> List[Dict]:
+    """
+    Closed auctions of the seller won by the buyer and not reviewed yet.
+    """
+    from auctions.models import WinnerOffer
+
+    if buyer is None or seller_id is None:
+        return []
+
+    winner_offers = (
+        WinnerOffer.objects
+        .filter(offer__buyer=buyer, auction__seller_id=seller_id, auction__status="CLOSED")
+        .exclude(review__isnull=False)
+        .select_related("auction")
+    )
+    return [{"winner_offer_id": wo.pk, "auction_title": wo.auction.title} for wo in winner_offers]
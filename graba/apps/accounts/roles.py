@@ -0,0 +1,182 @@
+"""
+Per-request access to the roles of a user.
+
+The active roles of a user, their Buyer/Seller rows and the legal profile
+(Private/Shopkeeper) are loaded together with a single query, once per user
+instance (``user.roles``) and so once per request (``request.roles``, set by
+RolesMiddleware). With ``ACCOUNTS_ROLES_SESSION_CACHE`` the primary keys are
+also kept in the session, and requests only read a version key from the
+cache; role and profile changes bump that version (see core.signals).
+"""
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from typing import Any, Dict
+
+from core.cache import get_version, bump_version
+
+from .models import Role, Buyer, Seller, Private, Shopkeeper
+
+
+SESSION_KEY = "_roles"
+
+
+def version_key(user_id: int) -> str:
+    return f"user:{user_id}:roles:version"
+
+
+def invalidate(user_id: int):
+    bump_version(version_key(user_id))
+
+
+class UserRoles:
+    """
+    The active roles of a user. Anonymous users have none.
+    """
+
+    def __init__(self, buyer: Buyer | None = None, seller: Seller | None = None,
+                 legal_profile: Private | Shopkeeper | None = None):
+        self.buyer = buyer
+        self.seller = seller
+        self.legal_profile = legal_profile
+
+    @property
+    def is_buyer(self) -> bool:
+        return self.buyer is not None
+
+    @property
+    def is_seller(self) -> bool:
+        return self.seller is not None
+
+    def has(self, role_name: str) -> bool:
+        return self.instances().get(role_name) is not None
+
+    def instances(self) -> Dict[str, Any]:
+        """Buyer/Seller rows by role type (only the active roles)."""
+        return {
+            role_type: instance
+            for role_type, instance in (("BUYER", self.buyer), ("SELLER", self.seller))
+            if instance is not None
+        }
+
+    def is_seller_of(self, auction) -> bool:
+        # Seller rows are keyed by their role: no need to walk seller.role.user
+        return self.seller is not None and auction.seller_id == self.seller.pk
+
+    # === Session Cache ===
+
+    def to_session(self, user_id: int, version: int) -> Dict:
+        return {
+            "user": user_id,
+            "version": version,
+            "buyer": self.buyer.pk if self.buyer else None,
+            "seller": self.seller.pk if self.seller else None,
+            "legal": type(self.legal_profile).__name__ if self.legal_profile else None,
+        }
+
+    @classmethod
+    def from_session(cls, data: Dict, user) -> "UserRoles":
+        # Only the keys are known: the other fields load on first access, while
+        # role.user and profile.user point to the request user
+        def role_row(model, pk, role_type):
+            if pk is None:
+                return None
+            role = Role.from_db(None, ["id", "user_id", "type", "state"], [pk, user.pk, role_type, "ACTIVE"])
+            role.user = user
+            row = model.from_db(None, ["role_id"], [pk])
+            row.role = role
+            return row
+
+        legal_profile = None
+        legal = {"Private": Private, "Shopkeeper": Shopkeeper}.get(data["legal"])
+        if legal is not None:
+            legal_profile = legal.from_db(None, ["user_id"], [user.pk])
+            legal_profile.user = user
+
+        return cls(
+            buyer=role_row(Buyer, data["buyer"], "BUYER"),
+            seller=role_row(Seller, data["seller"], "SELLER"),
+            legal_profile=legal_profile,
+        )
+
+
+def load_roles(user) -> UserRoles:
+    """
+    Loads the roles of the user with a single query.
+    """
+    if not user.is_authenticated:
+        return UserRoles()
+
+    roles = list(
+        Role.objects
+        .filter(user=user, state="ACTIVE")
+        .select_related("buyer", "seller", "user__private", "user__shopkeeper")
+    )
+
+    def related(obj, name):
+        return getattr(obj, name, None)
+
+    buyer = seller = None
+    for role in roles:
+        if role.type == "BUYER":
+            buyer = related(role, "buyer")
+        elif role.type == "SELLER":
+            seller = related(role, "seller")
+
+    if roles:
+        owner = roles[0].user
+        legal_profile = related(owner, "private") or related(owner, "shopkeeper")
+    else:
+        # No active role to join the profile from
+        legal_profile = Private.objects.filter(user=user).first() or Shopkeeper.objects.filter(user=user).first()
+
+    return UserRoles(buyer=buyer, seller=seller, legal_profile=legal_profile)
+
+
+def get_roles(request) -> UserRoles:
+    """
+    Roles of the request user, from the session when enabled and still current.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return UserRoles()
+
+    if not getattr(settings, "ACCOUNTS_ROLES_SESSION_CACHE", False):
+        return user.roles
+
+    version = get_version(version_key(user.pk))
+    data = request.session.get(SESSION_KEY)
+    if data and data["user"] == user.pk and data["version"] == version:
+        roles = UserRoles.from_session(data, user)
+    else:
+        roles = user.roles
+        request.session[SESSION_KEY] = roles.to_session(user.pk, version)
+
+    # Shared with the role checks going through the user
+    user.roles = roles
+    return roles
+
+
+async def aget_roles(request) -> UserRoles:
+    return await sync_to_async(get_roles)(request)
+
+
+class RolesMiddleware:
+    """
+    Sets request.roles, loaded lazily on first access (async views use
+    aget_roles instead). Must come after AuthenticationMiddleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.roles = SimpleLazyObject(lambda: get_roles(request))
+        # A coroutine in async mode, awaited by the handler
+        return self.get_response(request)
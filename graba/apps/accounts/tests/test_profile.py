@@ -0,0 +1,114 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+
+from accounts import profile
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction, Offer, WinnerOffer
+from favorites.models import FavoriteAuction
+from reviews.models import Review
+
+
+class UserProfileTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(user=self.seller_user, type="SELLER")
+        self.seller = Seller.objects.create(role=seller_role, collection_address="Test address")
+
+        self.buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(user=self.buyer_user, type="BUYER")
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+        self.url = reverse("accounts:profile", args=[self.seller_user.pk])
+
+    def add_reviewed_auctions(self, n):
+        for i in range(n):
+            auction = Auction.objects.create(
+                seller=self.seller,
+                title=f"Auction {Auction.objects.count()}",
+                status="CLOSED",
+                start_date=timezone.now() - timedelta(days=2, minutes=i),
+                end_date=timezone.now() - timedelta(days=1),
+                min_price_cents=100,
+            )
+            offer = Offer.objects.create(auction=auction, buyer=self.buyer, type="BUY_NOW", amount_cents=100)
+            winner_offer = WinnerOffer.objects.create(auction=auction, offer=offer)
+            Review.objects.create(seller=self.seller, winner_offer=winner_offer, rating=1 + i % 5)
+            FavoriteAuction.objects.create(user=self.seller_user, auction=auction)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_the_profile(self):
+        self.client.force_login(self.seller_user)
+
+        self.add_reviewed_auctions(2)
+        cache.clear()
+        small = self.count_queries()
+
+        self.add_reviewed_auctions(20)
+        cache.clear()
+        large = self.count_queries()
+
+        self.assertEqual(small, large)
+
+        # The summary now comes from the cache
+        self.assertLess(self.count_queries(), large)
+
+    def test_summary_is_invalidated_on_change(self):
+        self.assertEqual(profile.get_summary(self.seller_user.pk).auctions_count, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_reviewed_auctions(1)
+
+        summary = profile.get_summary(self.seller_user.pk)
+        self.assertEqual(summary.auctions_count, 1)
+        self.assertEqual(summary.favorites_count, 1)
+        self.assertEqual(summary.rating["count"], 1)
+
+    def test_section_pages(self):
+        self.add_reviewed_auctions(profile.REVIEWS_PER_PAGE + 1)
+
+        response = self.client.get(self.url)
+        first_page = response.context["reviews_page_obj"]
+        self.assertEqual(len(first_page), profile.REVIEWS_PER_PAGE)
+        self.assertTrue(first_page.has_next())
+
+        section_url = reverse("accounts:profile-section", args=[self.seller_user.pk, "reviews"])
+        response = self.client.get(section_url, {"rev_cursor": first_page.next_cursor})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["page_obj"]), 1)
+        self.assertFalse(response.context["page_obj"].has_next())
+
+        response = self.client.get(section_url, {"rev_cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_favorites_are_only_shown_to_the_owner(self):
+        self.add_reviewed_auctions(1)
+        section_url = reverse("accounts:profile-section", args=[self.seller_user.pk, "favorites"])
+
+        self.client.force_login(self.buyer_user)
+        self.assertEqual(self.client.get(section_url).status_code, 404)
+        self.assertIsNone(self.client.get(self.url).context["favorites_page_obj"])
+
+        self.client.force_login(self.seller_user)
+        self.assertEqual(self.client.get(section_url).status_code, 200)
@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+
+from accounts.models import User, Role, Buyer, Seller, Private
+from auctions.models import Auction
+
+
+class UserRolesTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            email="user@email.com",
+            username="user",
+            password="testpass"
+        )
+        Private.objects.create(user=self.user, first_name="A", last_name="B", fiscal_code="ABCDEF12G34H567I")
+
+        buyer_role = Role.objects.create(user=self.user, type="BUYER")
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+        seller_role = Role.objects.create(user=self.user, type="SELLER")
+        self.seller = Seller.objects.create(role=seller_role, collection_address="Test address")
+
+        self.own_auction = Auction.objects.create(
+            seller=self.seller,
+            title="Own Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100,
+        )
+
+    def test_roles_are_loaded_with_one_query(self):
+        user = User.objects.get(pk=self.user.pk)
+
+        with self.assertNumQueries(1):
+            roles = user.roles
+            self.assertEqual(roles.buyer, self.buyer)
+            self.assertEqual(roles.seller, self.seller)
+            self.assertIsInstance(roles.legal_profile, Private)
+            self.assertTrue(user.has_role("BUYER") and user.has_role("SELLER"))
+            self.assertEqual(user.get_role_instances(), {"BUYER": self.buyer, "SELLER": self.seller})
+            self.assertTrue(roles.is_seller_of(self.own_auction))
+
+    def test_suspended_roles_are_ignored(self):
+        Role.objects.filter(user=self.user, type="SELLER").update(state="SUSPENDED")
+        user = User.objects.get(pk=self.user.pk)
+
+        self.assertFalse(user.has_role("SELLER"))
+        self.assertTrue(user.has_role("BUYER"))
+
+    def test_seller_cannot_bid_on_own_auction(self):
+        self.client.login(email="user@email.com", password="testpass")
+        response = self.client.post(reverse("auctions:auction-bid", args=[self.own_auction.pk]), {"amount": "5"})
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["error"], "Sellers cannot bid on their own auction.")
+
+    @override_settings(ACCOUNTS_ROLES_SESSION_CACHE=True)
+    def test_session_cache(self):
+        self.client.login(email="user@email.com", password="testpass")
+        url = reverse("auctions:create")
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        # Served from the session
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertFalse(any('FROM "accounts_role"' in q["sql"] for q in queries))
+
+        # Role changes are seen by the next request
+        with self.captureOnCommitCallbacks(execute=True):
+            Role.objects.get(user=self.user, type="SELLER").delete()
+        self.assertEqual(self.client.get(url).status_code, 403)
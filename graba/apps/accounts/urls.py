@@ -1,4 +1,4 @@
-from .views import UserLoginView, UserRegisterView, UserProfileUpdateView, UserProfileDetailView
+from .views import UserLoginView, UserRegisterView, UserProfileUpdateView, UserProfileDetailView, ProfileSectionView, UserStateView
 from django.contrib.auth import views as auth_views
 from django.urls import path
 
@@ -11,5 +11,7 @@ urlpatterns = [
     path('signin/', UserRegisterView.as_view(), name='signin'),
     path('logout/', auth_views.LogoutView.as_view(next_page='core:home'), name='logout'),
     path('profile/edit/', UserProfileUpdateView.as_view(), name='edit'),
+    path('state/', UserStateView.as_view(), name='state'),
     path('profile/<int:pk>/', UserProfileDetailView.as_view(), name='profile'),
+    path('profile/<int:pk>/<slug:section>/', ProfileSectionView.as_view(), name='profile-section'),
 ]
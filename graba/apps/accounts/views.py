@@ -4,18 +4,20 @@ from django.contrib.auth import authenticate, login
 from django.views.generic.edit import FormView, UpdateView
 from django.views.generic.detail import DetailView
 from django.views.generic import TemplateView
+from django.views import View
 from django.shortcuts import render, redirect
 from django.urls import reverse, reverse_lazy
-from django.core.paginator import Paginator
 from django.db import transaction
-from django.http import Http404
+from django.http import Http404, JsonResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_cache_control
 
 from .forms import UserRegistrationForm, CustomLoginForm, UserProfileForm
 from .models import User, Role, Buyer, Seller, Private, Shopkeeper
 from .mixins import RedirectAuthenticatedUserMixin
+from . import profile
 
-from reviews.models import Review
-from auctions.models import Auction, WinnerOffer
+from core.shared_pages import SharedPageMixin
 from favorites.models import FavoriteAuction
 
 
@@ -94,98 +96,146 @@ class UserProfileUpdateView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
 
-class UserProfileDetailView(TemplateView):
+class UserProfileDetailView(SharedPageMixin, TemplateView):
     template_name = "accounts/profile.html"
 
     def get_context_data(self, **kwargs):
         context = super(UserProfileDetailView, self).get_context_data(**kwargs)
 
 
-        # Adding the profile user to the context (if exists)
-        profile_user_pk = self.kwargs.get("pk")
-        try:
-            user_obj = User.objects.get(pk=profile_user_pk)
-        except User.DoesNotExist:
+        # Adding the profile summary to the context (if the user exists)
+        summary = profile.get_summary(self.kwargs.get("pk"))
+        if summary is None:
             raise Http404("User not found")
-        context["profile_user"] = user_obj
+        context["profile_user"] = summary
+
+
+        # RATING
+        if summary.rating is not None:
+            rating = summary.rating
+            context['reviews_count'] = rating['count']
+            context['average_rating'] = float(rating['avg'] or 0)
+            context['rating_histogram'] = [
+                (stars, count, round(100 * count / rating['count']) if rating['count'] else 0)
+                for stars, count in rating['histogram'].items()
+            ]
+        else:
+            context['reviews_count'] = None
+            context['average_rating'] = None
 
 
-        # Copy GET and remove 'page'
-        params = self.request.GET.copy()
-        params._mutable = True
-        params.pop('fav_page', None)
-        params.pop('auc_page', None)
-        
-        # Querystring clear for pagination
-        context['querystring'] = params.urlencode()
-        
-        
-        # Add favorites to context ONLY if user is authenticated
-        context['user_favorites'] = set(
-            FavoriteAuction.objects.filter(user=user_obj)
-            .values_list('auction_id', flat=True)
-        )
-        
+        # SECTIONS (auctions, favorites, reviews): one page each
+        for section, (arg_name, _) in profile.SECTIONS.items():
+            context[f"{section}_page_obj"] = None
+            if not profile.is_visible(section, summary, self.request.user):
+                continue
+            try:
+                context[f"{section}_page_obj"] = profile.get_section_page(
+                    section, summary, self.request.user, self.request.GET.get(arg_name)
+                )
+            except ValueError:
+                raise Http404("Invalid cursor.")
 
-        # FAVORITE AUCTIONS PAGINATION
-        fav_list = Auction.objects.filter(favoriteauction__user=user_obj)
-        fav_page = self.request.GET.get("fav_page", 1)
+        context['querystring'] = section_querystring(self.request)
 
-        fav_paginator = Paginator(fav_list, 3)
-        context["fav_page_obj"] = fav_paginator.get_page(fav_page)
-        
-        
-        # USER AUCTIONS PAGINATION
-        seller_instance = Seller.objects.filter(role__user=user_obj, role__type='SELLER').first()
-        if seller_instance:
-            auc_list = Auction.objects.filter(seller=seller_instance)
-        else:
-            auc_list = Auction.objects.none()
-        auc_page = self.request.GET.get("auc_page", 1)
-        
-        auc_paginator = Paginator(auc_list, 3)
-        context["auc_page_obj"] = auc_paginator.get_page(auc_page)
 
+        # REVIEWABLE AUCTIONS
+        context['reviewable_auctions'] = profile.reviewable_auctions(self.request.roles.buyer, summary.seller_id)
 
-        # REVIEWS
-        if seller_instance:
-            context['reviews'] = seller_instance.reviews.all()
-            rating_stats = seller_instance.rating_stats
-            context['reviews_count'] = rating_stats.get('count')
-            context['average_rating'] = float(rating_stats.get('avg') or 0)
-        else:
-            context['reviews'] = Review.objects.none()
-            context['reviews_count'] = None
-            context['average_rating'] = None
 
+        return context
 
-        # REVIEWABLE AUCTIONS
-        context['reviewable_auctions'] = []
 
-        if self.request.user.is_authenticated:
-            try:
-                buyer_instance = Buyer.objects.get(role__user=self.request.user)
-
-                winner_offers_qs = (
-                    WinnerOffer.objects
-                    .filter(
-                        offer__buyer=buyer_instance,
-                        auction__seller=seller_instance,
-                        auction__status="CLOSED"
-                    )
-                    .exclude(
-                        review__isnull=False
-                    )
-                    .select_related('auction')
-                )
+class ProfileSectionView(SharedPageMixin, TemplateView):
+    """
+    A page of one section of a profile, loaded by the profile page in place.
+    """
+
+    def is_shared(self):
+        # Favorites are only shown to their owner
+        return super().is_shared() and self.kwargs["section"] != "favorites"
 
-                context['reviewable_auctions'] = [{
-                    "winner_offer_id": wo.pk,
-                    "auction_title": wo.auction.title
-                } for wo in winner_offers_qs]
+    def get_template_names(self):
+        if self.kwargs["section"] == "reviews":
+            return ["accounts/includes/profile_reviews.html"]
+        return ["accounts/includes/profile_auctions.html"]
+
+    def get_context_data(self, **kwargs):
+        context = super(ProfileSectionView, self).get_context_data(**kwargs)
 
-            except Buyer.DoesNotExist:
-                pass
+        section = self.kwargs["section"]
+        if section not in profile.SECTIONS:
+            raise Http404("Unknown section")
 
+        summary = profile.get_summary(self.kwargs["pk"])
+        if summary is None or not profile.is_visible(section, summary, self.request.user):
+            raise Http404("Section not found")
 
+        arg_name, _ = profile.SECTIONS[section]
+        try:
+            context["page_obj"] = profile.get_section_page(
+                section, summary, self.request.user, self.request.GET.get(arg_name)
+            )
+        except ValueError:
+            raise Http404("Invalid cursor.")
+
+        context["section"] = section
+        context["profile_user"] = summary
+        context["page_arg_name"] = arg_name
+        context["querystring"] = section_querystring(self.request)
         return context
+
+
+def section_querystring(request) -> str:
+    # Copy GET without the section cursors: each section adds its own
+    params = request.GET.copy()
+    params._mutable = True
+    for arg_name, _ in profile.SECTIONS.values():
+        params.pop(arg_name, None)
+    return params.urlencode()
+
+
+class UserStateView(View):
+    """
+    The parts of the shared pages that depend on the user (see
+    core.shared_pages), as JSON. Never cached.
+    """
+    MAX_AUCTIONS = 100
+
+    def get(self, request):
+        user = request.user
+        state = {"authenticated": user.is_authenticated}
+
+        if user.is_authenticated:
+            roles = request.roles
+
+            # Favorites among the auctions shown (?auctions=1,2,3)
+            auction_ids = [int(pk) for pk in request.GET.get("auctions", "").split(",") if pk.isdigit()]
+            favorites = FavoriteAuction.objects.filter(
+                user=user, auction_id__in=auction_ids[:self.MAX_AUCTIONS]
+            ).values_list("auction_id", flat=True) if auction_ids else []
+
+            # Auctions the user can review on the profile shown (?profile=<user id>)
+            summary = None
+            if request.GET.get("profile", "").isdigit():
+                summary = profile.get_summary(int(request.GET["profile"]))
+
+            state.update({
+                "user": {
+                    "id": user.pk,
+                    "username": user.username,
+                    "profile_url": reverse("accounts:profile", args=[user.pk]),
+                },
+                "is_buyer": roles.is_buyer,
+                "is_seller": roles.is_seller,
+                "seller_id": roles.seller.pk if roles.seller else None,
+                "favorites": list(favorites),
+                "reviewable_auctions": profile.reviewable_auctions(
+                    roles.buyer, summary.seller_id if summary else None
+                ),
+                "csrf_token": get_token(request),
+            })
+
+        response = JsonResponse(state)
+        patch_cache_control(response, private=True, no_store=True)
+        return response
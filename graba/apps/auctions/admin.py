@@ -3,5 +3,5 @@ from .models import *
 
 
 admin.site.register([
-    Category, Auction, Offer, WinnerOffer
+    Category, Auction, Offer, ProxyBid, WinnerOffer
 ])
\ No newline at end of file
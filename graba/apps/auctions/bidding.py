@@ -0,0 +1,310 @@
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import List
+
+from .models import Auction, Offer, ProxyBid, WinnerOffer
+from .orderbook import get_order_book, make_entry
+from . import proxy
+from .broadcast import send_to_group
+from .scheduling import schedule_auction_close
+from .tasks import schedule_order_book_flush
+
+
+class BidError(Exception):
+    """Raised when an offer cannot be accepted. The message is user-facing."""
+
+
+def parse_bid_amount(amount_str: str | None) -> int:
+    """
+    Converts the submitted euro amount into cents.
+    Raises BidError if the amount is missing or invalid.
+    """
+    if not amount_str:
+        raise BidError("No amount provided.")
+
+    try: amount = Decimal(amount_str)
+    except InvalidOperation: raise BidError("Invalid amount.")
+
+    if not amount.is_finite():
+        raise BidError("Invalid amount.")
+
+    if amount <= 0:
+        raise BidError("Bid must be greater than zero.")
+
+    return int(amount * 100)
+
+
+def check_bid(auction: Auction, amount_cents: int, now: datetime):
+    """
+    Validates a bid against the given auction snapshot.
+    Raises BidError with the reason of the rejection.
+    """
+    # Highest bid check
+    highest_cents = auction.highest_bid_cents
+    if highest_cents and amount_cents <= highest_cents:
+        raise BidError("Bid must be higher than the current highest bid.")
+
+    # Minimum price check
+    if amount_cents <= auction.min_price_cents:
+        raise BidError("Bid must be higher than the minimum price.")
+
+    # Auction must be active
+    if auction.status in ("CLOSED", "CANCELLED") or auction.buy_now_taken:
+        raise BidError("Auction is not active.")
+
+    # Auction not started yet
+    if now < auction.start_date:
+        raise BidError("Auction has not started yet.")
+
+    # Auction already ended
+    if now > auction.end_date:
+        raise BidError("Auction has already ended.")
+
+
+def get_highest_bid(auction: Auction) -> int | None:
+    """
+    Returns the current highest bid, reading the order book when enabled.
+    """
+    book = get_order_book()
+    if book is not None:
+        return book.highest(auction.pk) or auction.highest_bid_cents
+    return auction.highest_bid_cents
+
+
+def place_bid(auction: Auction, buyer, amount_cents: int) -> List[Offer]:
+    """
+    Places a BID offer on the auction atomically.
+
+    The check and the write happen in a single conditional UPDATE on the
+    auction row (WHERE highest < amount), so concurrent bidders are
+    serialized by the row lock and only strictly increasing bids are
+    accepted. The Offer row is inserted in the same transaction, together
+    with the automatic bids of the proxies it triggers.
+
+    Returns the created offers: the buyer's bid first, then the automatic
+    ones (the last offer is the visible highest bid).
+
+    When the order book is enabled the book decides instead, and the
+    returned Offer is persisted later by the write-behind worker.
+    Proxy bidding is not available in that mode.
+    """
+    now = timezone.now()
+
+    # Fast rejection on the snapshot we already have
+    check_bid(auction, amount_cents, now)
+
+    book = get_order_book()
+    if book is not None:
+        offer = _place_bid_in_book(book, auction, buyer, amount_cents, now)
+        extend_if_sniping(auction, now)
+        return [offer]
+
+    with transaction.atomic():
+        claimed = (
+            Auction.objects
+            .filter(
+                Q(highest_bid_cents__isnull=True) | Q(highest_bid_cents__lt=amount_cents),
+                pk=auction.pk,
+                min_price_cents__lt=amount_cents,
+                start_date__lte=now,
+                end_date__gte=now,
+                buy_now_taken=False,
+            )
+            .exclude(status__in=("CLOSED", "CANCELLED"))
+            .update(
+                highest_bid_cents=amount_cents,
+                bids_count=F("bids_count") + 1,
+                last_bid_time=now,
+            )
+        )
+
+        if not claimed:
+            # Someone changed the row in the meantime: report the actual reason
+            auction.refresh_from_db()
+            check_bid(auction, amount_cents, now)
+            raise BidError("Bid must be higher than the current highest bid.")
+
+        offer = Offer.objects.create(
+            auction=auction,
+            buyer=buyer,
+            type="BID",
+            amount_cents=amount_cents,
+            offer_time=now,
+        )
+
+        # Keep the in-memory instance aligned with the row
+        auction.highest_bid_cents = amount_cents
+        auction.bids_count += 1
+        auction.last_bid_time = now
+
+        # Let the proxies respond, still holding the row lock
+        automatic = proxy.resolve(auction, amount_cents, buyer.pk, now)
+        Auction.invalidate_cache(auction.pk)
+        extend_if_sniping(auction, now)
+
+    return [offer, *automatic]
+
+
+def register_proxy_bid(auction: Auction, buyer, max_amount_cents: int) -> List[Offer]:
+    """
+    Registers (or raises) the maximum bid of a buyer and resolves the
+    competing proxies. Returns the automatic offers created.
+    """
+    if get_order_book() is not None:
+        raise BidError("Automatic bidding is not available for this auction.")
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        # Auction row first, then the proxies: the same lock order as place_bid
+        auction = Auction.objects.select_for_update().get(pk=auction.pk)
+        check_bid(auction, max_amount_cents, now)
+
+        ProxyBid.objects.update_or_create(
+            auction=auction, buyer=buyer,
+            defaults={"max_amount_cents": max_amount_cents, "active": True, "created_at": now},
+        )
+
+        leader_id = (
+            Offer.objects
+            .filter(auction=auction, type="BID", amount_cents=auction.highest_bid_cents)
+            .values_list("buyer_id", flat=True)
+            .first()
+        ) if auction.highest_bid_cents is not None else None
+
+        automatic = proxy.resolve(auction, auction.highest_bid_cents, leader_id, now)
+        if automatic:
+            Auction.invalidate_cache(auction.pk)
+            extend_if_sniping(auction, now)
+        return automatic
+
+
+def extend_if_sniping(auction: Auction, now: datetime) -> bool:
+    """
+    Anti-sniping: extends the end of the auction if a bid arrived in its last
+    minutes, and notifies the clients once committed. The deadline is checked
+    on the row itself, so concurrent late bids extend it only once per window.
+    Returns True if the auction was extended.
+    """
+    if not auction.is_snipe_protected():
+        return False
+
+    window = timedelta(minutes=auction.snipe_window_minutes)
+    extension = timedelta(minutes=auction.snipe_extension_minutes)
+
+    extended = (
+        Auction.objects
+        .filter(pk=auction.pk, end_date__gte=now, end_date__lte=now + window)
+        .update(end_date=F("end_date") + extension)
+    )
+    if not extended:
+        return False
+
+    auction.end_date = Auction.objects.values_list("end_date", flat=True).get(pk=auction.pk)
+
+    event = {
+        "type": "auction_extended",
+        "auction_id": auction.pk,
+        "end_date": auction.end_date.isoformat(),
+    }
+    transaction.on_commit(lambda: send_to_group(auction.pk, event))
+    # The close of the old end minute skips it: schedule the new one
+    transaction.on_commit(lambda: schedule_auction_close(auction.end_date))
+    return True
+
+
+def _place_bid_in_book(book, auction: Auction, buyer, amount_cents: int, now) -> Offer:
+    result = book.place(auction.pk, make_entry(buyer.pk, amount_cents, now), auction.highest_bid_cents)
+
+    if result < 0:
+        raise BidError("Auction is not active.")
+    if result == 0:
+        raise BidError("Bid must be higher than the current highest bid.")
+
+    # First pending bid since the last flush: schedule the next batch
+    if result == 2:
+        schedule_order_book_flush(auction.pk)
+
+    return Offer(
+        auction=auction,
+        buyer=buyer,
+        type="BID",
+        amount_cents=amount_cents,
+        offer_time=now,
+    )
+
+
+def buy_now(auction: Auction, buyer) -> Offer:
+    """
+    Buys the auction at its Buy Now price and closes it atomically.
+    Fails if a bid or another Buy Now got in first.
+    """
+    now = timezone.now()
+
+    # Freeze the order book first, so that no bid can slip in
+    book = get_order_book()
+    if book is not None and not book.close_if_empty(auction.pk):
+        raise BidError("Buy Now is disabled because bids already exist.")
+
+    try:
+        offer = _claim_buy_now(auction, buyer, now)
+    except BidError:
+        # Frozen for nothing (the auction was just refreshed): unless it is
+        # over, its book must take bids again
+        if book is not None and auction.status in ("SCHEDULED", "OPEN"):
+            book.reopen(auction.pk)
+        raise
+
+    auction.status = "CLOSED"
+    auction.buy_now_taken = True
+
+    return offer
+
+
+def _claim_buy_now(auction: Auction, buyer, now) -> Offer:
+    with transaction.atomic():
+        claimed = (
+            Auction.objects
+            .filter(
+                pk=auction.pk,
+                status="OPEN",
+                bids_count=0,
+                buy_now_taken=False,
+                start_date__lte=now,
+                end_date__gte=now,
+            )
+            .update(status="CLOSED", buy_now_taken=True)
+        )
+
+        if not claimed:
+            auction.refresh_from_db()
+            if auction.has_offers:
+                raise BidError("Buy Now is disabled because bids already exist.")
+            if auction.buy_now_taken:
+                raise BidError("Auction already has a winner.")
+            if now < auction.start_date:
+                raise BidError("Auction has not started yet.")
+            if now > auction.end_date:
+                raise BidError("Auction has already ended.")
+            raise BidError("Auction is not active.")
+
+        offer = Offer.objects.create(
+            auction=auction,
+            buyer=buyer,
+            type="BUY_NOW",
+            amount_cents=auction.buy_now_price_cents,
+            offer_time=now,
+        )
+
+        WinnerOffer.objects.create(
+            auction=auction,
+            offer=offer
+        )
+
+        Auction.invalidate_cache(auction.pk)
+
+    return offer
@@ -0,0 +1,185 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+
+from typing import Dict, List
+import threading
+import asyncio
+
+from .encoding import prepare
+
+
+def group_name(auction_id: int) -> str:
+    return f"auction_{auction_id}"
+
+
+# Every event sent to the clients of an auction carries a per-auction sequence
+# number and is kept in a ring buffer (in the shared cache), so that clients
+# reconnecting can ask for the events they missed. With a shared channel layer
+# the cache must be shared too (see auctions.checks).
+
+EVENT_TTL = 24 * 60 * 60
+
+
+def seq_key(auction_id: int) -> str:
+    return f"auction:{auction_id}:seq"
+
+
+def event_key(auction_id: int, seq: int) -> str:
+    return f"auction:{auction_id}:event:{seq % buffer_size()}"
+
+
+def buffer_size() -> int:
+    return getattr(settings, "AUCTION_EVENT_BUFFER_SIZE", 100)
+
+
+def current_seq(auction_id: int) -> int:
+    return cache.get(seq_key(auction_id), 0)
+
+
+async def acurrent_seq(auction_id: int) -> int:
+    return await cache.aget(seq_key(auction_id), 0)
+
+
+async def anext_seq(auction_id: int) -> int:
+    key = seq_key(auction_id)
+    await cache.aadd(key, 0, timeout=None)
+    return await cache.aincr(key)
+
+
+async def amissed_events(auction_id: int, last_seq: int) -> List[Dict] | None:
+    """
+    Returns the events sent after last_seq, in order, or None when they are
+    no longer all in the buffer (the client needs a snapshot instead).
+    """
+    seq = await acurrent_seq(auction_id)
+    if last_seq > seq or seq - last_seq > buffer_size():
+        return None
+
+    wanted = range(last_seq + 1, seq + 1)
+    stored = await cache.aget_many([event_key(auction_id, s) for s in wanted])
+
+    events = [stored.get(event_key(auction_id, s)) for s in wanted]
+    # Overwritten or evicted slots
+    if any(e is None or e["seq"] != s for e, s in zip(events, wanted)):
+        return None
+    return events
+
+
+def send_to_group(auction_id: int, event: Dict):
+    """
+    Sends an event to every WebSocket client watching the auction.
+    """
+    async_to_sync(asend_to_group)(auction_id, event)
+
+
+async def asend_to_group(auction_id: int, event: Dict):
+    """
+    Async variant of send_to_group, for code already running in the event loop.
+    """
+    # Serialized once here, in every encoding, and forwarded as-is by the consumers
+    event = prepare({**event, "seq": await anext_seq(auction_id)})
+    await cache.aset(event_key(auction_id, event["seq"]), event, timeout=EVENT_TTL)
+
+    channel_layer = get_channel_layer()
+    await channel_layer.group_send(group_name(auction_id), event)
+
+
+def send_to_groups(events: Dict[int, Dict]):
+    """
+    Sends one event per auction, concurrently, in a single event loop run.
+    """
+    async_to_sync(asend_to_groups)(events)
+
+
+async def asend_to_groups(events: Dict[int, Dict]):
+    await asyncio.gather(*(
+        asend_to_group(auction_id, event)
+        for auction_id, event in events.items()
+    ))
+
+
+class BroadcastCoalescer:
+    """
+    Merges the bids accepted by this process within a time window into a
+    single "state_update" message per auction. The window of async callers
+    is flushed on their event loop, the one of sync callers by a timer thread.
+    """
+
+    def __init__(self, window: float | None = None):
+        self._window = window
+        self.lock = threading.Lock()
+        self.pending: Dict[int, List[Dict]] = {}
+        # Scheduled flushes, referenced until done (the loop keeps weak ones)
+        self.tasks = set()
+
+    @property
+    def window(self) -> float:
+        """Window in seconds, AUCTION_BROADCAST_WINDOW_MS unless given."""
+        if self._window is not None:
+            return self._window
+        return getattr(settings, "AUCTION_BROADCAST_WINDOW_MS", 100) / 1000
+
+    def _add(self, auction_id: int, bid: Dict) -> bool:
+        """Adds the bid to the window, True if it opened it."""
+        with self.lock:
+            bids = self.pending.get(auction_id)
+            if bids is not None:
+                bids.append(bid)
+                return False
+            self.pending[auction_id] = [bid]
+            return True
+
+    def add_bid(self, auction_id: int, bid: Dict):
+        if self.window <= 0:
+            send_to_group(auction_id, self.build_event([bid]))
+            return
+
+        # First bid of the window: flush when it expires
+        if self._add(auction_id, bid):
+            timer = threading.Timer(self.window, self.flush, args=[auction_id])
+            timer.daemon = True
+            timer.start()
+
+    async def aadd_bid(self, auction_id: int, bid: Dict):
+        if self.window <= 0:
+            await asend_to_group(auction_id, self.build_event([bid]))
+            return
+
+        # First bid of the window: flush when it expires, on this loop
+        if self._add(auction_id, bid):
+            task = asyncio.get_running_loop().create_task(self._aflush_later(auction_id))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _aflush_later(self, auction_id: int):
+        await asyncio.sleep(self.window)
+        await self.aflush(auction_id)
+
+    def flush(self, auction_id: int):
+        with self.lock:
+            bids = self.pending.pop(auction_id, None)
+        if bids:
+            send_to_group(auction_id, self.build_event(bids))
+
+    async def aflush(self, auction_id: int):
+        with self.lock:
+            bids = self.pending.pop(auction_id, None)
+        if bids:
+            await asend_to_group(auction_id, self.build_event(bids))
+
+    @staticmethod
+    def build_event(bids: List[Dict]) -> Dict:
+        highest = max(bids, key=lambda b: b["amount_cents"])
+        return {
+            "type": "state_update",
+            "state_update": {
+                "highest": highest,
+                "bids": bids,
+            }
+        }
+
+
+coalescer = BroadcastCoalescer()
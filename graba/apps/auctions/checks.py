@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+
+# Caches only seen by the process using them
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# Channel layers only delivering within one process
+PROCESS_LOCAL_LAYERS = (
+    "channels.layers.InMemoryChannelLayer",
+)
+
+
+@register(Tags.caches)
+def check_event_cache(app_configs, **kwargs):
+    """
+    The event sequence numbers and the resume buffer (see auctions.broadcast)
+    live in the default cache: when the events reach clients of several
+    processes, every one of them must see the same cache. A warning, not
+    an error: the default settings (no CACHE_URL) must still run locally.
+    """
+    layer = getattr(settings, "CHANNEL_LAYERS", {}).get("default", {}).get("BACKEND")
+    cache = settings.CACHES.get("default", {}).get("BACKEND")
+
+    if layer is None or layer in PROCESS_LOCAL_LAYERS or cache not in PROCESS_LOCAL_CACHES:
+        return []
+
+    return [Warning(
+        f"The default cache ({cache}) is local to each process, but the "
+        f"auction events are sent through a shared channel layer ({layer}).",
+        hint="Set CACHE_URL to a shared cache (e.g. redis://localhost:6379/1): "
+             "event sequence numbers and the resume buffer are kept there.",
+        id="auctions.W001",
+    )]
+
+
+@register()
+def check_order_book_url(app_configs, **kwargs):
+    """
+    The "memory://" order book lives in the process that accepted the bids:
+    the Celery workers persisting and the sweeper closing the auctions would
+    see an empty book, losing the bids. Tests override the setting instead.
+    """
+    if getattr(settings, "AUCTION_ORDER_BOOK_URL", None) != "memory://":
+        return []
+
+    return [Error(
+        "AUCTION_ORDER_BOOK_URL=memory:// keeps the order book in a single "
+        "process, but its bids are persisted by the Celery workers.",
+        hint="Use a Redis URL (e.g. redis://localhost:6379/2), or leave the "
+             "setting empty to check and persist bids on the database.",
+        id="auctions.E002",
+    )]
@@ -1,46 +1,81 @@
 
 from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
 import json
 
+from .broadcast import amissed_events, acurrent_seq
+from .encoding import JSON, encode, select_subprotocol
+from .fanout import fanout_enabled, hub
+from .history import get_snapshot
+from .watchers import tracker
+
 class AuctionConsumer(AsyncWebsocketConsumer):
 
     async def connect(self):
         self.auction_id = self.scope["url_route"]["kwargs"]["auction_id"]
         self.group_name = f"auction_{self.auction_id}"
 
-        await self.channel_layer.group_add(self.group_name, self.channel_name)
-        await self.accept()
+        # Message encoding negotiated with the client (JSON by default)
+        self.subprotocol = select_subprotocol(self.scope.get("subprotocols"))
+
+        # One group subscription per process (fan-out hub) or per socket
+        if fanout_enabled():
+            await hub.subscribe(int(self.auction_id), self)
+        else:
+            await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept(subprotocol=self.subprotocol)
+        tracker.join(int(self.auction_id))
 
     async def disconnect(self, code):
-        await self.channel_layer.group_discard(self.group_name, self.channel_name)
-
-    # NEW BID
-    async def new_bid(self, event):
-        await self.send(text_data=json.dumps({
-            "type": "new_bid",
-            "new_bid": {
-                "username": event["username"],
-                "amount_cents": event["amount_cents"],
-                "amount_display": event["amount_display"],
-                "offer_time": event["offer_time"],
-            }
-        }))
-    
-    # BUY NOW
-    async def buy_now(self, event):
-        await self.send(text_data=json.dumps({
-            "type": "buy_now",
-            "buy_now": {
-                "username": event["username"],
-                "amount_display": event["amount_display"],
-                "offer_time": event["offer_time"],
-            }
-        }))
-
-    # AUCTION STATUS UPDATE
-    async def auction_status_update(self, event):
-        await self.send(text_data=json.dumps({
-            "type": "auction_status_update",
-            "auction_id": event["auction_id"],
-            "status": event["status"],
-        }))
+        tracker.leave(int(self.auction_id))
+        if fanout_enabled():
+            await hub.unsubscribe(int(self.auction_id), self)
+        else:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    # CLIENT MESSAGES
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            message = json.loads(text_data or "")
+        except ValueError:
+            return
+
+        if isinstance(message, dict) and message.get("type") == "resume":
+            await self.resume(message.get("last_seq"))
+
+    async def resume(self, last_seq):
+        """
+        Sends the events missed since last_seq, or a snapshot if they are
+        no longer available. Events may also arrive live while replaying:
+        clients drop the ones whose sequence number they already saw.
+        """
+        auction_id = int(self.auction_id)
+
+        if isinstance(last_seq, int) and last_seq >= 0:
+            missed = await amissed_events(auction_id, last_seq)
+            if missed is not None:
+                for event in missed:
+                    await self.forward(event)
+                return
+
+        # Read the sequence first: anything newer is delivered afterwards
+        seq = await acurrent_seq(auction_id)
+        snapshot = await database_sync_to_async(get_snapshot)(auction_id)
+        if snapshot is None:
+            return
+
+        frame = encode({"seq": seq, "type": "snapshot", "snapshot": snapshot}, self.subprotocol)
+        await self.send(text_data=frame.get("text"), bytes_data=frame.get("bytes"))
+
+    # AUCTION EVENTS
+    # Serialized once by the publisher: each socket gets the frame of its encoding
+    async def forward(self, event):
+        frame = event["frames"][self.subprotocol or JSON]
+        await self.send(text_data=frame.get("text"), bytes_data=frame.get("bytes"))
+
+    new_bid = forward
+    state_update = forward
+    buy_now = forward
+    auction_extended = forward          # anti-sniping
+    auction_status_update = forward
+    watchers = forward                  # live watcher count
@@ -0,0 +1,112 @@
+"""
+Encoding of the auction events sent to WebSocket clients.
+
+Events are serialized once, when published, in every supported encoding;
+consumers forward the bytes matching the subprotocol their client picked:
+
+- no subprotocol / ``graba.json``: JSON text, full key names
+- ``graba.compact``: JSON text, short key names (see ``SHORT_KEYS``)
+- ``graba.msgpack``: MessagePack binary frame, short key names
+"""
+from typing import Dict
+import json
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - installed with channels_redis
+    msgpack = None
+
+
+JSON = "graba.json"
+COMPACT = "graba.compact"
+MSGPACK = "graba.msgpack"
+
+# Offered subprotocols, by preference
+SUBPROTOCOLS = [MSGPACK, COMPACT, JSON] if msgpack else [COMPACT, JSON]
+
+SHORT_KEYS = {
+    "seq": "s",
+    "type": "t",
+    "auction_id": "i",
+    "status": "st",
+    "end_date": "e",
+    "new_bid": "nb",
+    "buy_now": "bn",
+    "state_update": "su",
+    "snapshot": "sn",
+    "highest": "h",
+    "highest_cents": "hc",
+    "highest_display": "hd",
+    "bids": "b",
+    "bids_count": "bc",
+    "next_cursor": "nc",
+    "username": "u",
+    "amount_cents": "a",
+    "amount_display": "ad",
+    "offer_time": "o",
+    "watchers": "w",
+}
+
+
+def client_message(event: Dict) -> Dict:
+    """
+    Message seen by the clients for a channel layer event.
+    """
+    type_ = event["type"]
+    message = {"seq": event.get("seq"), "type": type_}
+
+    if type_ == "new_bid":
+        message["new_bid"] = {
+            "username": event["username"],
+            "amount_cents": event["amount_cents"],
+            "amount_display": event["amount_display"],
+            "offer_time": event["offer_time"],
+        }
+    elif type_ == "buy_now":
+        message["buy_now"] = {
+            "username": event["username"],
+            "amount_display": event["amount_display"],
+            "offer_time": event["offer_time"],
+        }
+    else:
+        message.update((k, v) for k, v in event.items() if k not in message)
+
+    return message
+
+
+def shorten(value):
+    if isinstance(value, dict):
+        return {SHORT_KEYS.get(k, k): shorten(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [shorten(v) for v in value]
+    return value
+
+
+def encode(message: Dict, subprotocol: str | None) -> Dict:
+    """
+    Frame (``text`` or ``bytes``) of a message in the given subprotocol.
+    """
+    if subprotocol == MSGPACK:
+        return {"bytes": msgpack.packb(shorten(message))}
+    if subprotocol == COMPACT:
+        return {"text": json.dumps(shorten(message), separators=(",", ":"))}
+    return {"text": json.dumps(message)}
+
+
+def prepare(event: Dict) -> Dict:
+    """
+    Channel layer event carrying the message pre-serialized in every encoding.
+    """
+    message = client_message(event)
+    frames = {protocol: encode(message, protocol) for protocol in SUBPROTOCOLS}
+    return {"type": event["type"], "seq": event.get("seq"), "frames": frames}
+
+
+def select_subprotocol(offered) -> str | None:
+    """
+    The subprotocol to accept among the ones offered by the client.
+    """
+    for protocol in SUBPROTOCOLS:
+        if protocol in (offered or []):
+            return protocol
+    return None
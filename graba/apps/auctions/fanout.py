@@ -0,0 +1,140 @@
+"""
+Process-local fan-out hub for the auction WebSocket groups.
+
+Without the hub every consumer adds its own channel to ``auction_{id}``, so
+the channel layer delivers each event once per watcher. With the hub, each
+process adds a single channel per auction group and dispatches the events
+in memory to its local sockets: the layer traffic scales with the number of
+processes instead of the number of watchers. Works with any channel layer.
+"""
+from django.conf import settings
+
+from channels.consumer import get_handler_name
+from channels.layers import get_channel_layer
+
+from typing import Dict, Set
+import asyncio
+import logging
+import time
+
+from .broadcast import group_name
+
+
+logger = logging.getLogger(__name__)
+
+# Group memberships expire in the channel layer (group_expiry, 1 day by
+# default): the hub renews them well before that
+GROUP_REFRESH = 60 * 60
+
+# Seconds before the reader retries after a channel layer error, doubled at
+# each consecutive failure up to the maximum
+RETRY_DELAY = 1
+MAX_RETRY_DELAY = 30
+
+
+def fanout_enabled() -> bool:
+    return getattr(settings, "AUCTION_WS_FANOUT", False)
+
+
+class _Subscription:
+
+    def __init__(self, channel_name: str):
+        self.channel_name = channel_name
+        self.consumers: Set = set()
+        self.joined_at = time.monotonic()
+        self.reader: asyncio.Task | None = None
+
+
+class FanoutHub:
+    """
+    One channel layer subscription per auction group, shared by all the
+    consumers of the process. Consumers receive the events through their
+    usual type-based handlers.
+    """
+
+    def __init__(self, channel_layer=None):
+        self._channel_layer = channel_layer
+        self.lock = asyncio.Lock()
+        self.subscriptions: Dict[int, _Subscription] = {}
+
+    @property
+    def channel_layer(self):
+        if self._channel_layer is None:
+            self._channel_layer = get_channel_layer()
+        return self._channel_layer
+
+    async def subscribe(self, auction_id: int, consumer):
+        async with self.lock:
+            sub = self.subscriptions.get(auction_id)
+
+            if sub is None:
+                # First local watcher: join the group once for the whole process
+                sub = _Subscription(await self.channel_layer.new_channel())
+                await self.channel_layer.group_add(group_name(auction_id), sub.channel_name)
+                sub.reader = asyncio.get_running_loop().create_task(self._read(auction_id, sub))
+                self.subscriptions[auction_id] = sub
+
+            elif time.monotonic() - sub.joined_at > GROUP_REFRESH:
+                await self.channel_layer.group_add(group_name(auction_id), sub.channel_name)
+                sub.joined_at = time.monotonic()
+
+            sub.consumers.add(consumer)
+
+    async def unsubscribe(self, auction_id: int, consumer):
+        async with self.lock:
+            sub = self.subscriptions.get(auction_id)
+            if sub is None:
+                return
+
+            sub.consumers.discard(consumer)
+            if sub.consumers:
+                return
+
+            # Last local watcher gone: leave the group
+            del self.subscriptions[auction_id]
+            sub.reader.cancel()
+            await self.channel_layer.group_discard(group_name(auction_id), sub.channel_name)
+
+    def watchers(self, auction_id: int) -> int:
+        sub = self.subscriptions.get(auction_id)
+        return len(sub.consumers) if sub else 0
+
+    async def _read(self, auction_id: int, sub: _Subscription):
+        """
+        Dispatches the events of the group until unsubscribed. Channel layer
+        errors (e.g. a lost Redis connection) are retried with backoff, joining
+        the group again since the membership may have been lost too.
+        """
+        delay, rejoin = RETRY_DELAY, False
+
+        while True:
+            try:
+                if rejoin:
+                    await self.channel_layer.group_add(group_name(auction_id), sub.channel_name)
+                    sub.joined_at = time.monotonic()
+                    rejoin = False
+                event = await self.channel_layer.receive(sub.channel_name)
+            except Exception:
+                logger.exception("Fan-out reader of auction %s failed, retrying in %ss", auction_id, delay)
+                await asyncio.sleep(delay)
+                delay, rejoin = min(delay * 2, MAX_RETRY_DELAY), True
+                continue
+
+            delay = RETRY_DELAY
+            await self.dispatch(sub, event)
+
+    async def dispatch(self, sub: _Subscription, event: Dict):
+        """
+        Hands the event to the handler of every local consumer.
+        A failing socket never prevents delivery to the others.
+        """
+        handler_name = get_handler_name(event)
+
+        for consumer in list(sub.consumers):
+            try:
+                await getattr(consumer, handler_name)(event)
+            except Exception:
+                logger.exception("Fan-out of %s failed for a consumer", event.get("type"))
+
+
+hub = FanoutHub()
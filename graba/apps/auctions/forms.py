@@ -25,6 +25,8 @@ class AuctionForm(forms.ModelForm):
             "technical_details",
             "start_date",
             "end_date",
+            "snipe_window_minutes",
+            "snipe_extension_minutes",
             "min_price_eur",
             "min_price_cents",
             "buy_now_price_eur",
@@ -35,6 +37,8 @@ class AuctionForm(forms.ModelForm):
         widgets = {
             "start_date": forms.DateTimeInput(attrs={"type": "datetime-local"}),
             "end_date": forms.DateTimeInput(attrs={"type": "datetime-local"}),
+            "snipe_window_minutes": forms.NumberInput(attrs={"style": "width: 80px;", "min": 0}),
+            "snipe_extension_minutes": forms.NumberInput(attrs={"style": "width: 80px;", "min": 0}),
         }
 
     def clean(self):
@@ -73,6 +77,12 @@ class AuctionForm(forms.ModelForm):
         if start and end and end <= start:
             self.add_error("end_date", "End date must be later than start date.")
 
+        # Anti-sniping validation (both set or both zero)
+        window = cleaned_data.get("snipe_window_minutes")
+        extension = cleaned_data.get("snipe_extension_minutes")
+        if window is not None and extension is not None and bool(window) != bool(extension):
+            self.add_error("snipe_extension_minutes", "Set both the anti-sniping window and extension, or neither.")
+
         # Price validation
         if min_price is None:
             self.add_error("min_price_cents", "Minimum price must be specified.")
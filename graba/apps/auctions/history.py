@@ -0,0 +1,106 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from typing import List, Tuple
+import base64
+import json
+
+from .bidding import get_highest_bid
+from .models import Auction, Offer
+from .watchers import watcher_count
+
+from core.templatetags import custom_filters
+
+
+BID_HISTORY_PAGE_SIZE = 20
+
+# Bids included in the WebSocket state snapshot
+SNAPSHOT_BIDS = 10
+
+
+def bid_payload(offer: Offer) -> dict:
+    """
+    Public representation of a bid, shared by the JSON responses and the WebSocket.
+    """
+    return {
+        "username": offer.buyer.role.user.username,
+        "amount_cents": offer.amount_cents,
+        "amount_display": custom_filters.cents_to_price(offer.amount_cents),
+        "offer_time": offer.offer_time.isoformat(timespec='seconds'),
+    }
+
+
+def encode_cursor(offer: Offer) -> str:
+    """
+    Opaque cursor pointing right after the given bid.
+    """
+    key = [offer.amount_cents, offer.offer_time.isoformat(), offer.pk]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    """
+    Returns the (amount, offer_time, id) key of a cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        amount, offer_time, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        offer_time = parse_datetime(offer_time)
+        if offer_time is None: raise ValueError
+        return int(amount), offer_time, int(pk)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+def get_bid_page(auction: Auction, cursor: str | None = None, limit: int = BID_HISTORY_PAGE_SIZE) -> Tuple[List[Offer], str | None]:
+    """
+    Returns a page of bids ordered by (amount, offer_time, id) descending,
+    starting after the cursor, and the cursor of the next page (if any).
+
+    Keyset pagination: each page is an index range scan on
+    (auction, type, -amount_cents, -offer_time, -id), whatever its depth.
+    """
+    bids = (
+        Offer.objects
+        .filter(auction=auction, type="BID")
+        .select_related("buyer__role__user")
+        .order_by("-amount_cents", "-offer_time", "-id")
+    )
+
+    if cursor:
+        amount, offer_time, pk = decode_cursor(cursor)
+        bids = bids.filter(
+            Q(amount_cents__lt=amount) |
+            Q(amount_cents=amount, offer_time__lt=offer_time) |
+            Q(amount_cents=amount, offer_time=offer_time, id__lt=pk)
+        )
+
+    # One extra row tells whether there is a next page
+    page = list(bids[:limit + 1])
+    if len(page) > limit:
+        return page[:limit], encode_cursor(page[limit - 1])
+    return page, None
+
+
+def get_snapshot(auction_id: int) -> dict | None:
+    """
+    Compact state of an auction, sent to WebSocket clients that missed too
+    many events to be brought up to date with the deltas.
+    """
+    auction = Auction.objects.filter(pk=auction_id).first()
+    if auction is None:
+        return None
+
+    bids, next_cursor = get_bid_page(auction, limit=SNAPSHOT_BIDS)
+    highest = get_highest_bid(auction)
+
+    return {
+        "status": auction.status,
+        "end_date": auction.end_date.isoformat(),
+        "highest_cents": highest,
+        "highest_display": custom_filters.cents_to_price(highest) if highest is not None else None,
+        "bids_count": auction.bids_count,
+        "watchers": watcher_count(auction.pk),
+        "bids": [bid_payload(offer) for offer in bids],
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,106 @@
+# Execute the command with:
+#     python manage.py explain_hot_queries [--allow-sorts] [-v 2]
+#
+# Fails (non-zero exit) if the plan of a hot query scans a whole table, or
+# sorts the rows instead of reading them in index order (unless allowed).
+# Run it against a database migrated with the current indexes, e.g. in CI.
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from typing import Dict, List
+import re
+
+from auctions.models import Auction, Offer, ProxyBid
+
+
+def hot_queries() -> Dict:
+    """
+    The most frequent queries, with placeholder parameters.
+    """
+    now = timezone.now()
+    return {
+        "home listing": Auction.objects.order_by("-start_date", "title", "pk")[:16],
+        # The search form selects subcategories (leaves): a single category
+        "home listing by category": (
+            Auction.objects
+            .filter(category_id__in=["Cameras"])
+            .order_by("-start_date", "title")[:16]
+        ),
+        "seller listing": Auction.objects.filter(seller_id=1).order_by("-start_date", "title")[:3],
+        "due opens": Auction.objects.filter(status="SCHEDULED", start_date__lte=now).order_by("start_date")[:500],
+        "due closes": Auction.objects.filter(status="OPEN", end_date__lte=now).order_by("end_date")[:500],
+        "bid history": (
+            Offer.objects
+            .filter(auction_id=1, type="BID")
+            .order_by("-amount_cents", "-offer_time", "-id")[:21]
+        ),
+        "top bid leader": Offer.objects.filter(auction_id=1, type="BID", amount_cents=100).values("buyer_id")[:1],
+        "top proxies": (
+            ProxyBid.objects
+            .filter(auction_id=1, active=True)
+            .order_by("-max_amount_cents", "created_at")[:2]
+        ),
+    }
+
+
+# Plan lines reading a whole table
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (\w+)$", re.MULTILINE),
+    "postgresql": re.compile(r"\bSeq Scan on (\w+)"),
+}
+
+# Plan lines sorting the rows instead of reading them in index order
+SORT_PATTERNS = {
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR ORDER BY"),
+    "postgresql": re.compile(r"\bSort\b"),
+}
+
+
+class Command(BaseCommand):
+    help = "Runs EXPLAIN on the hot queries and fails if any of them scans a whole table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--allow-sorts", action="store_true",
+            help="Only warn about hot queries sorted without an index.",
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f"Query plans are not checked on {vendor}.")
+
+        failures: List[str] = []
+
+        for name, queryset in hot_queries().items():
+            plan = self.explain(queryset)
+
+            if options["verbosity"] > 1:
+                self.stdout.write(f"--- {name}\n{plan}\n")
+
+            scans = FULL_SCAN_PATTERNS[vendor].findall(plan)
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name}: full scan of {', '.join(scans)}"))
+            elif SORT_PATTERNS[vendor].search(plan):
+                if not options["allow_sorts"]:
+                    failures.append(name)
+                self.stdout.write(self.style.WARNING(f"{name}: sorted without an index"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: OK"))
+
+        if failures:
+            raise CommandError(f"Unindexed plans in: {', '.join(failures)}.")
+
+    @staticmethod
+    def explain(queryset) -> str:
+        if connection.vendor != "postgresql":
+            return queryset.explain()
+
+        # The planner prefers sequential scans on small tables: check that an index can be used
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
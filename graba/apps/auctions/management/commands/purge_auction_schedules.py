@@ -0,0 +1,49 @@
+# Execute the command with:
+#     python manage.py purge_auction_schedules [--dry-run]
+#
+# Migration path to the sweeper scheduler (AUCTION_SCHEDULER="sweeper"):
+# removes the PeriodicTask rows of the clocked mode (per auction opens, per
+# minute closes) and the ClockedSchedule rows left without tasks. Due auctions are then picked up by the sweeper.
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_celery_beat.models import ClockedSchedule, PeriodicTask
+
+from auctions.scheduling import per_auction_tasks
+
+
+class Command(BaseCommand):
+    help = "Removes the open/close PeriodicTask and ClockedSchedule rows of the clocked mode."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Only count the rows that would be removed.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Rows deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        tasks = per_auction_tasks()
+
+        if options["dry_run"]:
+            self.stdout.write(f"{tasks.count()} clocked tasks would be removed.")
+            return
+
+        removed = 0
+        while True:
+            with transaction.atomic():
+                ids = list(tasks.values_list("pk", flat=True)[:options["batch_size"]])
+                if not ids:
+                    break
+                PeriodicTask.objects.filter(pk__in=ids).delete()
+            removed += len(ids)
+
+        orphans, _ = ClockedSchedule.objects.filter(periodictask__isnull=True).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} clocked tasks and {orphans} clocked schedules."
+        ))
@@ -0,0 +1,26 @@
+# Execute the command with:
+#     python manage.py rebuild_bid_summary [--auction ID ...]
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from auctions.models import Auction
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized bid summary of the auctions from the Offer table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--auction", type=int, nargs="+", dest="auction_ids",
+            help="Only rebuild the given auction IDs.",
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        queryset = Auction.objects.all()
+        if options["auction_ids"]:
+            queryset = queryset.filter(pk__in=options["auction_ids"])
+
+        updated = Auction.rebuild_bid_summary(queryset)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt bid summary of {updated} auctions."))
@@ -7,7 +7,7 @@ class SellerRequiredMixin:
         if not user.is_authenticated:
             raise PermissionDenied("You must be authenticated to create an auction.")
         
-        if not user.has_role("SELLER"):
+        if not request.roles.is_seller:
             raise PermissionDenied("Only sellers can create an auction.")
         
         return super().dispatch(request, *args, **kwargs)
@@ -1,10 +1,13 @@
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator, EmailValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, RowNumber
 
 from datetime import timedelta
 
+from core.cache import get_version, bump_version
+
 from .scripts.misc import auction_image_upload_to
 
 class Category(models.Model):
@@ -25,6 +28,35 @@ class Category(models.Model):
         ordering = ["name"]
 
 
+class AuctionQuerySet(models.QuerySet):
+
+    def with_card_data(self, user=None):
+        """
+        Loads everything the auction cards show in the listing query itself:
+        category, seller user and seller rating joined, plus the favorites
+        count and whether the given user saved the auction (is_favorite) as
+        subqueries. The bid summary is already on the row.
+        """
+        from favorites.models import FavoriteAuction
+
+        favorites = FavoriteAuction.objects.filter(auction=models.OuterRef('pk')).order_by()
+        favorites_count = favorites.values('auction').annotate(c=models.Count('id')).values('c')
+
+        if user is not None and user.is_authenticated:
+            is_favorite = models.Exists(favorites.filter(user=user))
+        else:
+            is_favorite = models.Value(False)
+
+        return (
+            self
+            .select_related('category', 'seller__role__user', 'seller__rating_summary')
+            .annotate(
+                favorites_count=Coalesce(models.Subquery(favorites_count), 0),
+                is_favorite=is_favorite,
+            )
+        )
+
+
 class Auction(models.Model):
     STATUS_CHOICES = [
         ('SCHEDULED', 'Scheduled'),
@@ -47,24 +79,93 @@ class Auction(models.Model):
     min_price_cents = models.IntegerField()
     buy_now_price_cents = models.IntegerField(blank=True, null=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='SCHEDULED')
+
+    # Anti-sniping: a bid in the last window minutes extends the end by the extension minutes (0 disables)
+    snipe_window_minutes = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    snipe_extension_minutes = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+
+    # Denormalized bid summary, kept in sync by the bid, buy-now and close paths
+    highest_bid_cents = models.IntegerField(blank=True, null=True)
+    bids_count = models.IntegerField(default=0)
+    last_bid_time = models.DateTimeField(blank=True, null=True)
+    buy_now_taken = models.BooleanField(default=False)
     
     seller = models.ForeignKey('accounts.Seller', on_delete=models.CASCADE)
     category = models.ForeignKey('auctions.Category', null=True, on_delete=models.SET_NULL)
 
+    objects = AuctionQuerySet.as_manager()
+
     # === METHODS AND PROPERTIES ===
 
     @property
-    def has_offers(self, type_:str='BID') -> bool:
-        return Offer.objects.filter(auction=self, type=type_).exists()
+    def has_offers(self) -> bool:
+        return self.bids_count > 0
 
     def get_offers_number(self, type_:str='BID') -> int:
+        if type_ == 'BID':
+            return self.bids_count
         return Offer.objects.filter(auction=self, type=type_).count()
 
     def get_highest_offer_value(self, type_:str='BID') -> int | None:
+        if type_ == 'BID':
+            return self.highest_bid_cents
         return Offer.objects.filter(auction=self, type=type_).aggregate(
             highest=models.Max('amount_cents')
         )['highest']
+
+    # === Bid Summary ===
+
+    @classmethod
+    def rebuild_bid_summary(cls, queryset=None) -> int:
+        """
+        Recomputes the bid summary of the given auctions (all by default)
+        from the Offer table. Returns the number of updated auctions.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        bids = (
+            Offer.objects
+            .filter(auction=models.OuterRef('pk'), type='BID')
+            .order_by()
+            .values('auction')
+        )
+        buy_now = Offer.objects.filter(auction=models.OuterRef('pk'), type='BUY_NOW')
+
+        return queryset.update(
+            highest_bid_cents=models.Subquery(bids.annotate(m=models.Max('amount_cents')).values('m')),
+            bids_count=Coalesce(models.Subquery(bids.annotate(c=models.Count('id')).values('c')), 0),
+            last_bid_time=models.Subquery(bids.annotate(t=models.Max('offer_time')).values('t')),
+            buy_now_taken=models.Exists(buy_now),
+        )
     
+    # === Page Cache ===
+
+    @staticmethod
+    def cache_version_key(pk: int) -> str:
+        return f"auction:{pk}:version"
+
+    @property
+    def cache_version(self) -> int:
+        """Version of the cached fragments of the auction page."""
+        return get_version(self.cache_version_key(self.pk))
+
+    @classmethod
+    def invalidate_cache(cls, pk: int):
+        """
+        Bumps the fragment version of the auction once the current
+        transaction commits (immediately outside of one).
+        """
+        transaction.on_commit(lambda: bump_version(cls.cache_version_key(pk)))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Edits and status changes
+        self.invalidate_cache(self.pk)
+
+    def is_snipe_protected(self) -> bool:
+        return self.snipe_window_minutes > 0 and self.snipe_extension_minutes > 0
+
     def is_bn_enabled(self) -> bool:
         return (self.buy_now_price_cents is not None)
     
@@ -136,22 +237,101 @@ class Auction(models.Model):
         if self.status != "OPEN":
             return
 
-        highest_bid = (
-            Offer.objects
-            .filter(auction=self, type="BID")
-            .order_by("-amount_cents")
-            .first()
-        )
+        # Persist the bids still waiting in the order book (if enabled)
+        from .orderbook import drain
+        if drain(self.pk):
+            self.refresh_from_db(fields=["highest_bid_cents", "bids_count", "last_bid_time"])
+
+        with transaction.atomic():
+            highest_bid = (
+                Offer.objects
+                .filter(auction=self, type="BID")
+                .order_by("-amount_cents", "offer_time")
+                .first()
+            )
 
-        if highest_bid:
-            WinnerOffer.objects.create(
-                auction=self,
-                offer=highest_bid
+            if highest_bid:
+                WinnerOffer.objects.create(
+                    auction=self,
+                    offer=highest_bid
+                )
+            
+            # Close auction
+            self.status = "CLOSED"
+            self.save(update_fields=["status"])
+
+    @classmethod
+    def close_many(cls, auction_ids) -> list:
+        """
+        Bulk closing procedure: closes the given open auctions in a single
+        transaction. The top bid of every auction is found with one window
+        query, the winners are inserted with one bulk INSERT and the statuses
+        changed with one UPDATE. Returns the IDs of the auctions closed.
+
+        Must not run inside a transaction: as in close(), the order book is
+        drained first, in transactions of its own, so that a failure of the
+        batch cannot roll back bids already taken out of the book.
+        """
+        from .orderbook import drain, reopen
+
+        # Persist the bids still waiting in the order book (if enabled), in
+        # their own transactions like close(): the batch below may still fail
+        drained = list(
+            cls.objects
+            .filter(pk__in=auction_ids, status="OPEN", end_date__lte=timezone.now())
+            .values_list("pk", flat=True)
+        )
+        for pk in drained:
+            drain(pk)
+
+        closing = []
+        try:
+            closing = cls._close_drained(drained)
+        finally:
+            # Drained but still open (extended in the meantime, or the batch
+            # failed): their books must accept bids again
+            left = cls.objects.filter(pk__in=set(drained) - set(closing), status="OPEN")
+            for pk in left.values_list("pk", flat=True):
+                reopen(pk)
+
+        return closing
+
+    @classmethod
+    def _close_drained(cls, auction_ids) -> list:
+        with transaction.atomic():
+            closing = list(
+                cls.objects
+                .select_for_update()
+                # The deadline may have moved since the auctions were drained
+                .filter(pk__in=auction_ids, status="OPEN", end_date__lte=timezone.now())
+                .values_list("pk", flat=True)
+            )
+            if not closing:
+                return []
+
+            # Same ordering as close(): highest amount, earliest offer first
+            top_bids = (
+                Offer.objects
+                .filter(auction_id__in=closing, type="BID")
+                .annotate(rank=models.Window(
+                    expression=RowNumber(),
+                    partition_by=[models.F("auction_id")],
+                    order_by=[models.F("amount_cents").desc(), models.F("offer_time").asc()],
+                ))
+                .filter(rank=1)
+                .values_list("auction_id", "pk")
             )
-        
-        # Close auction
-        self.status = "CLOSED"
-        self.save(update_fields=["status"])
+
+            WinnerOffer.objects.bulk_create([
+                WinnerOffer(auction_id=auction_id, offer_id=offer_id)
+                for auction_id, offer_id in top_bids
+            ])
+            cls.objects.filter(pk__in=closing).update(status="CLOSED")
+
+            for pk in closing:
+                cls.invalidate_cache(pk)
+
+        return closing
 
     def __str__(self):
         return self.title
@@ -161,6 +341,16 @@ class Auction(models.Model):
         verbose_name_plural = "Auctions"
         db_table_comment = "An auction"
         ordering = ["-start_date", "title"]
+        indexes = [
+            # Home listing in its default ordering (also the keyset pagination key)
+            models.Index(fields=['-start_date', 'title', 'id'], name='auction_listing_idx'),
+            # Home listing filtered by category, and seller profile listing
+            models.Index(fields=['category', '-start_date', 'title'], name='auction_category_listing_idx'),
+            models.Index(fields=['seller', '-start_date', 'title'], name='auction_seller_listing_idx'),
+            # Due opens and closes, looked up by the sweeper scheduler
+            models.Index(fields=['status', 'start_date'], name='auction_status_start_idx'),
+            models.Index(fields=['status', 'end_date'], name='auction_status_end_idx'),
+        ]
 
 
 class Offer(models.Model):
@@ -195,6 +385,41 @@ class Offer(models.Model):
         verbose_name_plural = "Offers"
         db_table_comment = "An offer"
         ordering = ["type", "-amount_cents", "-offer_time"]
+        indexes = [
+            # Bid history keyset pagination and top bid lookup
+            models.Index(
+                fields=['auction', 'type', '-amount_cents', '-offer_time', '-id'],
+                name='offer_auction_history_idx',
+            ),
+        ]
+
+
+class ProxyBid(models.Model):
+    created_at = models.DateTimeField(default=timezone.now)
+    max_amount_cents = models.IntegerField()
+    active = models.BooleanField(default=True)
+
+    auction = models.ForeignKey(Auction, on_delete=models.CASCADE, related_name='proxy_bids')
+    buyer = models.ForeignKey('accounts.Buyer', on_delete=models.CASCADE)
+
+    def __str__(self):
+        return f"Proxy bid up to {self.max_amount_cents} on Auction {self.auction_id}"
+
+    class Meta:
+        unique_together = ('auction', 'buyer')
+
+        verbose_name = "Proxy Bid"
+        verbose_name_plural = "Proxy Bids"
+        db_table_comment = "A maximum bid placed automatically on behalf of a buyer"
+        ordering = ["-max_amount_cents", "created_at"]
+        indexes = [
+            # Top active proxies of an auction (only active ones are ever looked up)
+            models.Index(
+                fields=['auction', '-max_amount_cents', 'created_at'],
+                condition=models.Q(active=True),
+                name='proxybid_auction_top_idx',
+            ),
+        ]
 
 
 class WinnerOffer(models.Model):
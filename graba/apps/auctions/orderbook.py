@@ -0,0 +1,265 @@
+"""
+Optional in-memory order book for open auctions.
+
+When ``AUCTION_ORDER_BOOK_URL`` is set, the book (a sorted set per auction)
+becomes the source of truth for the highest-bid check: accepted bids are
+appended to a pending list and persisted as Offer rows in batches by a
+Celery worker (write-behind). ``memory://`` selects a process-local
+stand-in for tests only: the workers persisting and closing the auctions
+would see an empty book, so the auctions.E002 check rejects it otherwise.
+"""
+from django.conf import settings
+from django.db import models, transaction
+from django.utils.dateparse import parse_datetime
+
+from datetime import datetime
+from typing import Dict, List, Optional
+import threading
+import json
+import uuid
+
+# Closed books keep rejecting late bids for a day, then expire
+CLOSED_TTL = 24 * 60 * 60
+
+
+# Accepts the bid only if the book is open and the amount beats both the
+# current top of the book and the persisted floor.
+#   KEYS: bids, pending, closed, pending_set    ARGV: amount, member, floor, auction_id
+#   Returns: -1 closed, 0 too low, 1 accepted, 2 accepted and newly pending
+PLACE_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 1 then return -1 end
+local top = redis.call('ZREVRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local highest = tonumber(top[2] or ARGV[3])
+if highest and highest >= tonumber(ARGV[1]) then return 0 end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+redis.call('RPUSH', KEYS[2], ARGV[2])
+return redis.call('SADD', KEYS[4], ARGV[4]) + 1
+"""
+
+# Closes the book only if it holds no bids (used by Buy Now).
+#   KEYS: bids, closed    ARGV: ttl    Returns: 1 closed, 0 has bids
+CLOSE_IF_EMPTY_SCRIPT = """
+if redis.call('ZCARD', KEYS[1]) > 0 then return 0 end
+redis.call('SET', KEYS[2], 1, 'EX', ARGV[1])
+return 1
+"""
+
+
+class OrderBook:
+    """Redis-backed order book."""
+
+    PENDING_SET = "orderbook:pending"
+
+    def __init__(self, url: str):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self._place = self.client.register_script(PLACE_SCRIPT)
+        self._close_if_empty = self.client.register_script(CLOSE_IF_EMPTY_SCRIPT)
+
+    @staticmethod
+    def _keys(auction_id: int):
+        prefix = f"orderbook:{auction_id}"
+        return f"{prefix}:bids", f"{prefix}:pending", f"{prefix}:closed"
+
+    def place(self, auction_id: int, entry: Dict, floor: Optional[int]) -> int:
+        bids, pending, closed = self._keys(auction_id)
+        return int(self._place(
+            keys=[bids, pending, closed, self.PENDING_SET],
+            args=[entry["amount"], json.dumps(entry), "" if floor is None else floor, auction_id],
+        ))
+
+    def highest(self, auction_id: int) -> Optional[int]:
+        top = self.client.zrevrange(self._keys(auction_id)[0], 0, 0, withscores=True)
+        return int(top[0][1]) if top else None
+
+    def pop_pending(self, auction_id: int, limit: int) -> List[Dict]:
+        items = self.client.lpop(self._keys(auction_id)[1], limit) or []
+        return [json.loads(item) for item in items]
+
+    def push_back(self, auction_id: int, entries: List[Dict]):
+        if entries:
+            self.client.lpush(self._keys(auction_id)[1], *[json.dumps(e) for e in reversed(entries)])
+
+    def unmark_pending(self, auction_id: int):
+        self.client.srem(self.PENDING_SET, auction_id)
+
+    def close(self, auction_id: int):
+        self.client.set(self._keys(auction_id)[2], 1, ex=CLOSED_TTL)
+
+    def close_if_empty(self, auction_id: int) -> bool:
+        bids, _, closed = self._keys(auction_id)
+        return bool(self._close_if_empty(keys=[bids, closed], args=[CLOSED_TTL]))
+
+    def reopen(self, auction_id: int):
+        self.client.delete(self._keys(auction_id)[2])
+
+    def discard(self, auction_id: int):
+        bids, pending, _ = self._keys(auction_id)
+        self.client.delete(bids, pending)
+
+
+class LocalOrderBook:
+    """Process-local stand-in with the same semantics as OrderBook."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bids: Dict[int, List[int]] = {}
+        self.pending: Dict[int, List[Dict]] = {}
+        self.pending_set = set()
+        self.closed = set()
+
+    def place(self, auction_id: int, entry: Dict, floor: Optional[int]) -> int:
+        with self.lock:
+            if auction_id in self.closed:
+                return -1
+            book = self.bids.setdefault(auction_id, [])
+            highest = book[-1] if book else floor
+            if highest is not None and highest >= entry["amount"]:
+                return 0
+            book.append(entry["amount"])
+            self.pending.setdefault(auction_id, []).append(entry)
+            newly_pending = auction_id not in self.pending_set
+            self.pending_set.add(auction_id)
+            return 2 if newly_pending else 1
+
+    def highest(self, auction_id: int) -> Optional[int]:
+        book = self.bids.get(auction_id)
+        return book[-1] if book else None
+
+    def pop_pending(self, auction_id: int, limit: int) -> List[Dict]:
+        with self.lock:
+            queue = self.pending.get(auction_id, [])
+            popped, self.pending[auction_id] = queue[:limit], queue[limit:]
+            return popped
+
+    def push_back(self, auction_id: int, entries: List[Dict]):
+        with self.lock:
+            self.pending[auction_id] = entries + self.pending.get(auction_id, [])
+
+    def unmark_pending(self, auction_id: int):
+        with self.lock:
+            self.pending_set.discard(auction_id)
+
+    def close(self, auction_id: int):
+        with self.lock:
+            self.closed.add(auction_id)
+
+    def close_if_empty(self, auction_id: int) -> bool:
+        with self.lock:
+            if self.bids.get(auction_id):
+                return False
+            self.closed.add(auction_id)
+            return True
+
+    def reopen(self, auction_id: int):
+        with self.lock:
+            self.closed.discard(auction_id)
+
+    def discard(self, auction_id: int):
+        with self.lock:
+            self.bids.pop(auction_id, None)
+            self.pending.pop(auction_id, None)
+
+
+_book = None
+_book_lock = threading.Lock()
+
+
+def get_order_book():
+    """
+    Returns the configured order book, or None when the feature is disabled.
+    """
+    global _book
+
+    url = getattr(settings, "AUCTION_ORDER_BOOK_URL", None)
+    if not url:
+        return None
+
+    with _book_lock:
+        if _book is None:
+            _book = LocalOrderBook() if url == "memory://" else OrderBook(url)
+    return _book
+
+
+def make_entry(buyer_id: int, amount_cents: int, offer_time: datetime) -> Dict:
+    return {
+        "id": uuid.uuid4().hex,
+        "buyer": buyer_id,
+        "amount": amount_cents,
+        "time": offer_time.isoformat(),
+    }
+
+
+def flush(book, auction_id: int, batch_size: int = 500) -> int:
+    """
+    Persists the pending bids of an auction as Offer rows, in batches,
+    and updates the auction bid summary. Returns the number of rows written.
+
+    Every batch is popped under the auction row lock: a concurrent drain()
+    waits for the batch in flight instead of finding the book empty.
+    """
+    from .models import Auction, Offer
+
+    written = 0
+    book.unmark_pending(auction_id)
+
+    while True:
+        entries = []
+        try:
+            with transaction.atomic():
+                Auction.objects.select_for_update().only("pk").get(pk=auction_id)
+
+                entries = book.pop_pending(auction_id, batch_size)
+                if not entries:
+                    return written
+
+                offers = [
+                    Offer(
+                        auction_id=auction_id,
+                        buyer_id=e["buyer"],
+                        type="BID",
+                        amount_cents=e["amount"],
+                        offer_time=parse_datetime(e["time"]),
+                    )
+                    for e in entries
+                ]
+                top = max(offers, key=lambda o: o.amount_cents)
+
+                Offer.objects.bulk_create(offers)
+                Auction.objects.filter(pk=auction_id).update(
+                    highest_bid_cents=top.amount_cents,
+                    bids_count=models.F("bids_count") + len(offers),
+                    last_bid_time=max(o.offer_time for o in offers),
+                )
+                Auction.invalidate_cache(auction_id)
+        except Exception:
+            # Keep the entries for the next attempt
+            book.push_back(auction_id, entries)
+            raise
+
+        written += len(entries)
+
+
+def drain(auction_id: int) -> int:
+    """
+    Closes the book of an auction and persists every pending bid.
+    Called before choosing the winner. No-op when the book is disabled.
+    """
+    book = get_order_book()
+    if book is None:
+        return 0
+
+    book.close(auction_id)
+    written = flush(book, auction_id)
+    book.discard(auction_id)
+    return written
+
+
+def reopen(auction_id: int):
+    """
+    Accepts bids again on a book closed for an auction that stays open
+    (drained, then not closed after all). No-op when the book is disabled.
+    """
+    book = get_order_book()
+    if book is not None:
+        book.reopen(auction_id)
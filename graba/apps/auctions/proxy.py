@@ -0,0 +1,105 @@
+from django.db import models
+from django.utils import timezone
+
+from datetime import datetime
+from typing import List
+
+from .models import Auction, Offer, ProxyBid
+
+
+# (price upper bound, increment) in cents, eBay-style
+BID_INCREMENTS = [
+    (100, 5),
+    (500, 25),
+    (2500, 50),
+    (10000, 100),
+    (25000, 250),
+    (50000, 500),
+    (100000, 1000),
+]
+MAX_INCREMENT = 2500
+
+
+def bid_increment(price_cents: int) -> int:
+    """
+    Returns the minimum raise over the given price.
+    """
+    for upper, increment in BID_INCREMENTS:
+        if price_cents < upper:
+            return increment
+    return MAX_INCREMENT
+
+
+def resolve(auction: Auction, price: int | None, leader_id: int | None, now: datetime | None = None) -> List[Offer]:
+    """
+    Resolves the competing proxy bids of an auction in a single step.
+
+    Given the current visible price and its leader, only the two strongest
+    active proxies can change the outcome: the strongest one wins at one
+    increment over the runner-up (capped at its maximum), and the runner-up
+    is recorded at its own maximum. Exhausted proxies are deactivated with
+    a single range UPDATE. Both queries use the partial (auction, max)
+    index on active proxies, so the cost is O(log n) in their number.
+
+    Must run in the transaction holding the auction row lock.
+    Creates at most two BID offers and updates the bid summary.
+    Returns the created offers, in bidding order.
+    """
+    now = now or timezone.now()
+
+    top = list(
+        ProxyBid.objects
+        .filter(auction=auction, active=True)
+        .select_related("buyer__role__user")
+        .order_by("-max_amount_cents", "created_at")[:2]
+    )
+
+    floor = price if price is not None else auction.min_price_cents
+    challengers = [p for p in top if p.max_amount_cents > floor]
+
+    # Nobody can beat the current price, or the leader is the only one who can
+    if not challengers or (len(challengers) == 1 and challengers[0].buyer_id == leader_id):
+        _deactivate_exhausted(auction, floor, keep=None)
+        return []
+
+    winner = challengers[0]
+    runner = challengers[1] if len(challengers) > 1 else None
+
+    offers = []
+    rival = floor
+
+    if runner is not None:
+        rival = runner.max_amount_cents
+        # On ties the earlier proxy wins at its whole maximum
+        if runner.max_amount_cents < winner.max_amount_cents:
+            offers.append(Offer(
+                auction=auction, buyer=runner.buyer, type="BID",
+                amount_cents=runner.max_amount_cents, offer_time=now,
+            ))
+
+    offers.append(Offer(
+        auction=auction, buyer=winner.buyer, type="BID",
+        amount_cents=min(winner.max_amount_cents, rival + bid_increment(rival)), offer_time=now,
+    ))
+
+    Offer.objects.bulk_create(offers)
+
+    final = offers[-1].amount_cents
+    Auction.objects.filter(pk=auction.pk).update(
+        highest_bid_cents=final,
+        bids_count=models.F("bids_count") + len(offers),
+        last_bid_time=now,
+    )
+    auction.highest_bid_cents = final
+    auction.bids_count += len(offers)
+    auction.last_bid_time = now
+
+    _deactivate_exhausted(auction, final, keep=winner.pk)
+    return offers
+
+
+def _deactivate_exhausted(auction: Auction, price: int, keep: int | None):
+    exhausted = ProxyBid.objects.filter(auction=auction, active=True, max_amount_cents__lte=price)
+    if keep is not None:
+        exhausted = exhausted.exclude(pk=keep)
+    exhausted.update(active=False)
@@ -0,0 +1,105 @@
+"""
+Scheduling of the auction open and close procedures.
+
+Two modes, selected by ``AUCTION_SCHEDULER``:
+
+- ``clocked``: one ClockedSchedule and one-off PeriodicTask per auction
+  open, fired by django-celery-beat. Closes are grouped by end minute: one
+  one-off ``close_auctions_task`` per minute in which auctions end closes
+  every due auction in batches (thousands often end at the same minute).
+- ``sweeper``: a single periodic task (``sweep_auctions_task``) queries the
+  auctions due to open or close and processes them in batches. No rows
+  are created per auction.
+"""
+from django.conf import settings
+
+from django_celery_beat.models import ClockedSchedule, PeriodicTask
+from datetime import datetime, timedelta, timezone as dt_timezone
+import json
+
+from .models import Auction
+
+
+OPEN_TASK = "auctions.tasks.open_auction_task"
+CLOSE_TASK = "auctions.tasks.close_auction_task"
+CLOSE_MANY_TASK = "auctions.tasks.close_auctions_task"
+
+
+def uses_sweeper() -> bool:
+    return getattr(settings, "AUCTION_SCHEDULER", "clocked") == "sweeper"
+
+
+def schedule_auction(auction: Auction, now):
+    """
+    Schedules the opening and the closing of a new auction.
+    """
+    if uses_sweeper():
+        return
+
+    if now < auction.start_date:
+        clocked, _ = ClockedSchedule.objects.get_or_create(
+            clocked_time=auction.start_date
+        )
+
+        PeriodicTask.objects.create(
+            clocked=clocked,
+            one_off=True,
+            name=f"open_auction_{auction.pk}",
+            task=OPEN_TASK,
+            args=json.dumps([auction.pk]),
+        )
+
+    if now < auction.end_date:
+        schedule_auction_close(auction.end_date)
+
+
+def close_minute(end_date: datetime) -> datetime:
+    """
+    The first minute mark at or after the end date, in UTC.
+    """
+    minute = end_date.astimezone(dt_timezone.utc).replace(second=0, microsecond=0)
+    return minute if minute == end_date else minute + timedelta(minutes=1)
+
+
+def schedule_auction_close(end_date: datetime):
+    """
+    Makes sure the auctions are closed at the minute mark following the end
+    date, by the task shared by every auction ending in that minute.
+    Also called when anti-sniping moves an end date.
+    """
+    if uses_sweeper():
+        return
+
+    minute = close_minute(end_date)
+    name = f"close_auctions_{minute:%Y%m%d%H%M}"
+    if PeriodicTask.objects.filter(name=name).exists():
+        return
+
+    clocked, _ = ClockedSchedule.objects.get_or_create(clocked_time=minute)
+    PeriodicTask.objects.get_or_create(
+        name=name,
+        defaults={"clocked": clocked, "one_off": True, "task": CLOSE_MANY_TASK},
+    )
+
+
+def unschedule_auction_close(auction_id: int):
+    """
+    Removes the scheduled closing of an auction closed ahead of time (Buy Now).
+    Only auctions scheduled before the closes were grouped by minute have
+    one: the minute tasks skip the auctions already closed.
+    """
+    if uses_sweeper():
+        return
+
+    PeriodicTask.objects.filter(name=f"close_auction_{auction_id}").delete()
+
+
+def per_auction_tasks():
+    """
+    The PeriodicTask rows created by the clocked mode (per auction opens,
+    per minute closes, and the per auction closes scheduled before those).
+    """
+    return PeriodicTask.objects.filter(
+        task__in=(OPEN_TASK, CLOSE_TASK, CLOSE_MANY_TASK),
+        name__regex=r"^((open|close)_auction_[0-9]+|close_auctions_[0-9]{12})$",
+    )
@@ -1,20 +1,22 @@
 # graba/apps/auctions/tasks.py
 import json
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 
 from .models import Auction, WinnerOffer
+from .broadcast import coalescer, send_to_group, send_to_groups
+from . import orderbook
 
 
 def broadcast_auction_status(auction: Auction):
     """
     Broadcasts auction status update to connected WebSocket clients.
     """
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        f"auction_{auction.pk}",
+    coalescer.flush(auction.pk)
+    send_to_group(
+        auction.pk,
         {
             "type": "auction_status_update",
             "status": auction.status,
@@ -23,6 +25,23 @@ def broadcast_auction_status(auction: Auction):
     )
 
 
+def broadcast_auction_statuses(auction_ids, status: str):
+    """
+    Broadcasts the same status update to the clients of many auctions at once.
+    """
+    for auction_id in auction_ids:
+        coalescer.flush(auction_id)
+
+    send_to_groups({
+        auction_id: {
+            "type": "auction_status_update",
+            "status": status,
+            "auction_id": auction_id,
+        }
+        for auction_id in auction_ids
+    })
+
+
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=10, retry_kwargs={"max_retries": 5})
 def open_auction_task(self, auction_id: int):
     """
@@ -47,7 +66,8 @@ def open_auction_task(self, auction_id: int):
 def close_auction_task(self, auction_id: int):
     """
     Closes an auction, assigns the winner (if any), notifies clients with WebSocket.
-    Safe to retry.
+    Safe to retry. Only fired by the per-auction rows scheduled before the
+    closes were grouped by minute (see close_auctions_task).
     """
     try:
         auction = Auction.objects.get(pk=auction_id)
@@ -57,7 +77,99 @@ def close_auction_task(self, auction_id: int):
     if auction.status != "OPEN":
         return
 
+    # Anti-sniping may have moved the deadline: re-arm at the new end
+    if auction.end_date > timezone.now():
+        close_auction_task.apply_async(args=[auction_id], eta=auction.end_date)
+        return
+
     auction.close()
 
     # Notify WebSocket
     broadcast_auction_status(auction)
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=10, retry_kwargs={"max_retries": 5})
+def close_auctions_task(self):
+    """
+    Closes every auction that is due with the bulk closing procedure, in
+    batches, and notifies their clients. Fired at each minute mark in which
+    auctions end (clocked mode). Safe to retry.
+    """
+    batch_size = getattr(settings, "AUCTION_SWEEP_BATCH_SIZE", 500)
+
+    while sweep_due_closes(batch_size):
+        pass
+
+
+@shared_task(bind=True, ignore_result=True)
+def sweep_auctions_task(self):
+    """
+    Opens and closes every auction that is due, in batches (sweeper mode).
+    Runs periodically. Overlapping sweeps never process the same auction
+    twice: opens lock their rows with SKIP LOCKED where supported, closes
+    are re-checked under the row lock by Auction.close_many.
+    """
+    batch_size = getattr(settings, "AUCTION_SWEEP_BATCH_SIZE", 500)
+
+    while sweep_due(Auction.objects.filter(status="SCHEDULED", start_date__lte=timezone.now()).order_by("start_date"), batch_size, Auction.open):
+        pass
+
+    while sweep_due_closes(batch_size):
+        pass
+
+
+def sweep_due(queryset, batch_size: int, procedure) -> bool:
+    """
+    Applies the procedure to a batch of due auctions and notifies their clients.
+    Returns True if the batch was full (more auctions may be due).
+    """
+    with transaction.atomic():
+        auctions = list(queryset.select_for_update(skip_locked=True)[:batch_size])
+        for auction in auctions:
+            procedure(auction)
+
+    for auction in auctions:
+        broadcast_auction_status(auction)
+
+    return len(auctions) == batch_size
+
+
+def sweep_due_closes(batch_size: int) -> bool:
+    """
+    Closes a batch of due auctions with the bulk closing procedure.
+    Returns True if the batch was full (more auctions may be due).
+    """
+    # Locked by close_many: overlapping sweeps wait, then skip the closed ones
+    due = list(
+        Auction.objects
+        .filter(status="OPEN", end_date__lte=timezone.now())
+        .order_by("end_date")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    closed = Auction.close_many(due)
+
+    broadcast_auction_statuses(closed, "CLOSED")
+    return len(due) == batch_size
+
+
+def schedule_order_book_flush(auction_id: int):
+    """
+    Schedules the write-behind of the pending order book bids of an auction.
+    """
+    persist_order_book_task.apply_async(
+        args=[auction_id],
+        countdown=getattr(settings, "AUCTION_ORDER_BOOK_FLUSH_DELAY", 1),
+    )
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=1, retry_kwargs={"max_retries": 5})
+def persist_order_book_task(self, auction_id: int):
+    """
+    Persists the pending order book bids of an auction as Offer rows, in batches.
+    Safe to retry: entries of a failed batch are put back in the book.
+    """
+    book = orderbook.get_order_book()
+    if book is None:
+        return
+
+    orderbook.flush(book, auction_id)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from django_celery_beat.models import PeriodicTask
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.bidding import place_bid
+from auctions.models import Auction
+from auctions.scheduling import close_minute
+from auctions.tasks import close_auction_task
+
+
+class AntiSnipingTest(TestCase):
+
+    def setUp(self):
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=seller_user,
+            type="SELLER"
+        )
+        seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(
+            user=buyer_user,
+            type="BUYER"
+        )
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+        self.end_date = timezone.now() + timedelta(minutes=1)
+        self.auction = Auction.objects.create(
+            seller=seller,
+            title="Test Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=self.end_date,
+            min_price_cents=100,
+            snipe_window_minutes=2,
+            snipe_extension_minutes=5,
+        )
+
+    def test_late_bid_extends_once_per_window(self):
+        with mock.patch("auctions.bidding.send_to_group") as send:
+            with self.captureOnCommitCallbacks(execute=True):
+                place_bid(self.auction, self.buyer, 200)
+
+            self.auction.refresh_from_db()
+            self.assertEqual(self.auction.end_date, self.end_date + timedelta(minutes=5))
+            self.assertEqual(send.call_args.args[1]["type"], "auction_extended")
+
+            # Now out of the window
+            with self.captureOnCommitCallbacks(execute=True):
+                place_bid(self.auction, self.buyer, 300)
+
+            self.auction.refresh_from_db()
+            self.assertEqual(self.auction.end_date, self.end_date + timedelta(minutes=5))
+            self.assertEqual(send.call_count, 1)
+
+    def test_close_task_rearms_on_moved_deadline(self):
+        with mock.patch.object(close_auction_task, "apply_async") as apply_async:
+            close_auction_task(self.auction.pk)
+
+        apply_async.assert_called_once_with(args=[self.auction.pk], eta=self.end_date)
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.status, "OPEN")
+
+    def test_extension_schedules_the_new_close_minute(self):
+        with mock.patch("auctions.bidding.send_to_group"), self.captureOnCommitCallbacks(execute=True):
+            place_bid(self.auction, self.buyer, 200)
+
+        minute = close_minute(self.end_date + timedelta(minutes=5))
+        task = PeriodicTask.objects.get(name=f"close_auctions_{minute:%Y%m%d%H%M}")
+        self.assertEqual(task.clocked.clocked_time, minute)
@@ -0,0 +1,160 @@
+from datetime import timedelta
+from importlib import import_module, reload
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+from django.utils import timezone
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions import urls
+from auctions.models import Auction, Offer
+from auctions.views import AsyncAuctionBidView, AsyncAuctionBuyNowView, AuctionBidView, AuctionBuyNowView
+
+
+def reload_urls():
+    # The views are picked when the URLconf is imported
+    reload(urls)
+    reload(import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@override_settings(AUCTION_ASYNC_VIEWS=True, AUCTION_BROADCAST_WINDOW_MS=0)
+class AsyncBidViewsTest(TestCase):
+
+    def setUp(self):
+        reload_urls()
+        self.addCleanup(reload_urls)
+
+        # Seller
+        self.seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=self.seller_user,
+            type="SELLER"
+        )
+        self.seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        # Buyer
+        self.buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(
+            user=self.buyer_user,
+            type="BUYER"
+        )
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+        # Open auction
+        self.auction = Auction.objects.create(
+            seller=self.seller,
+            title="Test Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100 * 10,
+            buy_now_price_cents=100 * 50,
+        )
+
+        self.bid_url = reverse("auctions:auction-bid", args=[self.auction.pk])
+        self.buy_now_url = reverse("auctions:auction-buy-now", args=[self.auction.pk])
+
+        # Events sent to the WebSocket clients
+        patches = [
+            mock.patch("auctions.broadcast.asend_to_group"),
+            mock.patch("auctions.views.asend_to_group"),
+        ]
+        self.coalesced, self.sent = [p.start() for p in patches]
+        for p in patches:
+            self.addCleanup(p.stop)
+
+    def test_setting_selects_the_views(self):
+        self.assertIs(resolve(self.bid_url).func.view_class, AsyncAuctionBidView)
+        self.assertIs(resolve(self.buy_now_url).func.view_class, AsyncAuctionBuyNowView)
+
+        with self.settings(AUCTION_ASYNC_VIEWS=False):
+            reload_urls()
+            self.assertIs(resolve(self.bid_url).func.view_class, AuctionBidView)
+            self.assertIs(resolve(self.buy_now_url).func.view_class, AuctionBuyNowView)
+
+    async def test_bid(self):
+        await self.async_client.aforce_login(self.buyer_user)
+
+        response = await self.async_client.post(self.bid_url, {"amount": "15.00"})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertFalse(data["outbid"])
+        self.assertEqual(data["amount_cents"], 1500)
+
+        self.assertEqual(await Offer.objects.filter(auction=self.auction, type="BID").acount(), 1)
+        event = self.coalesced.call_args.args[1]
+        self.assertEqual(event["type"], "state_update")
+        self.assertEqual(event["state_update"]["highest"]["amount_cents"], 1500)
+
+    async def test_rejected_bids(self):
+        await self.async_client.aforce_login(self.buyer_user)
+
+        rejected = {
+            "": "No amount provided.",
+            "abc": "Invalid amount.",
+            "5.00": "Bid must be higher than the minimum price.",
+        }
+        for amount, error in rejected.items():
+            response = await self.async_client.post(self.bid_url, {"amount": amount})
+            self.assertEqual(response.status_code, 403)
+            self.assertEqual(response.json()["error"], error)
+
+        self.assertFalse(await Offer.objects.aexists())
+        self.coalesced.assert_not_called()
+
+    async def test_roles_are_checked(self):
+        # Sellers cannot bid on or buy their own auction
+        await self.async_client.aforce_login(self.seller_user)
+
+        response = await self.async_client.post(self.bid_url, {"amount": "15.00"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["error"], "Sellers cannot bid on their own auction.")
+
+        response = await self.async_client.post(self.buy_now_url)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["error"], "Sellers cannot buy their own auction.")
+
+        # Anonymous users are no buyers
+        await self.async_client.alogout()
+
+        response = await self.async_client.post(self.bid_url, {"amount": "15.00"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["error"], "User is not a buyer.")
+
+        self.assertFalse(await Offer.objects.aexists())
+
+    async def test_buy_now(self):
+        await self.async_client.aforce_login(self.buyer_user)
+
+        response = await self.async_client.post(self.buy_now_url)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["username"], "buyer")
+
+        auction = await Auction.objects.aget(pk=self.auction.pk)
+        self.assertEqual(auction.status, "CLOSED")
+        self.assertTrue(auction.buy_now_taken)
+        self.assertEqual(self.sent.call_args.args[1]["type"], "buy_now")
+
+        # Not twice
+        response = await self.async_client.post(self.buy_now_url)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["error"], "Auction is not active.")
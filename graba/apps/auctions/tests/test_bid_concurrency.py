@@ -0,0 +1,169 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+import threading
+import random
+import time
+
+from django.db import connection
+from django.test import TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.utils import timezone
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions import orderbook
+from auctions.bidding import BidError, place_bid, register_proxy_bid
+from auctions.models import Auction, Offer
+
+
+class BidConcurrencyTest(TransactionTestCase):
+
+    THREADS = 8
+    BIDS_PER_THREAD = 25
+
+    def setUp(self):
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(user=seller_user, type="SELLER")
+        self.seller = Seller.objects.create(role=seller_role, collection_address="Test address")
+
+        self.buyers = []
+        for i in range(self.THREADS):
+            user = User.objects.create_user(
+                email=f"buyer{i}@email.com",
+                username=f"buyer{i}",
+                password="testpass"
+            )
+            role = Role.objects.create(user=user, type="BUYER")
+            self.buyers.append(Buyer.objects.create(role=role))
+
+        self.auction = Auction.objects.create(
+            seller=self.seller,
+            title="Hot Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100,
+        )
+
+    def _bidder(self, buyer):
+        rng = random.Random(buyer.pk)
+        accepted = 0
+        try:
+            for _ in range(self.BIDS_PER_THREAD):
+                # Every thread works on its own (possibly stale) snapshot
+                auction = Auction.objects.get(pk=self.auction.pk)
+                amount = (auction.highest_bid_cents or 100) + rng.randint(-50, 100)
+                try:
+                    place_bid(auction, buyer, amount)
+                    accepted += 1
+                except BidError:
+                    pass
+        finally:
+            connection.close()
+        return accepted
+
+    def test_parallel_bids_are_strictly_increasing(self):
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            accepted = sum(pool.map(self._bidder, self.buyers))
+
+        amounts = list(
+            Offer.objects
+            .filter(auction=self.auction, type="BID")
+            .order_by("pk")
+            .values_list("amount_cents", flat=True)
+        )
+
+        self.assertEqual(len(amounts), accepted)
+        self.assertTrue(all(a < b for a, b in zip(amounts, amounts[1:])))
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.bids_count, len(amounts))
+        self.assertEqual(self.auction.highest_bid_cents, amounts[-1])
+
+    def _proxy_bidder(self, buyer):
+        rng = random.Random(buyer.pk)
+        try:
+            for _ in range(self.BIDS_PER_THREAD):
+                auction = Auction.objects.get(pk=self.auction.pk)
+                try:
+                    register_proxy_bid(auction, buyer, (auction.highest_bid_cents or 100) + rng.randint(50, 500))
+                except BidError:
+                    pass
+        finally:
+            connection.close()
+
+    # SQLite has no row locks: a read turned into a write fails at once
+    @skipUnlessDBFeature("has_select_for_update")
+    def test_proxy_registrations_race_manual_bids(self):
+        # Both paths lock the auction row first: no deadlock, no lost update
+        half = self.THREADS // 2
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            futures = [pool.submit(self._bidder, buyer) for buyer in self.buyers[:half]]
+            futures += [pool.submit(self._proxy_bidder, buyer) for buyer in self.buyers[half:]]
+            for future in futures:
+                future.result()
+
+        amounts = list(
+            Offer.objects
+            .filter(auction=self.auction, type="BID")
+            .order_by("pk")
+            .values_list("amount_cents", flat=True)
+        )
+        self.assertTrue(all(a < b for a, b in zip(amounts, amounts[1:])))
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.bids_count, len(amounts))
+        self.assertEqual(self.auction.highest_bid_cents, amounts[-1])
+
+    @skipUnlessDBFeature("has_select_for_update")
+    @override_settings(AUCTION_ORDER_BOOK_URL="memory://")
+    def test_close_waits_for_the_batch_in_flight(self):
+        with mock.patch.object(orderbook, "_book", None), \
+                mock.patch("auctions.bidding.schedule_order_book_flush"):
+            place_bid(self.auction, self.buyers[0], 1500)
+            book = orderbook.get_order_book()
+
+            # The worker pops the batch, then stalls before writing it
+            popped, resume = threading.Event(), threading.Event()
+            pop_pending = book.pop_pending
+
+            def pop_and_stall(*args):
+                entries = pop_pending(*args)
+                if entries:
+                    popped.set()
+                    resume.wait(5)
+                return entries
+
+            def persist():
+                try:
+                    orderbook.flush(book, self.auction.pk)
+                finally:
+                    connection.close()
+
+            def close():
+                try:
+                    Auction.objects.get(pk=self.auction.pk).close()
+                finally:
+                    connection.close()
+
+            with mock.patch.object(book, "pop_pending", side_effect=pop_and_stall):
+                worker = threading.Thread(target=persist)
+                worker.start()
+                self.assertTrue(popped.wait(5))
+
+                closer = threading.Thread(target=close)
+                closer.start()
+                # Give the close the time to reach the row lock
+                time.sleep(0.2)
+                resume.set()
+
+                worker.join()
+                closer.join()
+
+        # The winner is picked once the batch is written
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.status, "CLOSED")
+        self.assertEqual(self.auction.winner_offer.offer.amount_cents, 1500)
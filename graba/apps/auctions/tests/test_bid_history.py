@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.history import get_bid_page
+from auctions.models import Auction, Offer
+
+
+class BidHistoryTest(TestCase):
+
+    def setUp(self):
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=seller_user,
+            type="SELLER"
+        )
+        seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(
+            user=buyer_user,
+            type="BUYER"
+        )
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+        self.auction = Auction.objects.create(
+            seller=seller,
+            title="Test Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100,
+        )
+
+        # Same amount and time on some rows, so the id breaks the ties
+        now = timezone.now()
+        Offer.objects.bulk_create([
+            Offer(auction=self.auction, buyer=self.buyer, type="BID",
+                  amount_cents=1000 + (i // 3) * 100, offer_time=now)
+            for i in range(25)
+        ])
+
+    def test_pages_cover_every_bid_once_in_order(self):
+        expected = list(
+            Offer.objects.filter(auction=self.auction, type="BID")
+            .order_by("-amount_cents", "-offer_time", "-id")
+            .values_list("pk", flat=True)
+        )
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = get_bid_page(self.auction, cursor, limit=10)
+            seen += [o.pk for o in page]
+            if cursor is None: break
+
+        self.assertEqual(seen, expected)
+
+    def test_endpoint(self):
+        url = reverse("auctions:auction-bid-history", args=[self.auction.pk])
+
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["bids"][0]["amount_cents"], 1800)
+        self.assertIsNotNone(data["next_cursor"])
+
+        response = self.client.get(url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
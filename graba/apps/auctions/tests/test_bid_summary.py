@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction, Offer
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class BidSummaryTest(TestCase):
+
+    def setUp(self):
+        # Seller
+        self.seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=self.seller_user,
+            type="SELLER"
+        )
+        self.seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        # Buyer
+        self.buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(
+            user=self.buyer_user,
+            type="BUYER"
+        )
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+        # Open auction
+        self.auction = Auction.objects.create(
+            seller=self.seller,
+            title="Test Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100 * 10,
+            buy_now_price_cents=100 * 50,
+        )
+
+    def test_bid_updates_summary(self):
+        self.client.login(email="buyer@email.com", password="testpass")
+
+        for amount in ("15.00", "20.50"):
+            response = self.client.post(
+                reverse("auctions:auction-bid", args=[self.auction.pk]),
+                {"amount": amount},
+                HTTP_ACCEPT="application/json"
+            )
+            self.assertEqual(response.status_code, 200)
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.bids_count, 2)
+        self.assertEqual(self.auction.highest_bid_cents, 2050)
+        self.assertIsNotNone(self.auction.last_bid_time)
+        self.assertFalse(self.auction.buy_now_taken)
+
+    def test_buy_now_marks_summary(self):
+        self.client.login(email="buyer@email.com", password="testpass")
+
+        response = self.client.post(
+            reverse("auctions:auction-buy-now", args=[self.auction.pk]),
+            HTTP_ACCEPT="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.status, "CLOSED")
+        self.assertTrue(self.auction.buy_now_taken)
+
+    def test_rebuild_from_offers(self):
+        Offer.objects.create(auction=self.auction, buyer=self.buyer, type="BID", amount_cents=1500)
+        Offer.objects.create(auction=self.auction, buyer=self.buyer, type="BID", amount_cents=1800)
+
+        Auction.rebuild_bid_summary()
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.bids_count, 2)
+        self.assertEqual(self.auction.highest_bid_cents, 1800)
+        self.assertFalse(self.auction.buy_now_taken)
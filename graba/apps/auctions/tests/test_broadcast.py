@@ -0,0 +1,54 @@
+from unittest import mock
+import asyncio
+import time
+
+from django.test import SimpleTestCase
+
+from auctions.broadcast import BroadcastCoalescer
+
+
+class BroadcastCoalescerTest(SimpleTestCase):
+
+    def bid(self, amount_cents):
+        return {
+            "username": "buyer",
+            "amount_cents": amount_cents,
+            "amount_display": f"{amount_cents / 100:.2f}",
+            "offer_time": "2025-01-01T10:00:00",
+        }
+
+    @mock.patch("auctions.broadcast.send_to_group")
+    def test_burst_is_merged_into_one_message(self, send_to_group):
+        coalescer = BroadcastCoalescer(window=0.05)
+
+        for amount in (1000, 1100, 1200):
+            coalescer.add_bid(1, self.bid(amount))
+        coalescer.add_bid(2, self.bid(500))
+
+        time.sleep(0.2)
+
+        self.assertEqual(send_to_group.call_count, 2)
+
+        sent = {call.args[0]: call.args[1] for call in send_to_group.call_args_list}
+        message = sent[1]
+        self.assertEqual(message["type"], "state_update")
+        self.assertEqual(len(message["state_update"]["bids"]), 3)
+        self.assertEqual(message["state_update"]["highest"]["amount_cents"], 1200)
+
+    @mock.patch("auctions.broadcast.send_to_group")
+    @mock.patch("auctions.broadcast.asend_to_group")
+    async def test_async_callers_flush_on_their_loop(self, asend_to_group, send_to_group):
+        coalescer = BroadcastCoalescer(window=0.05)
+
+        with mock.patch("threading.Timer") as timer:
+            for amount in (1000, 1100):
+                await coalescer.aadd_bid(1, self.bid(amount))
+            timer.assert_not_called()
+
+        await asyncio.gather(*coalescer.tasks)
+
+        asend_to_group.assert_awaited_once()
+        message = asend_to_group.call_args.args[1]
+        self.assertEqual(len(message["state_update"]["bids"]), 2)
+        send_to_group.assert_not_called()
+        self.assertFalse(coalescer.tasks)
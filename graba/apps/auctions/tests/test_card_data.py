@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction, Category
+from core.categories import get_category_tree
+from favorites.models import FavoriteAuction
+
+
+class AuctionCardDataTest(TestCase):
+
+    def setUp(self):
+        self.seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=self.seller_user,
+            type="SELLER"
+        )
+        self.seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        self.buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(
+            user=self.buyer_user,
+            type="BUYER"
+        )
+        Buyer.objects.create(role=buyer_role)
+
+        self.category = Category.objects.create(name="Cameras")
+        self.client.login(email="buyer@email.com", password="testpass")
+
+    def create_auctions(self, n):
+        auctions = Auction.objects.bulk_create([
+            Auction(
+                seller=self.seller,
+                category=self.category,
+                title=f"Auction {i}",
+                status="OPEN",
+                start_date=timezone.now() - timedelta(hours=1),
+                end_date=timezone.now() + timedelta(days=1),
+                min_price_cents=100,
+            )
+            for i in range(n)
+        ])
+        FavoriteAuction.objects.bulk_create([
+            FavoriteAuction(user=user, auction=auction)
+            for auction in auctions
+            for user in (self.buyer_user, self.seller_user)
+        ])
+        return auctions
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_annotations(self):
+        auction, = self.create_auctions(1)
+        FavoriteAuction.objects.filter(user=self.buyer_user).delete()
+
+        card = Auction.objects.with_card_data(self.buyer_user).get(pk=auction.pk)
+        self.assertEqual(card.favorites_count, 1)
+        self.assertFalse(card.is_favorite)
+
+        card = Auction.objects.with_card_data(self.seller_user).get(pk=auction.pk)
+        self.assertTrue(card.is_favorite)
+
+    def test_home_page_query_count_does_not_grow_with_the_page(self):
+        # Loaded once per process, by whichever request comes first
+        get_category_tree()
+
+        self.create_auctions(1)
+        one = self.count_queries(reverse("core:home"))
+
+        self.create_auctions(14)
+        self.assertEqual(self.count_queries(reverse("core:home")), one)
+
+    def test_profile_query_count_does_not_grow_with_the_page(self):
+        url = reverse("accounts:profile", args=[self.seller_user.pk])
+
+        # Both counts load the profile summary
+        self.create_auctions(1)
+        cache.clear()
+        one = self.count_queries(url)
+
+        self.create_auctions(2)
+        cache.clear()
+        self.assertEqual(self.count_queries(url), one)
@@ -0,0 +1,113 @@
+from unittest import mock
+import asyncio
+import msgpack
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from channels.routing import URLRouter
+
+from auctions import encoding
+from auctions.broadcast import asend_to_group, group_name
+from auctions import fanout
+from auctions.fanout import FanoutHub
+from auctions.routing import websocket_urlpatterns
+
+
+@override_settings(
+    AUCTION_WS_FANOUT=True,
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class FanoutHubTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    async def connect(self):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/auction/1/")
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def test_one_group_member_per_process(self):
+        hub = FanoutHub()
+        with mock.patch("auctions.consumers.hub", hub):
+            first, second = await self.connect(), await self.connect()
+
+            layer = get_channel_layer()
+            self.assertEqual(len(layer.groups[group_name(1)]), 1)
+            self.assertEqual(hub.watchers(1), 2)
+
+            await asend_to_group(1, {"type": "auction_status_update", "auction_id": 1, "status": "CLOSED"})
+
+            for communicator in (first, second):
+                message = await communicator.receive_json_from()
+                self.assertEqual(message["status"], "CLOSED")
+
+            await first.disconnect()
+            await second.disconnect()
+
+            self.assertEqual(hub.watchers(1), 0)
+            self.assertFalse(layer.groups.get(group_name(1)))
+
+    async def test_reader_survives_channel_layer_errors(self):
+        event = {"type": "auction_status_update", "auction_id": 1, "status": "CLOSED"}
+        received = asyncio.Event()
+
+        class Consumer:
+            async def auction_status_update(self, message):
+                received.set()
+
+        # Fails once, delivers, then waits for the next event
+        results = [ConnectionError("lost"), event]
+
+        async def receive(channel):
+            if not results:
+                await asyncio.Event().wait()
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        layer = mock.AsyncMock()
+        layer.new_channel.return_value = "hub.channel"
+        layer.receive.side_effect = receive
+
+        hub = FanoutHub(channel_layer=layer)
+        with mock.patch.object(fanout, "RETRY_DELAY", 0), self.assertLogs("auctions.fanout", "ERROR"):
+            await hub.subscribe(1, Consumer())
+            await asyncio.wait_for(received.wait(), 1)
+
+        # Joined again after the error, still subscribed
+        self.assertEqual(layer.group_add.await_count, 2)
+        self.assertEqual(hub.watchers(1), 1)
+        self.assertFalse(hub.subscriptions[1].reader.done())
+
+        hub.subscriptions[1].reader.cancel()
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class EncodingTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_negotiated_encodings(self):
+        plain = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/auction/2/")
+        compact = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/auction/2/", subprotocols=[encoding.COMPACT])
+        binary = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/auction/2/", subprotocols=[encoding.MSGPACK])
+
+        for communicator in (plain, compact, binary):
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+
+        await asend_to_group(2, {"type": "auction_status_update", "auction_id": 2, "status": "CLOSED"})
+
+        self.assertEqual((await plain.receive_json_from())["status"], "CLOSED")
+        self.assertEqual((await compact.receive_json_from())["st"], "CLOSED")
+        self.assertEqual(msgpack.unpackb(await binary.receive_from())["st"], "CLOSED")
+
+        for communicator in (plain, compact, binary):
+            await communicator.disconnect()
@@ -0,0 +1,18 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from io import StringIO
+from unittest import skipUnless
+
+from auctions.management.commands.explain_hot_queries import FULL_SCAN_PATTERNS
+
+
+@skipUnless(connection.vendor in FULL_SCAN_PATTERNS, "Query plans are not checked on this database.")
+class HotQueryPlansTest(TestCase):
+
+    def test_hot_queries_use_indexes(self):
+        # Raises CommandError on a full scan or an unindexed sort
+        out = StringIO()
+        call_command("explain_hot_queries", stdout=out)
+        self.assertNotIn("sorted without an index", out.getvalue())
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions import orderbook
+from auctions.bidding import BidError, place_bid, buy_now, get_highest_bid
+from auctions.checks import check_order_book_url
+from auctions.models import Auction, Offer, WinnerOffer
+
+
+@override_settings(AUCTION_ORDER_BOOK_URL="memory://")
+class OrderBookTest(TestCase):
+
+    def setUp(self):
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(user=seller_user, type="SELLER")
+        self.seller = Seller.objects.create(role=seller_role, collection_address="Test address")
+
+        buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(user=buyer_user, type="BUYER")
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+        self.auction = Auction.objects.create(
+            seller=self.seller,
+            title="Test Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=1000,
+            buy_now_price_cents=5000,
+        )
+
+        # Fresh local book, no Celery worker
+        patches = [
+            mock.patch.object(orderbook, "_book", None),
+            mock.patch("auctions.bidding.schedule_order_book_flush"),
+        ]
+        self.schedule_flush = [p.start() for p in patches][1]
+        for p in patches:
+            self.addCleanup(p.stop)
+
+    def test_bids_are_checked_against_the_book(self):
+        place_bid(self.auction, self.buyer, 1500)
+        place_bid(self.auction, self.buyer, 1600)
+
+        with self.assertRaises(BidError):
+            place_bid(Auction.objects.get(pk=self.auction.pk), self.buyer, 1550)
+
+        # Write-behind: nothing persisted yet, one flush scheduled
+        self.assertFalse(Offer.objects.exists())
+        self.schedule_flush.assert_called_once_with(self.auction.pk)
+        self.assertEqual(get_highest_bid(self.auction), 1600)
+
+        # Buy Now is no longer possible
+        with self.assertRaises(BidError):
+            buy_now(self.auction, self.buyer)
+
+    def test_close_drains_the_book(self):
+        place_bid(self.auction, self.buyer, 1500)
+        place_bid(self.auction, self.buyer, 2000)
+
+        auction = Auction.objects.get(pk=self.auction.pk)
+        auction.close()
+
+        self.assertEqual(Offer.objects.filter(auction=auction, type="BID").count(), 2)
+        self.assertEqual(auction.winner_offer.offer.amount_cents, 2000)
+        self.assertEqual(auction.bids_count, 2)
+
+        # Late bids are rejected by the closed book
+        with self.assertRaises(BidError):
+            place_bid(self.auction, self.buyer, 3000)
+
+    def test_close_many_drains_only_the_auctions_closed(self):
+        place_bid(self.auction, self.buyer, 1500)
+
+        due = Auction.objects.create(
+            seller=self.seller,
+            title="Due Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(minutes=1),
+            min_price_cents=1000,
+        )
+        place_bid(due, self.buyer, 1200)
+        Auction.objects.filter(pk=due.pk).update(end_date=timezone.now() - timedelta(seconds=1))
+
+        # Picked as due, but extended since then: its book stays open
+        closed = Auction.close_many([self.auction.pk, due.pk])
+
+        self.assertEqual(closed, [due.pk])
+        self.assertEqual(Offer.objects.get(auction=due).amount_cents, 1200)
+        self.assertFalse(Offer.objects.filter(auction=self.auction).exists())
+        place_bid(Auction.objects.get(pk=self.auction.pk), self.buyer, 1600)
+
+    def test_failed_buy_now_reopens_the_book(self):
+        # Bids counted in the database but not in the book (e.g. Redis restarted)
+        Auction.objects.filter(pk=self.auction.pk).update(bids_count=1, highest_bid_cents=1200)
+        auction = Auction.objects.get(pk=self.auction.pk)
+
+        with self.assertRaises(BidError):
+            buy_now(auction, self.buyer)
+
+        place_bid(Auction.objects.get(pk=self.auction.pk), self.buyer, 1500)
+        self.assertEqual(get_highest_bid(self.auction), 1500)
+
+    def test_failed_close_many_keeps_the_bids(self):
+        place_bid(self.auction, self.buyer, 1500)
+        Auction.objects.filter(pk=self.auction.pk).update(end_date=timezone.now() - timedelta(seconds=1))
+
+        with mock.patch.object(WinnerOffer.objects, "bulk_create", side_effect=RuntimeError("down")), \
+                self.assertRaises(RuntimeError):
+            Auction.close_many([self.auction.pk])
+
+        # Drained before the batch: the bid is persisted, the book open again
+        auction = Auction.objects.get(pk=self.auction.pk)
+        self.assertEqual(auction.status, "OPEN")
+        self.assertEqual(Offer.objects.get(auction=auction).amount_cents, 1500)
+        self.assertEqual(auction.highest_bid_cents, 1500)
+
+        Auction.objects.filter(pk=self.auction.pk).update(end_date=timezone.now() + timedelta(days=1))
+        place_bid(Auction.objects.get(pk=self.auction.pk), self.buyer, 1600)
+
+        # The next sweep closes it with every bid
+        Auction.objects.filter(pk=self.auction.pk).update(end_date=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(Auction.close_many([self.auction.pk]), [self.auction.pk])
+        self.assertEqual(Auction.objects.get(pk=self.auction.pk).winner_offer.offer.amount_cents, 1600)
+
+    def test_flush_pops_under_the_auction_lock(self):
+        place_bid(self.auction, self.buyer, 1500)
+        book = orderbook.get_order_book()
+
+        popped_after = []
+        pop_pending = book.pop_pending
+
+        def pop_and_record(*args):
+            popped_after.append([q["sql"] for q in queries.captured_queries])
+            return pop_pending(*args)
+
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch.object(book, "pop_pending", side_effect=pop_and_record):
+            orderbook.flush(book, self.auction.pk)
+
+        # The batch is taken with the row locked, as drain() does before closing
+        self.assertTrue(any('FROM "auctions_auction"' in sql for sql in popped_after[0]))
+        self.assertEqual(Offer.objects.get(auction=self.auction).amount_cents, 1500)
+
+
+class OrderBookUrlCheckTest(SimpleTestCase):
+
+    def test_process_local_book_is_rejected(self):
+        with self.settings(AUCTION_ORDER_BOOK_URL="memory://"):
+            self.assertEqual([e.id for e in check_order_book_url(None)], ["auctions.E002"])
+
+        for url in (None, "redis://localhost:6379/2"):
+            with self.settings(AUCTION_ORDER_BOOK_URL=url):
+                self.assertEqual(check_order_book_url(None), [])
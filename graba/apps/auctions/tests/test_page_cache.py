@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction
+
+
+class AuctionPageCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=seller_user,
+            type="SELLER"
+        )
+        self.seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Old address"
+        )
+
+        buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(
+            user=buyer_user,
+            type="BUYER"
+        )
+        Buyer.objects.create(role=buyer_role)
+
+        self.auction = Auction.objects.create(
+            seller=self.seller,
+            title="Test Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100,
+        )
+        self.url = reverse("auctions:auction-detail", args=[self.auction.pk])
+
+    def test_seller_edits_refresh_the_seller_block(self):
+        self.assertContains(self.client.get(self.url), "Old address")
+
+        self.seller.collection_address = "New address"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seller.save()
+        self.assertContains(self.client.get(self.url), "New address")
+
+        user = self.seller.role.user
+        user.username = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertContains(self.client.get(self.url), "renamed")
+
+    def test_edit_bumps_version(self):
+        self.assertContains(self.client.get(self.url), "Test Auction")
+
+        self.auction.description = "A brand new description"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.auction.save()
+        self.assertContains(self.client.get(self.url), "A brand new description")
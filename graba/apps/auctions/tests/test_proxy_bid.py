@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.bidding import place_bid, register_proxy_bid
+from auctions.models import Auction, Offer, ProxyBid
+
+
+class ProxyBidTest(TestCase):
+
+    def setUp(self):
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(user=seller_user, type="SELLER")
+        self.seller = Seller.objects.create(role=seller_role, collection_address="Test address")
+
+        self.buyers = {}
+        for name in ("alice", "bob", "carol"):
+            user = User.objects.create_user(
+                email=f"{name}@email.com",
+                username=name,
+                password="testpass"
+            )
+            role = Role.objects.create(user=user, type="BUYER")
+            self.buyers[name] = Buyer.objects.create(role=role)
+
+        self.auction = Auction.objects.create(
+            seller=self.seller,
+            title="Test Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=1000,
+        )
+
+    def auction_state(self):
+        self.auction.refresh_from_db()
+        return self.auction.highest_bid_cents, self.auction.bids_count
+
+    def test_competing_proxies_resolve_in_one_step(self):
+        alice, bob = self.buyers["alice"], self.buyers["bob"]
+
+        # First proxy opens at one increment over the minimum price
+        offers = register_proxy_bid(self.auction, alice, 5000)
+        self.assertEqual([o.amount_cents for o in offers], [1050])
+
+        # A weaker proxy is recorded at its maximum and outbid by one increment
+        offers = register_proxy_bid(self.auction, bob, 3000)
+        self.assertEqual([(o.buyer, o.amount_cents) for o in offers], [(bob, 3000), (alice, 3100)])
+        self.assertEqual(self.auction_state(), (3100, 3))
+
+        self.assertFalse(ProxyBid.objects.get(buyer=bob).active)
+        self.assertTrue(ProxyBid.objects.get(buyer=alice).active)
+
+    def test_manual_bids_against_a_proxy(self):
+        alice, carol = self.buyers["alice"], self.buyers["carol"]
+        register_proxy_bid(self.auction, alice, 5000)
+
+        # The proxy answers within the same request
+        offers = place_bid(Auction.objects.get(pk=self.auction.pk), carol, 4000)
+        self.assertEqual([(o.buyer, o.amount_cents) for o in offers], [(carol, 4000), (alice, 4100)])
+
+        # Above the maximum the proxy is exhausted
+        offers = place_bid(Auction.objects.get(pk=self.auction.pk), carol, 6000)
+        self.assertEqual([o.amount_cents for o in offers], [6000])
+        self.assertEqual(self.auction_state(), (6000, 4))
+        self.assertFalse(ProxyBid.objects.get(buyer=alice).active)
+
+        amounts = list(Offer.objects.order_by("pk").values_list("amount_cents", flat=True))
+        self.assertEqual(amounts, sorted(amounts))
+
+    def test_registration_locks_the_auction_before_the_proxies(self):
+        # Same order as place_bid (auction row, then proxy rows), or the two deadlock
+        with CaptureQueriesContext(connection) as queries:
+            register_proxy_bid(self.auction, self.buyers["alice"], 5000)
+
+        tables = [
+            ("auction" if '"auctions_auction"' in q["sql"].split("WHERE")[0] else
+             "proxy" if '"auctions_proxybid"' in q["sql"] else None)
+            for q in queries.captured_queries
+        ]
+        tables = [t for t in tables if t]
+        self.assertEqual(tables[0], "auction")
+        self.assertLess(tables.index("auction"), tables.index("proxy"))
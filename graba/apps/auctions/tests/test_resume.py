@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from channels.testing import WebsocketCommunicator
+from channels.routing import URLRouter
+
+from accounts.models import User, Role, Seller
+from auctions.broadcast import asend_to_group
+from auctions.checks import check_event_cache
+from auctions.models import Auction
+from auctions.routing import websocket_urlpatterns
+
+
+@override_settings(
+    AUCTION_EVENT_BUFFER_SIZE=3,
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class ResumeTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=seller_user,
+            type="SELLER"
+        )
+        seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        self.auction = Auction.objects.create(
+            seller=seller,
+            title="Test Auction",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100,
+        )
+
+    def event(self, i):
+        return {"type": "auction_extended", "auction_id": self.auction.pk, "end_date": str(i)}
+
+    async def resume(self, last_seq):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/auction/{self.auction.pk}/")
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        await communicator.send_json_to({"type": "resume", "last_seq": last_seq})
+        return communicator
+
+    async def test_missed_events_are_replayed_in_order(self):
+        for i in range(1, 5):
+            await asend_to_group(self.auction.pk, self.event(i))
+
+        communicator = await self.resume(2)
+        received = [await communicator.receive_json_from() for _ in range(2)]
+        self.assertEqual([m["seq"] for m in received], [3, 4])
+        self.assertTrue(await communicator.receive_nothing())
+        await communicator.disconnect()
+
+    async def test_snapshot_when_too_many_missed(self):
+        for i in range(1, 6):
+            await asend_to_group(self.auction.pk, self.event(i))
+
+        communicator = await self.resume(1)
+        message = await communicator.receive_json_from()
+        self.assertEqual(message["type"], "snapshot")
+        self.assertEqual(message["seq"], 5)
+        self.assertEqual(message["snapshot"]["status"], "OPEN")
+        await communicator.disconnect()
+
+    async def test_nothing_missed_since_the_render(self):
+        # Pages resume from the rendered seq on their first connection too
+        communicator = await self.resume(0)
+        self.assertTrue(await communicator.receive_nothing())
+
+        await asend_to_group(self.auction.pk, self.event(1))
+        message = await communicator.receive_json_from()
+        self.assertEqual(message["seq"], 1)
+        await communicator.disconnect()
+
+
+class EventCacheCheckTest(SimpleTestCase):
+
+    REDIS_LAYER = {"default": {"BACKEND": "channels_redis.core.RedisChannelLayer"}}
+    MEMORY_LAYER = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+    LOCAL_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    REDIS_CACHE = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+
+    def test_process_local_cache_with_shared_layer(self):
+        with self.settings(CHANNEL_LAYERS=self.REDIS_LAYER, CACHES=self.LOCAL_CACHE):
+            self.assertEqual([e.id for e in check_event_cache(None)], ["auctions.W001"])
+
+    def test_shared_cache_or_single_process(self):
+        with self.settings(CHANNEL_LAYERS=self.REDIS_LAYER, CACHES=self.REDIS_CACHE):
+            self.assertEqual(check_event_cache(None), [])
+        with self.settings(CHANNEL_LAYERS=self.MEMORY_LAYER, CACHES=self.LOCAL_CACHE):
+            self.assertEqual(check_event_cache(None), [])
@@ -0,0 +1,160 @@
+from datetime import timedelta
+from io import StringIO
+import json
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from django_celery_beat.models import ClockedSchedule, PeriodicTask
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction, Offer, WinnerOffer
+from auctions.scheduling import close_minute, schedule_auction
+from auctions.tasks import close_auctions_task, sweep_auctions_task
+
+
+class SchedulingTestCase(TestCase):
+
+    def setUp(self):
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=seller_user,
+            type="SELLER"
+        )
+        self.seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(
+            user=buyer_user,
+            type="BUYER"
+        )
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+    def create_auction(self, status, start, end):
+        now = timezone.now()
+        return Auction.objects.create(
+            seller=self.seller,
+            title="Test Auction",
+            status=status,
+            start_date=now + start,
+            end_date=now + end,
+            min_price_cents=100,
+        )
+
+
+@override_settings(
+    AUCTION_SCHEDULER="sweeper",
+    AUCTION_SWEEP_BATCH_SIZE=2,
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class SweeperTest(SchedulingTestCase):
+
+    def test_sweep_opens_and_closes_due_auctions(self):
+        due_open = [self.create_auction("SCHEDULED", timedelta(minutes=-1), timedelta(days=1)) for _ in range(3)]
+        not_due = self.create_auction("SCHEDULED", timedelta(hours=1), timedelta(days=1))
+        due_close = self.create_auction("OPEN", timedelta(days=-1), timedelta(minutes=-1))
+
+        offer = Offer.objects.create(auction=due_close, buyer=self.buyer, type="BID", amount_cents=500)
+
+        sweep_auctions_task()
+
+        for auction in due_open:
+            auction.refresh_from_db()
+            self.assertEqual(auction.status, "OPEN")
+
+        not_due.refresh_from_db()
+        self.assertEqual(not_due.status, "SCHEDULED")
+
+        due_close.refresh_from_db()
+        self.assertEqual(due_close.status, "CLOSED")
+        self.assertEqual(WinnerOffer.objects.get(auction=due_close).offer, offer)
+
+    def test_no_per_auction_rows(self):
+        auction = self.create_auction("SCHEDULED", timedelta(hours=1), timedelta(days=1))
+        schedule_auction(auction, timezone.now())
+        self.assertFalse(PeriodicTask.objects.exists())
+
+    def test_purge_per_auction_rows(self):
+        clocked = ClockedSchedule.objects.create(clocked_time=timezone.now() + timedelta(days=1))
+        for i in range(3):
+            PeriodicTask.objects.create(
+                clocked=clocked, one_off=True, name=f"close_auction_{i}",
+                task="auctions.tasks.close_auction_task", args=json.dumps([i]),
+            )
+        PeriodicTask.objects.create(
+            clocked=clocked, one_off=True, name="unrelated", task="config.celery.debug_task",
+        )
+
+        call_command("purge_auction_schedules", batch_size=2, stdout=StringIO())
+
+        self.assertEqual(list(PeriodicTask.objects.values_list("name", flat=True)), ["unrelated"])
+        self.assertTrue(ClockedSchedule.objects.exists())
+
+    def test_close_many_picks_top_bid_per_auction(self):
+        with_bids = self.create_auction("OPEN", timedelta(days=-1), timedelta(minutes=-1))
+        without_bids = self.create_auction("OPEN", timedelta(days=-1), timedelta(minutes=-1))
+        already_closed = self.create_auction("CLOSED", timedelta(days=-1), timedelta(minutes=-1))
+
+        now = timezone.now()
+        Offer.objects.create(auction=with_bids, buyer=self.buyer, type="BID", amount_cents=300, offer_time=now)
+        first_top = Offer.objects.create(auction=with_bids, buyer=self.buyer, type="BID", amount_cents=500, offer_time=now)
+        Offer.objects.create(auction=with_bids, buyer=self.buyer, type="BID", amount_cents=500, offer_time=now + timedelta(seconds=1))
+
+        closed = Auction.close_many([with_bids.pk, without_bids.pk, already_closed.pk])
+
+        self.assertCountEqual(closed, [with_bids.pk, without_bids.pk])
+        self.assertEqual(WinnerOffer.objects.get().offer, first_top)
+        self.assertEqual(Auction.objects.filter(status="CLOSED").count(), 3)
+
+
+@override_settings(
+    AUCTION_SCHEDULER="clocked",
+    AUCTION_SWEEP_BATCH_SIZE=2,
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class ClockedCloseTest(SchedulingTestCase):
+
+    def test_one_close_task_per_end_minute(self):
+        end = timezone.now().replace(second=0, microsecond=0) + timedelta(days=7, seconds=20)
+        for offset in (0, 10, 60):
+            auction = Auction.objects.create(
+                seller=self.seller,
+                title="Test Auction",
+                status="SCHEDULED",
+                start_date=timezone.now() + timedelta(hours=1),
+                end_date=end + timedelta(seconds=offset),
+                min_price_cents=100,
+            )
+            schedule_auction(auction, timezone.now())
+
+        closes = PeriodicTask.objects.filter(task="auctions.tasks.close_auctions_task").order_by("clocked__clocked_time")
+        self.assertEqual(
+            [task.clocked.clocked_time for task in closes],
+            [close_minute(end), close_minute(end) + timedelta(minutes=1)],
+        )
+        # Plus one open per auction
+        self.assertEqual(PeriodicTask.objects.filter(task="auctions.tasks.open_auction_task").count(), 3)
+
+    def test_close_task_closes_every_due_auction(self):
+        due = [self.create_auction("OPEN", timedelta(days=-1), timedelta(seconds=-1)) for _ in range(5)]
+        extended = self.create_auction("OPEN", timedelta(days=-1), timedelta(minutes=5))
+        offer = Offer.objects.create(auction=due[0], buyer=self.buyer, type="BID", amount_cents=500)
+
+        close_auctions_task()
+
+        self.assertEqual(Auction.objects.filter(pk__in=[a.pk for a in due], status="CLOSED").count(), 5)
+        self.assertEqual(WinnerOffer.objects.get().offer, offer)
+        extended.refresh_from_db()
+        self.assertEqual(extended.status, "OPEN")
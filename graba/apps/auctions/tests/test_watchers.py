@@ -0,0 +1,36 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from auctions.watchers import WatcherTracker, watcher_count, watcher_counts
+
+
+class WatcherTrackerTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_counts_add_up_across_processes(self):
+        first, second = WatcherTracker(), WatcherTracker()
+
+        # Heartbeats are driven by hand
+        with mock.patch.object(WatcherTracker, "_run", mock.AsyncMock()):
+            for _ in range(3): first.join(1)
+            second.join(1)
+            second.join(2)
+            first.leave(1)
+
+        with mock.patch("auctions.watchers.asend_to_group") as send:
+            await first.beat(100, 5)
+            await second.beat(100, 5)
+            self.assertEqual(watcher_count(1), 0)
+
+            await first.beat(101, 5)
+            await second.beat(101, 5)
+
+        self.assertEqual(watcher_counts([1, 2, 3]), {1: 3, 2: 1, 3: 0})
+
+        # Pushed once per auction and bucket
+        pushed = sorted((call.args[0], call.args[1]["watchers"]) for call in send.call_args_list)
+        self.assertEqual(pushed, [(1, 3), (2, 1)])
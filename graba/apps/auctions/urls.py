@@ -1,18 +1,32 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     AuctionCreateView,
     AuctionDetailView,
+    AuctionBidHistoryView,
     AuctionBidView,
-    AuctionBuyNowView
+    AuctionBuyNowView,
+    AuctionProxyBidView,
+    AsyncAuctionBidView,
+    AsyncAuctionBuyNowView,
 )
 
 
 app_name = "auctions"
 
 
+# Serve bids natively on the ASGI event loop (Daphne) when enabled
+if settings.AUCTION_ASYNC_VIEWS:
+    bid_view, buy_now_view = AsyncAuctionBidView, AsyncAuctionBuyNowView
+else:
+    bid_view, buy_now_view = AuctionBidView, AuctionBuyNowView
+
+
 urlpatterns = [
     path("create/", AuctionCreateView.as_view(), name="create"),
     path("auction/<int:key>/", AuctionDetailView.as_view(), name="auction-detail"),
-    path("auction/<int:key>/bid/", AuctionBidView.as_view(), name="auction-bid"),
-    path("auction/<int:key>/buy-now/", AuctionBuyNowView.as_view(), name="auction-buy-now"),
+    path("auction/<int:key>/bids/", AuctionBidHistoryView.as_view(), name="auction-bid-history"),
+    path("auction/<int:key>/bid/", bid_view.as_view(), name="auction-bid"),
+    path("auction/<int:key>/proxy/", AuctionProxyBidView.as_view(), name="auction-proxy-bid"),
+    path("auction/<int:key>/buy-now/", buy_now_view.as_view(), name="auction-buy-now"),
 ]
@@ -1,25 +1,29 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import redirect, get_object_or_404
+from django.conf import settings
+from django.db.models import F
+from django.shortcuts import redirect, get_object_or_404, aget_object_or_404
 from django.views.generic import CreateView, DetailView
 from django.http import JsonResponse, HttpResponseForbidden
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.views import View
 
-from django_celery_beat.models import ClockedSchedule, PeriodicTask
-import json
-
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-
-from decimal import Decimal
+from asgiref.sync import sync_to_async
 
+from .broadcast import coalescer, current_seq, send_to_group, asend_to_group
+from .bidding import BidError, parse_bid_amount, place_bid, register_proxy_bid, buy_now, get_highest_bid
+from .history import bid_payload, get_bid_page
 from .mixins import SellerRequiredMixin
-from .models import Auction, Offer, WinnerOffer
+from .scheduling import schedule_auction, unschedule_auction_close
+from .watchers import watcher_count
+from .models import Auction
 from .forms import AuctionForm
 
-from accounts.models import Seller, Role
+from accounts import profile
+from accounts.roles import aget_roles
+from core.cache import get_version
 from favorites.models import FavoriteAuction
+from core.shared_pages import SharedPageMixin
 from core.templatetags import custom_filters
 
 
@@ -30,54 +34,25 @@ class AuctionCreateView(SellerRequiredMixin, CreateView):
 
     def form_valid(self, form):
         auction = form.instance
-        user = self.request.user
 
         # Get the active Seller Role
-        try:
-            seller_role = Role.objects.get(user=user, type="SELLER", state="ACTIVE")
-            seller_obj = Seller.objects.get(role=seller_role)
-        except (Role.DoesNotExist, Seller.DoesNotExist):
+        seller_obj = self.request.roles.seller
+        if seller_obj is None:
             form.add_error(None, "Cannot find the Seller profile for this user.")
             return self.form_invalid(form)
 
         now = timezone.now()
 
         # Set the correct state
-        auction.state = 'SCHEDULED' if now < auction.start_date else 'OPEN'
+        auction.status = 'SCHEDULED' if now < auction.start_date else 'OPEN'
 
         # Link the Auction to the Seller
         auction.seller = seller_obj
         auction.save()
 
 
-        # === SCHEDULING AUCTION OPEN TASK | CELERY ===
-        if now < auction.start_date:
-            clocked, _ = ClockedSchedule.objects.get_or_create(
-                clocked_time=auction.start_date
-            )
-
-            PeriodicTask.objects.create(
-                clocked=clocked,
-                one_off=True,
-                name=f"open_auction_{auction.pk}",
-                task="auctions.tasks.open_auction_task",
-                args=json.dumps([auction.pk]),
-            )
-        
-        # === SCHEDULING AUCTION CLOSE TASK | CELERY ===
-        if now < auction.end_date:
-            clocked, _ = ClockedSchedule.objects.get_or_create(
-                clocked_time=auction.end_date
-            )
-
-            PeriodicTask.objects.create(
-                clocked=clocked,
-                one_off=True,
-                name=f"close_auction_{auction.pk}",
-                task="auctions.tasks.close_auction_task",
-                args=json.dumps([auction.pk]),
-            )
-        
+        # === SCHEDULING AUCTION OPEN AND CLOSE | CELERY ===
+        schedule_auction(auction, now)
 
         return super().form_valid(form)
 
@@ -85,28 +60,42 @@ class AuctionCreateView(SellerRequiredMixin, CreateView):
         return reverse_lazy("accounts:profile", kwargs={"pk": self.request.user.pk})
 
 
-class AuctionDetailView(DetailView):
+class AuctionDetailView(SharedPageMixin, DetailView):
     model = Auction
     pk_url_kwarg = "key"
     template_name = "auctions/auction.html"
 
+    def get_queryset(self):
+        # The seller's user, whose profile version keys the seller block
+        return super().get_queryset().annotate(seller_user_id=F("seller__role__user_id"))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        auction = self.get_object()
-        user = self.request.user
+        auction = self.object
+        roles = self.request.roles
 
-        # Auction and Seller context variables
-        context["is_seller"] = user.is_authenticated and user.has_role('SELLER') and user == auction.seller.role.user
-        context["is_buyer"] = user.is_authenticated and user.has_role('BUYER') and not context["is_seller"]
+        # Static parts of the page are cached as fragments of this version
+        context["cache_version"] = auction.cache_version
+        # The seller block also shows the seller's details (bumped by core.signals)
+        context["seller_version"] = get_version(profile.version_key(auction.seller_user_id))
+        context["fragment_cache_timeout"] = settings.AUCTION_FRAGMENT_CACHE_TIMEOUT
 
-        context["highest_bid"] = auction.get_highest_offer_value(type_='BID')
+        # Auction and Seller context variables (without loading the seller chain,
+        # which is only needed to render the cached seller block)
+        context["is_seller"] = roles.is_seller_of(auction)
+        context["is_buyer"] = roles.is_buyer and not context["is_seller"]
+
+        context["highest_bid"] = get_highest_bid(auction)
         context["buy_now_offer"] = auction.get_highest_offer_value(type_='BUY_NOW')
         
         context["has_offers"] = auction.has_offers
         context["is_bn_enabled"] = auction.is_bn_enabled()
         
-        context["bids"] = Offer.objects.filter(auction=auction, type='BID').order_by("-amount_cents")
+        # Only the top bids, older ones are loaded on scroll
+        context["bids"], context["bids_next_cursor"] = get_bid_page(auction)
         context["auction_id"] = auction.pk
+        context["event_seq"] = current_seq(auction.pk)
+        context["watchers"] = watcher_count(auction.pk)
 
         # Other context variables
         
@@ -121,94 +110,193 @@ class AuctionDetailView(DetailView):
         # Querystring clear for pagination
         context['querystring'] = params.urlencode()
         
-        # Add favorites to context ONLY if user is authenticated
-        context['user_favorites'] = set(
-            FavoriteAuction.objects.filter(user=self.request.user)
-            .values_list('auction_id', flat=True)
-        ) if self.request.user.is_authenticated else set()
+        # Whether the user saved this auction (the user is anonymous on shared pages)
+        context['is_favorite'] = (
+            self.request.user.is_authenticated
+            and FavoriteAuction.objects.filter(user=self.request.user, auction=auction).exists()
+        )
         
         return context
 
 
+class AuctionBidHistoryView(View):
+
+    def get(self, request, key):
+        auction = get_object_or_404(Auction, pk=key)
+
+        try:
+            bids, next_cursor = get_bid_page(auction, request.GET.get("cursor"))
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        return JsonResponse({
+            "bids": [bid_payload(offer) for offer in bids],
+            "next_cursor": next_cursor,
+        })
+
+
 class AuctionBidView(View):
 
     def post(self, request, key):
         auction = get_object_or_404(Auction, pk=key)
 
         # Seller cannot bid on own auction
-        if request.user == auction.seller.role.user:
+        if request.roles.is_seller_of(auction):
             return JsonResponse({"error": "Sellers cannot bid on their own auction."}, status=403)
 
         # Must be a buyer
-        buyer_role = request.user.role_set.filter(type="BUYER").first()
-        if not buyer_role:
+        buyer = request.roles.buyer
+        if buyer is None:
             return JsonResponse({"error": "User is not a buyer."}, status=403)
-        buyer = buyer_role.buyer
 
-        # Extract amount
-        amount_str = request.POST.get("amount")
-        if not amount_str:
-            return JsonResponse({"error": "No amount provided."}, status=403)
+        # Extract amount, check and create the offers atomically
+        try:
+            amount_cents = parse_bid_amount(request.POST.get("amount"))
+            offers = place_bid(auction, buyer, amount_cents)
+        except BidError as e:
+            return JsonResponse({"error": str(e)}, status=403)
+
+        # Notify WebSocket (coalesced with the other bids of the window)
+        bids = [bid_payload(offer) for offer in offers]
+        for bid in bids:
+            coalescer.add_bid(auction.pk, bid)
+
+        # JSON response
+        return JsonResponse({
+            "success": True,
+            "type": "new_bid",
+            "outbid": offers[-1].buyer_id != buyer.pk,
+            **bids[0]
+        })
+
+class AuctionProxyBidView(View):
 
-        try: amount = Decimal(amount_str)
-        except: return JsonResponse({"error": "Invalid amount."}, status=403)
+    def post(self, request, key):
+        auction = get_object_or_404(Auction, pk=key)
 
-        if amount <= 0:
-            return JsonResponse({"error": "Bid must be greater than zero."}, status=403)
+        # Seller cannot bid on own auction
+        if request.roles.is_seller_of(auction):
+            return JsonResponse({"error": "Sellers cannot bid on their own auction."}, status=403)
 
-        amount_cents = int(amount * 100)
+        # Must be a buyer
+        buyer = request.roles.buyer
+        if buyer is None:
+            return JsonResponse({"error": "User is not a buyer."}, status=403)
+
+        # Extract the maximum amount, register it and resolve the proxies atomically
+        try:
+            max_amount_cents = parse_bid_amount(request.POST.get("amount"))
+            offers = register_proxy_bid(auction, buyer, max_amount_cents)
+        except BidError as e:
+            return JsonResponse({"error": str(e)}, status=403)
+
+        # Notify WebSocket (only the resulting bids, not the whole bidding war)
+        for offer in offers:
+            coalescer.add_bid(auction.pk, bid_payload(offer))
+
+        # JSON response
+        return JsonResponse({
+            "success": True,
+            "max_amount_display": custom_filters.cents_to_price(max_amount_cents),
+        })
 
-        # Highest bid check
-        highest_cents = auction.get_highest_offer_value(type_='BID')
-        if highest_cents and amount_cents <= highest_cents:
-            return JsonResponse({"error": "Bid must be higher than the current highest bid."}, status=403)
+class AuctionBuyNowView(View):
 
-        # Minimum price check
-        minimuum_cents = auction.min_price_cents
-        if amount_cents <= minimuum_cents:
-            return JsonResponse({"error": "Bid must be higher than the minimum price."}, status=403)
+    def post(self, request, key):
+        auction = get_object_or_404(Auction, pk=key)
 
-        # Auction must be active
-        if auction.status in ("CLOSED", "CANCELLED"):
+        # Auction must be OPEN
+        if auction.status != "OPEN":
             return JsonResponse({"error": "Auction is not active."}, status=403)
 
-        now = timezone.now()
+        # Buy Now must be enabled
+        if not auction.is_bn_enabled():
+            return JsonResponse({"error": "Buy Now is not available for this auction."}, status=403)
 
-        # Auction not started yet
-        if now < auction.start_date:
-            return JsonResponse({"error": "Auction has not started yet."}, status=403)
+        # Seller cannot buy own auction
+        if request.roles.is_seller_of(auction):
+            return JsonResponse({"error": "Sellers cannot buy their own auction."}, status=403)
 
-        # Auction already ended
-        if now > auction.end_date:
-            return JsonResponse({"error": "Auction has already ended."}, status=403)
+        # Must be a buyer
+        buyer = request.roles.buyer
+        if buyer is None:
+            return JsonResponse({"error": "User is not a buyer."}, status=403)
 
-        # Create offer
-        offer = Offer.objects.create(
-            auction=auction,
-            buyer=buyer,
-            type="BID",
-            amount_cents=amount_cents
-        )
+        # Check, create the offer and close the auction atomically
+        try:
+            offer = buy_now(auction, buyer)
+        except BidError as e:
+            return JsonResponse({"error": str(e)}, status=403)
+        
+        # Remove scheduled close_auction_task if exists
+        unschedule_auction_close(auction.pk)
 
         # Notify WebSocket
         payload = {
-            "type": "new_bid",
+            "type": "buy_now",
             "username": offer.buyer.role.user.username,
-            "amount_cents": amount_cents,
-            "amount_display": custom_filters.cents_to_price(amount_cents),
-            "offer_time": offer.offer_time.isoformat(timespec='seconds'),
+            "amount_display": custom_filters.cents_to_price(offer.amount_cents),
+            "offer_time": offer.offer_time.isoformat(timespec="seconds"),
         }
 
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(f"auction_{auction.pk}", payload)
+        coalescer.flush(auction.pk)
+        send_to_group(auction.pk, payload)
 
         # JSON response
-        return JsonResponse({"success": True, **payload})
+        return JsonResponse({
+            "success": True,
+            "message": "Auction successfully bought.",
+            **payload
+        })
 
-class AuctionBuyNowView(View):
 
-    def post(self, request, key):
-        auction = get_object_or_404(Auction, pk=key)
+
+# === ASYNC VARIANTS ===
+# Same behaviour as the views above, but served natively by the ASGI
+# event loop: only the transactional part hops to a worker thread and
+# the WebSocket notification is awaited directly.
+
+class AsyncAuctionBidView(View):
+
+    async def post(self, request, key):
+        auction = await aget_object_or_404(Auction, pk=key)
+        roles = await aget_roles(request)
+
+        # Seller cannot bid on own auction
+        if roles.is_seller_of(auction):
+            return JsonResponse({"error": "Sellers cannot bid on their own auction."}, status=403)
+
+        # Must be a buyer
+        buyer = roles.buyer
+        if buyer is None:
+            return JsonResponse({"error": "User is not a buyer."}, status=403)
+
+        # Extract amount, check and create the offers atomically
+        try:
+            amount_cents = parse_bid_amount(request.POST.get("amount"))
+            offers = await sync_to_async(place_bid)(auction, buyer, amount_cents)
+        except BidError as e:
+            return JsonResponse({"error": str(e)}, status=403)
+
+        # Notify WebSocket (coalesced with the other bids of the window)
+        bids = [bid_payload(offer) for offer in offers]
+        for bid in bids:
+            await coalescer.aadd_bid(auction.pk, bid)
+
+        # JSON response
+        return JsonResponse({
+            "success": True,
+            "type": "new_bid",
+            "outbid": offers[-1].buyer_id != buyer.pk,
+            **bids[0]
+        })
+
+
+class AsyncAuctionBuyNowView(View):
+
+    async def post(self, request, key):
+        auction = await aget_object_or_404(Auction, pk=key)
+        roles = await aget_roles(request)
 
         # Auction must be OPEN
         if auction.status != "OPEN":
@@ -218,65 +306,34 @@ class AuctionBuyNowView(View):
         if not auction.is_bn_enabled():
             return JsonResponse({"error": "Buy Now is not available for this auction."}, status=403)
 
-        # No BID offers allowed
-        if auction.has_offers:
-            return JsonResponse({"error": "Buy Now is disabled because bids already exist."}, status=403)
-
         # Seller cannot buy own auction
-        if request.user == auction.seller.role.user:
+        if roles.is_seller_of(auction):
             return JsonResponse({"error": "Sellers cannot buy their own auction."}, status=403)
 
         # Must be a buyer
-        buyer_role = request.user.role_set.filter(type="BUYER").first()
-        if not buyer_role:
+        buyer = roles.buyer
+        if buyer is None:
             return JsonResponse({"error": "User is not a buyer."}, status=403)
-        buyer = buyer_role.buyer
-
-        now = timezone.now()
-
-        if now < auction.start_date:
-            return JsonResponse({"error": "Auction has not started yet."}, status=403)
 
-        if now > auction.end_date:
-            return JsonResponse({"error": "Auction has already ended."}, status=403)
-
-        # Prevent double winner
-        if hasattr(auction, "winneroffer"):
-            return JsonResponse({"error": "Auction already has a winner."}, status=403)
-
-        # Create BUY_NOW offer
-        offer = Offer.objects.create(
-            auction=auction,
-            buyer=buyer,
-            type="BUY_NOW",
-            amount_cents=auction.buy_now_price_cents
-        )
-
-        # Create WinnerOffer
-        WinnerOffer.objects.create(
-            auction=auction,
-            offer=offer
-        )
+        # Check, create the offer and close the auction atomically
+        try:
+            offer = await sync_to_async(buy_now)(auction, buyer)
+        except BidError as e:
+            return JsonResponse({"error": str(e)}, status=403)
 
-        # Close auction
-        auction.status = "CLOSED"
-        auction.save(update_fields=["status"])
-        
         # Remove scheduled close_auction_task if exists
-        PeriodicTask.objects.filter(name=f"close_auction_{auction.pk}").delete()
+        await sync_to_async(unschedule_auction_close)(auction.pk)
 
         # Notify WebSocket
         payload = {
             "type": "buy_now",
-            "username": offer.buyer.role.user.username,
+            "username": buyer.role.user.username,
             "amount_display": custom_filters.cents_to_price(offer.amount_cents),
             "offer_time": offer.offer_time.isoformat(timespec="seconds"),
         }
 
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"auction_{auction.pk}", payload
-        )
+        await coalescer.aflush(auction.pk)
+        await asend_to_group(auction.pk, payload)
 
         # JSON response
         return JsonResponse({
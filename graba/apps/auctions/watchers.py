@@ -0,0 +1,108 @@
+"""
+Approximate live watcher count per auction.
+
+Each process keeps the number of its open sockets per auction in memory and,
+once per interval, adds it to a shared counter bucket for that interval
+(one cache increment per auction and process, nothing per connection).
+The total of the last complete bucket is the watcher count: it is stored
+for readers and pushed to the clients by a single process per interval.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from collections import Counter
+from typing import Dict, Iterable
+import asyncio
+import logging
+import time
+
+from .broadcast import asend_to_group
+
+
+logger = logging.getLogger(__name__)
+
+
+def interval() -> int:
+    return getattr(settings, "AUCTION_WATCHERS_INTERVAL", 5)
+
+
+def bucket_key(auction_id: int, bucket: int) -> str:
+    return f"auction:{auction_id}:watchers:{bucket}"
+
+
+def count_key(auction_id: int) -> str:
+    return f"auction:{auction_id}:watchers"
+
+
+def watcher_count(auction_id: int) -> int:
+    return cache.get(count_key(auction_id), 0)
+
+
+def watcher_counts(auction_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Watcher counts of many auctions in one cache round trip (e.g. for ranking).
+    """
+    auction_ids = list(auction_ids)
+    counts = cache.get_many([count_key(pk) for pk in auction_ids])
+    return {pk: counts.get(count_key(pk), 0) for pk in auction_ids}
+
+
+class WatcherTracker:
+    """
+    Counts the local sockets of the process and runs the heartbeat.
+    """
+
+    def __init__(self):
+        self.local: Counter = Counter()
+        self.heartbeat: asyncio.Task | None = None
+
+    def join(self, auction_id: int):
+        self.local[auction_id] += 1
+        if self.heartbeat is None or self.heartbeat.done():
+            self.heartbeat = asyncio.get_running_loop().create_task(self._run())
+
+    def leave(self, auction_id: int):
+        self.local[auction_id] -= 1
+        if self.local[auction_id] <= 0:
+            del self.local[auction_id]
+
+    async def _run(self):
+        while self.local:
+            period = interval()
+            await asyncio.sleep(period - time.time() % period)
+            try:
+                await self.beat(int(time.time() // period), period)
+            except Exception:
+                logger.exception("Watcher heartbeat failed")
+
+    async def beat(self, bucket: int, period: int):
+        """
+        Adds the local counts to the current bucket, then publishes the
+        total of the previous (complete) bucket of the auctions watched here.
+        """
+        for auction_id, sockets in list(self.local.items()):
+            key = bucket_key(auction_id, bucket)
+            await cache.aadd(key, 0, timeout=period * 3)
+            await cache.aincr(key, sockets)
+
+        for auction_id in list(self.local):
+            # A single process publishes each bucket
+            if not await cache.aadd(f"{bucket_key(auction_id, bucket)}:published", 1, timeout=period * 3):
+                continue
+
+            total = await cache.aget(bucket_key(auction_id, bucket - 1))
+            if total is None:
+                continue
+
+            previous = await cache.aget(count_key(auction_id))
+            await cache.aset(count_key(auction_id), total, timeout=period * 3)
+
+            if total != previous:
+                await asend_to_group(auction_id, {
+                    "type": "watchers",
+                    "auction_id": auction_id,
+                    "watchers": total,
+                })
+
+
+tracker = WatcherTracker()
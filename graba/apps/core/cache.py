@@ -0,0 +1,33 @@
+from django.core.cache import cache
+
+import time
+
+
+# Version keys never expire on their own: a new version is only needed
+# when the cached content changes.
+
+def get_version(key: str) -> int:
+    """
+    Returns the current version stored under the key, creating it if missing.
+
+    New versions start from the current time, so if the key gets evicted the
+    fragments cached under the old version are never read again.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, time.time_ns())
+    return version
+
+
+def bump_version(key: str) -> int:
+    """
+    Invalidates everything cached under the current version of the key.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Missing key: any new version will do
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
@@ -0,0 +1,103 @@
+"""
+Process-local cache of the category tree.
+
+Categories change rarely, but the search form and the category filter need
+them on every page. The tree is loaded with a single query and kept in
+memory by each process; saving or deleting a category bumps a shared
+version key (see core.signals), and every process reloads the tree the
+next time it sees a new version.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+import threading
+
+from .cache import get_version, bump_version
+
+
+VERSION_KEY = "categories:version"
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    name: str
+    level: int
+    parent: str | None
+    children: Tuple["CategoryNode", ...]
+
+
+class CategoryTree:
+    """
+    Immutable snapshot of the categories: the roots (level 1, by name),
+    each with its children, and a lookup by name.
+    """
+
+    def __init__(self, rows: List[Tuple[str, int, str | None]]):
+        children: Dict[str | None, List[str]] = {}
+        for name, _, parent in sorted(rows):
+            children.setdefault(parent, []).append(name)
+
+        info = {name: (level, parent) for name, level, parent in rows}
+        nodes: Dict[str, CategoryNode] = {}
+
+        def build(name: str) -> CategoryNode:
+            if name not in nodes:
+                level, parent = info[name]
+                nodes[name] = CategoryNode(
+                    name=name,
+                    level=level,
+                    parent=parent,
+                    children=tuple(build(child) for child in children.get(name, [])),
+                )
+            return nodes[name]
+
+        self.roots: Tuple[CategoryNode, ...] = tuple(build(name) for name in children.get(None, []))
+        self.by_name: Mapping[str, CategoryNode] = MappingProxyType({name: build(name) for name in info})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.by_name
+
+    def get(self, name: str) -> CategoryNode | None:
+        return self.by_name.get(name)
+
+    def subtree(self, name: str) -> List[str]:
+        """
+        Names of the category and of all its descendants (empty if unknown).
+        """
+        node = self.by_name.get(name)
+        if node is None:
+            return []
+
+        names, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            names.append(node.name)
+            stack.extend(node.children)
+        return names
+
+
+_tree: CategoryTree | None = None
+_version = None
+_lock = threading.Lock()
+
+
+def get_category_tree() -> CategoryTree:
+    """
+    Returns the category tree, reloading it only when the version changed.
+    """
+    global _tree, _version
+
+    version = get_version(VERSION_KEY)
+    if _tree is not None and _version == version:
+        return _tree
+
+    with _lock:
+        if _tree is None or _version != version:
+            from auctions.models import Category
+            _tree = CategoryTree(list(Category.objects.values_list("name", "level", "parent_id")))
+            _version = version
+    return _tree
+
+
+def invalidate():
+    bump_version(VERSION_KEY)
@@ -0,0 +1,28 @@
+# Execute the command with:
+#     python manage.py page_cache_stats [--reset]
+
+from django.core.management.base import BaseCommand
+
+from core import page_cache
+
+
+class Command(BaseCommand):
+    help = "Shows the hits and misses of the page cache since the last reset."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after showing them.")
+
+    def handle(self, *args, **options):
+        stats = page_cache.stats()
+        lookups = sum(stats.values())
+
+        for event in page_cache.EVENTS:
+            self.stdout.write(f"{event:>6}: {stats[event]}")
+
+        # Waits and stale hits are served from the cache too
+        served = stats[page_cache.HIT] + stats[page_cache.STALE] + stats[page_cache.WAIT]
+        ratio = 100 * served / lookups if lookups else 0
+        self.stdout.write(self.style.SUCCESS(f"{lookups} lookups, {ratio:.1f}% served from the cache."))
+
+        if options["reset"]:
+            page_cache.reset_stats()
@@ -0,0 +1,16 @@
+# Execute the command with:
+#     python manage.py rebuild_search_index
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Creates the auction full-text search index and indexes every auction."
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the search index ({search.get_backend().__class__.__name__})."))
@@ -0,0 +1,173 @@
+"""
+Server-side cache of whole pages (the home listing).
+
+A page is cached per normalized set of parameters, together with the version
+of its content: auction and offer writes bump VERSION_KEY (see core.signals)
+and category changes the category tree version. An entry is fresh for
+``HOME_PAGE_CACHE_TIMEOUT`` seconds, then kept as stale for
+``HOME_PAGE_CACHE_STALE_TIMEOUT`` more.
+
+Recomputation is single flight: when an entry is expired or outdated, the
+request that takes the lock renders the page while the others keep serving
+the stale entry. When there is no entry at all, the others wait for that
+render (up to WAIT_TIMEOUT) instead of rendering too. The lock lives in the
+default cache: with a shared one (CACHE_URL) it holds across processes, with
+the LocMemCache fallback only within each process.
+
+Every lookup is counted (see stats() and the page_cache_stats command) and
+reported in the X-Page-Cache response header.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from typing import Callable, Dict, Tuple
+from urllib.parse import urlencode
+import hashlib
+import time
+
+from .cache import get_version, bump_version
+from . import categories
+
+
+VERSION_KEY = "pages:version"
+
+# A render taking longer than this lets another request take over
+LOCK_TIMEOUT = 10
+# How long requests wait for the first render of a page, and how often they look
+WAIT_TIMEOUT = 2.0
+WAIT_INTERVAL = 0.05
+
+HIT, STALE, WAIT, MISS = "hit", "stale", "wait", "miss"
+EVENTS = (HIT, STALE, WAIT, MISS)
+
+
+def invalidate():
+    bump_version(VERSION_KEY)
+
+
+def current_version() -> str:
+    return f"{get_version(VERSION_KEY)}:{get_version(categories.VERSION_KEY)}"
+
+
+def cache_key(name: str, params: Dict[str, str]) -> str:
+    query = urlencode(sorted(params.items()))
+    return f"pages:{name}:{hashlib.md5(query.encode()).hexdigest()}"
+
+
+# === Metrics ===
+
+def _stats_key(event: str) -> str:
+    return f"pages:stats:{event}"
+
+
+def _count(event: str):
+    key = _stats_key(event)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted in between: losing one count is fine
+            pass
+
+
+def stats() -> Dict[str, int]:
+    """
+    Number of hits, stale hits, waits and misses since the last reset.
+    """
+    values = cache.get_many([_stats_key(event) for event in EVENTS])
+    return {event: values.get(_stats_key(event), 0) for event in EVENTS}
+
+
+def reset_stats():
+    cache.delete_many([_stats_key(event) for event in EVENTS])
+
+
+# === Lookup ===
+
+def _entry(response: HttpResponse, version: str) -> Dict:
+    return {
+        "version": version,
+        "expires": time.time() + settings.HOME_PAGE_CACHE_TIMEOUT,
+        "content": response.content,
+        "content_type": response["Content-Type"],
+    }
+
+
+def _response(entry: Dict) -> HttpResponse:
+    return HttpResponse(entry["content"], content_type=entry["content_type"])
+
+
+def get_page(key: str, render: Callable[[], HttpResponse]) -> Tuple[HttpResponse, str]:
+    """
+    Returns the cached page under the key, or renders it (once per shared
+    cache) with render(), which must return a rendered response. Only
+    200 responses are cached. Also returns what happened (one of EVENTS).
+    """
+    version = current_version()
+    entry = cache.get(key)
+    if entry is not None and entry["version"] == version and entry["expires"] > time.time():
+        _count(HIT)
+        return _response(entry), HIT
+
+    lock = f"{key}:lock"
+    if cache.add(lock, 1, timeout=LOCK_TIMEOUT):
+        try:
+            response = render()
+            if response.status_code == 200:
+                cache.set(key, _entry(response, version),
+                          timeout=settings.HOME_PAGE_CACHE_TIMEOUT + settings.HOME_PAGE_CACHE_STALE_TIMEOUT)
+        finally:
+            cache.delete(lock)
+        _count(MISS)
+        return response, MISS
+
+    # Somebody else is rendering: serve what there is
+    if entry is not None:
+        _count(STALE)
+        return _response(entry), STALE
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            _count(WAIT)
+            return _response(entry), WAIT
+
+    # The other render is taking too long
+    _count(MISS)
+    return render(), MISS
+
+
+class CachedPageMixin:
+    """
+    Serves the view from the page cache when HOME_PAGE_CACHE is on and the
+    page is the same for everybody (a shared page or an anonymous user).
+    The view defines page_cache_name and, when its output depends on the
+    request parameters, get_cache_params() returning them normalized.
+    """
+    page_cache_name: str
+
+    def get_cache_params(self) -> Dict[str, str]:
+        return {}
+
+    def is_cacheable(self) -> bool:
+        if not settings.HOME_PAGE_CACHE or self.request.method != "GET":
+            return False
+        # After SharedPageMixin, the user of a shared page is anonymous
+        return not self.request.user.is_authenticated
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_cacheable():
+            return super().dispatch(request, *args, **kwargs)
+
+        def render():
+            response = super(CachedPageMixin, self).dispatch(request, *args, **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+            return response
+
+        response, event = get_page(cache_key(self.page_cache_name, self.get_cache_params()), render)
+        response["X-Page-Cache"] = event.upper()
+        return response
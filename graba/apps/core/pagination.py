@@ -0,0 +1,192 @@
+"""
+Paginators for large listings.
+
+- KeysetPaginator: pages are addressed by opaque cursors holding the sort key
+  of the first/last row shown, so every page is a range scan on the ordering
+  (no OFFSET, no COUNT) and costs the same at any depth.
+- EstimatedCountPaginator: Django's numbered pages, with the total estimated
+  instead of counted.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from datetime import datetime
+from typing import List, Tuple
+import base64
+import json
+
+
+# Below this many rows the exact count is cheap enough
+COUNT_LIMIT = 1000
+
+
+def estimate_count(queryset: QuerySet, limit: int = COUNT_LIMIT) -> int:
+    """
+    Returns the number of rows of the queryset, exact when below the limit.
+    Above it, PostgreSQL returns the planner estimate; other databases stop
+    counting at the limit.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        plan = json.loads(queryset.explain(format="json"))
+        rows = int(plan[0]["Plan"]["Plan Rows"])
+        if rows >= limit:
+            return rows
+        return queryset.count()
+
+    # COUNT over a LIMIT subquery
+    return queryset[:limit].count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose total is estimated (see estimate_count). Without a
+    planner estimate, pages past the limit are not reachable.
+    """
+    count_limit = COUNT_LIMIT
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list, self.count_limit)
+
+
+def encode_cursor(direction: str, key: List) -> str:
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    return base64.urlsafe_b64encode(json.dumps([direction, values]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, List]:
+    """
+    Returns the (direction, key) of a cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        direction, values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if direction not in ("next", "previous") or not isinstance(values, list):
+            raise ValueError
+        return direction, values
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+class KeysetPage:
+    is_keyset = True
+
+    def __init__(self, object_list: List, paginator: "KeysetPaginator", next_cursor: str | None, previous_cursor: str | None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset on its ordering (the model ordering unless given),
+    with the primary key appended as tiebreaker. The ordering fields must be
+    non-null model fields.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int, estimate_count: bool = False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.estimate_count = estimate_count
+
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not any(f.lstrip("-") in ("pk", queryset.model._meta.pk.name) for f in ordering):
+            ordering.append("pk")
+        self.ordering = ordering
+
+    @cached_property
+    def count(self) -> int:
+        if self.estimate_count:
+            return estimate_count(self.queryset)
+        return self.queryset.count()
+
+    def _field(self, name: str):
+        meta = self.queryset.model._meta
+        return meta.pk if name == "pk" else meta.get_field(name)
+
+    def _key(self, obj) -> List:
+        return [getattr(obj, self._field(f.lstrip("-")).attname) for f in self.ordering]
+
+    def _parse_key(self, values: List) -> List:
+        if len(values) != len(self.ordering):
+            raise ValueError("Invalid cursor.")
+        try:
+            return [self._field(f.lstrip("-")).to_python(v) for f, v in zip(self.ordering, values)]
+        except Exception as e:
+            raise ValueError("Invalid cursor.") from e
+
+    def _seek(self, key: List, forward: bool) -> Q:
+        """
+        Rows strictly after (or before) the key in the ordering:
+        (a > x) OR (a = x AND b > y) OR ..., each comparison following
+        the direction of its field.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(self.ordering, key):
+            name = field.lstrip("-")
+            descending = field.startswith("-")
+            lookup = "lt" if descending == forward else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_page(self, cursor: str | None = None) -> KeysetPage:
+        """
+        Returns the page after (or before) the cursor, the first page without one.
+        Raises ValueError if the cursor is malformed.
+        """
+        direction, key = "next", None
+        if cursor:
+            direction, values = decode_cursor(cursor)
+            key = self._parse_key(values)
+
+        forward = direction == "next"
+        queryset = self.queryset
+
+        if key is not None:
+            queryset = queryset.filter(self._seek(key, forward))
+
+        if forward:
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            queryset = queryset.order_by(*[f[1:] if f.startswith("-") else f"-{f}" for f in self.ordering])
+
+        # One extra row tells whether there is a page beyond
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if forward:
+            has_next, has_previous = more, key is not None
+        else:
+            rows.reverse()
+            has_next, has_previous = True, more
+
+        return KeysetPage(
+            rows,
+            self,
+            next_cursor=encode_cursor("next", self._key(rows[-1])) if has_next and rows else None,
+            previous_cursor=encode_cursor("previous", self._key(rows[0])) if has_previous and rows else None,
+        )
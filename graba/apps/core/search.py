@@ -0,0 +1,191 @@
+"""
+Full-text search over the auctions (title, description, technical details).
+
+The backend depends on the database:
+
+- SQLite: an FTS5 table (``auctions_auction_fts``, rowid = auction id), kept
+  up to date on auction save/delete, ranked with bm25.
+- PostgreSQL: a GIN index on the weighted tsvector of the auction columns,
+  maintained by the database itself, ranked with ts_rank.
+- Others: icontains lookups, unranked.
+
+The structures are created after ``migrate`` (post_migrate); existing
+auctions are indexed with ``python manage.py rebuild_search_index``.
+Every search term is matched as a prefix, all terms must match.
+"""
+from django.db import connection
+from django.db.models import Q, QuerySet
+
+from typing import Iterable, List
+import re
+
+
+INDEXED_FIELDS = {"title", "description", "technical_details"}
+
+# Title matches weigh more than description and technical details
+TITLE_WEIGHT = 10.0
+
+# Ids per statement, below the SQLite parameter limit
+BATCH_SIZE = 500
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def terms(query: str) -> List[str]:
+    return WORD_RE.findall(query.lower())
+
+
+class SQLiteBackend:
+
+    def __init__(self, model):
+        self.table = model._meta.db_table
+        self.fts = f"{self.table}_fts"
+
+    def install(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.fts} USING fts5("
+            "title, description, technical_details, "
+            "prefix='2 3', tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        match = " ".join(f'"{term}"*' for term in terms(query))
+        if not match:
+            return queryset
+
+        return queryset.extra(
+            tables=[self.fts],
+            where=[f"{self.fts}.rowid = {self.table}.id", f"{self.fts} MATCH %s"],
+            params=[match],
+            select={"search_rank": f"-bm25({self.fts}, {TITLE_WEIGHT}, 1.0, 1.0)"},
+        )
+
+    def index(self, cursor, auction_ids: List[int]):
+        placeholders = ", ".join(["%s"] * len(auction_ids))
+        cursor.execute(f"DELETE FROM {self.fts} WHERE rowid IN ({placeholders})", auction_ids)
+        cursor.execute(
+            f"INSERT INTO {self.fts} (rowid, title, description, technical_details) "
+            f"SELECT id, title, COALESCE(description, ''), COALESCE(technical_details, '') "
+            f"FROM {self.table} WHERE id IN ({placeholders})",
+            auction_ids,
+        )
+
+    def remove(self, cursor, auction_ids: List[int]):
+        placeholders = ", ".join(["%s"] * len(auction_ids))
+        cursor.execute(f"DELETE FROM {self.fts} WHERE rowid IN ({placeholders})", auction_ids)
+
+    def rebuild(self, cursor):
+        cursor.execute(f"DELETE FROM {self.fts}")
+        cursor.execute(
+            f"INSERT INTO {self.fts} (rowid, title, description, technical_details) "
+            f"SELECT id, title, COALESCE(description, ''), COALESCE(technical_details, '') FROM {self.table}"
+        )
+        cursor.execute(f"INSERT INTO {self.fts} ({self.fts}) VALUES ('optimize')")
+
+
+class PostgresBackend:
+
+    def __init__(self, model):
+        self.table = model._meta.db_table
+        t = self.table
+        # Must stay identical to the indexed expression for the index to be used
+        self.vector = (
+            f"(setweight(to_tsvector('simple', COALESCE({t}.title, '')), 'A') || "
+            f"setweight(to_tsvector('simple', COALESCE({t}.description, '') || ' ' || "
+            f"COALESCE({t}.technical_details, '')), 'B'))"
+        )
+
+    def install(self, cursor):
+        vector = self.vector.replace(f"{self.table}.", "")
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_search_idx ON {self.table} USING GIN ({vector})"
+        )
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        tsquery = " & ".join(f"{term}:*" for term in terms(query))
+        if not tsquery:
+            return queryset
+
+        return queryset.extra(
+            where=[f"{self.vector} @@ to_tsquery('simple', %s)"],
+            params=[tsquery],
+            select={"search_rank": f"ts_rank({self.vector}, to_tsquery('simple', %s))"},
+            select_params=[tsquery],
+        )
+
+    # The GIN index is maintained by PostgreSQL
+    def index(self, cursor, auction_ids: List[int]): pass
+    def remove(self, cursor, auction_ids: List[int]): pass
+    def rebuild(self, cursor): pass
+
+
+class FallbackBackend:
+
+    def __init__(self, model):
+        pass
+
+    def install(self, cursor): pass
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        for term in terms(query):
+            queryset = queryset.filter(
+                Q(title__icontains=term) |
+                Q(description__icontains=term) |
+                Q(technical_details__icontains=term)
+            )
+        return queryset
+
+    def index(self, cursor, auction_ids: List[int]): pass
+    def remove(self, cursor, auction_ids: List[int]): pass
+    def rebuild(self, cursor): pass
+
+
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "postgresql": PostgresBackend,
+}
+
+
+def get_backend():
+    from auctions.models import Auction
+    return BACKENDS.get(connection.vendor, FallbackBackend)(Auction)
+
+
+def search(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filters the auctions matching the query. When the backend ranks them,
+    they get a ``search_rank`` annotation (higher is better).
+    """
+    return get_backend().search(queryset, query)
+
+
+def is_ranked(queryset: QuerySet) -> bool:
+    return "search_rank" in queryset.query.extra_select
+
+
+def install():
+    with connection.cursor() as cursor:
+        get_backend().install(cursor)
+
+
+def index(auction_ids: Iterable[int]):
+    auction_ids = list(auction_ids)
+    with connection.cursor() as cursor:
+        backend = get_backend()
+        for i in range(0, len(auction_ids), BATCH_SIZE):
+            backend.index(cursor, auction_ids[i:i + BATCH_SIZE])
+
+
+def remove(auction_ids: Iterable[int]):
+    auction_ids = list(auction_ids)
+    with connection.cursor() as cursor:
+        backend = get_backend()
+        for i in range(0, len(auction_ids), BATCH_SIZE):
+            backend.remove(cursor, auction_ids[i:i + BATCH_SIZE])
+
+
+def rebuild():
+    with connection.cursor() as cursor:
+        backend = get_backend()
+        backend.install(cursor)
+        backend.rebuild(cursor)
@@ -0,0 +1,51 @@
+"""
+Pages shared between users.
+
+With ``SHARED_PAGES`` on, the views using SharedPageMixin render the same
+for everybody (as for an anonymous visitor) and are sent as publicly
+cacheable, so a reverse proxy can serve them to anyone. The state of the
+user (login, roles, favorites, reviewable auctions, CSRF token) is then
+loaded by the page itself from accounts:state (see base/js/user_state.js),
+which fills the elements the templates mark for it. With the setting off
+the pages render for the request user and are marked private.
+"""
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from accounts.roles import UserRoles
+
+
+def is_enabled() -> bool:
+    return settings.SHARED_PAGES
+
+
+class SharedPageMixin:
+    """
+    Renders the view as shared (see module docstring) unless is_shared()
+    says otherwise, and sets the caching headers of the response.
+    """
+
+    def is_shared(self) -> bool:
+        return is_enabled()
+
+    def dispatch(self, request, *args, **kwargs):
+        shared = self.is_shared()
+        if shared:
+            # The session is then never read: no Vary: Cookie, no Set-Cookie
+            request.user = AnonymousUser()
+            request.roles = UserRoles()
+
+        response = super().dispatch(request, *args, **kwargs)
+
+        if shared:
+            patch_cache_control(response, public=True, max_age=settings.SHARED_PAGES_MAX_AGE)
+        else:
+            patch_cache_control(response, private=True)
+            patch_vary_headers(response, ("Cookie",))
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["shared_page"] = self.is_shared()
+        return context
@@ -0,0 +1,135 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, post_migrate
+from django.dispatch import receiver
+
+from accounts.models import User, Role, Buyer, Seller, Private, Shopkeeper
+from accounts import profile, roles
+from auctions.models import Auction, Category, Offer
+from favorites.models import FavoriteAuction
+from reviews.models import Review, SellerRating
+
+from . import categories, page_cache, search
+
+
+# === SEARCH INDEX ===
+
+@receiver(post_migrate)
+def install_search_index(sender, **kwargs):
+    if sender.name == "auctions":
+        search.install()
+
+
+@receiver(post_save, sender=Auction)
+def index_auction(sender, instance, update_fields=None, **kwargs):
+    # Saves of other fields (status, ...) leave the indexed text unchanged
+    if update_fields is not None and not set(update_fields) & search.INDEXED_FIELDS:
+        return
+    search.index([instance.pk])
+
+
+@receiver(post_delete, sender=Auction)
+def unindex_auction(sender, instance, **kwargs):
+    search.remove([instance.pk])
+
+
+# === CATEGORY TREE ===
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree(sender, **kwargs):
+    transaction.on_commit(categories.invalidate)
+
+
+# === PAGE CACHE ===
+
+@receiver(post_save, sender=Auction)
+@receiver(post_delete, sender=Auction)
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def invalidate_cached_pages(sender, **kwargs):
+    transaction.on_commit(page_cache.invalidate)
+
+
+# === USER ROLES ===
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Private)
+@receiver(post_delete, sender=Private)
+@receiver(post_save, sender=Shopkeeper)
+@receiver(post_delete, sender=Shopkeeper)
+def invalidate_user_roles(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: (roles.invalidate(user_id), profile.invalidate(user_id)))
+
+
+@receiver(post_save, sender=Buyer)
+@receiver(post_delete, sender=Buyer)
+@receiver(post_save, sender=Seller)
+@receiver(post_delete, sender=Seller)
+def invalidate_role_rows(sender, instance, **kwargs):
+    # Role rows keep no user id: look it up once the transaction commits
+    role_id = instance.pk
+    transaction.on_commit(lambda: [
+        (roles.invalidate(user_id), profile.invalidate(user_id))
+        for user_id in Role.objects.filter(pk=role_id).values_list("user_id", flat=True)
+    ])
+
+
+# === PROFILE SUMMARIES ===
+
+def invalidate_seller_profile(seller_id):
+    # Seller rows are keyed by their role: look the user up once committed
+    transaction.on_commit(lambda: [
+        profile.invalidate(user_id)
+        for user_id in Role.objects.filter(pk=seller_id).values_list("user_id", flat=True)
+    ])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_profile(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which the summary does not show
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: profile.invalidate(user_id))
+
+
+@receiver(post_save, sender=Auction)
+def count_seller_auction(sender, instance, created, **kwargs):
+    if created:
+        invalidate_seller_profile(instance.seller_id)
+
+
+@receiver(post_delete, sender=Auction)
+def uncount_seller_auction(sender, instance, **kwargs):
+    invalidate_seller_profile(instance.seller_id)
+
+
+@receiver(post_save, sender=FavoriteAuction)
+@receiver(post_delete, sender=FavoriteAuction)
+def invalidate_favorites_count(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: profile.invalidate(user_id))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviewed_profile(sender, instance, **kwargs):
+    invalidate_seller_profile(instance.seller_id)
+
+
+# === SELLER RATINGS ===
+
+@receiver(post_save, sender=Review)
+def count_review(sender, instance, created, **kwargs):
+    if created:
+        SellerRating.record(instance.seller_id, instance.rating)
+    else:
+        # Edited from the admin: rare, recount the seller
+        SellerRating.rebuild([instance.seller_id])
+
+
+@receiver(post_delete, sender=Review)
+def uncount_review(sender, instance, **kwargs):
+    SellerRating.record(instance.seller_id, instance.rating, delta=-1)
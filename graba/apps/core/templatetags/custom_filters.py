@@ -1,4 +1,6 @@
 from django import template
+from django.middleware.csrf import get_token
+from django.utils.html import format_html
 
 register = template.Library()
 
@@ -6,3 +8,13 @@ register = template.Library()
 def cents_to_price(cents_: int) -> str:
     if cents_ is None: cents_ = 0.0
     return "{:,.2f}".format(cents_/100)
+
+@register.simple_tag(takes_context=True)
+def csrf_input(context) -> str:
+    """
+    The CSRF field of a form. On shared pages it is left empty and filled
+    from the user state: reading the token would set a per-user cookie.
+    """
+    if context.get('shared_page'):
+        return format_html('<input type="hidden" name="csrfmiddlewaretoken" value="" data-csrf>')
+    return format_html('<input type="hidden" name="csrfmiddlewaretoken" value="{}">', get_token(context['request']))
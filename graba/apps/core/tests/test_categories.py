@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+
+from accounts.models import User, Role, Seller
+from auctions.models import Auction, Category
+from core.categories import get_category_tree
+
+
+class CategoryTreeTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=seller_user,
+            type="SELLER"
+        )
+        self.seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        self.electronics = Category.objects.create(name="Electronics")
+        self.cameras = Category.objects.create(name="Cameras", level=2, parent=self.electronics)
+        self.phones = Category.objects.create(name="Phones", level=2, parent=self.electronics)
+
+        self.camera = self.create_auction("Camera", self.cameras)
+        self.phone = self.create_auction("Phone", self.phones)
+
+    def create_auction(self, title, category):
+        return Auction.objects.create(
+            seller=self.seller,
+            category=category,
+            title=title,
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100,
+        )
+
+    def test_tree(self):
+        tree = get_category_tree()
+
+        self.assertEqual([root.name for root in tree.roots], ["Electronics"])
+        self.assertEqual([c.name for c in tree.get("Electronics").children], ["Cameras", "Phones"])
+        self.assertEqual(sorted(tree.subtree("Electronics")), ["Cameras", "Electronics", "Phones"])
+        self.assertEqual(tree.subtree("Missing"), [])
+
+    def test_category_filter(self):
+        def search(c):
+            return set(self.client.get(reverse("core:home"), {"c": c}).context["auctions"])
+
+        self.assertEqual(search("Cameras"), {self.camera})
+        self.assertEqual(search("Electronics"), {self.camera, self.phone})
+        self.assertEqual(search("Missing"), set())
+
+    def test_categories_are_not_queried_again(self):
+        self.client.get(reverse("core:home"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("core:home"))
+
+        self.assertContains(response, "Cameras")
+        self.assertFalse(any('FROM "auctions_category"' in q["sql"] for q in queries))
+
+    def test_saves_and_deletes_invalidate_the_tree(self):
+        get_category_tree()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name="Drones", level=2, parent=self.electronics)
+        self.assertIn("Drones", get_category_tree())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.phones.delete()
+        self.assertNotIn("Phones", get_category_tree())
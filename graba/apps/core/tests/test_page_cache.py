@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+from unittest import mock
+
+from accounts.models import User, Role, Seller
+from auctions.models import Auction
+from core import page_cache
+from core.page_cache import CachedPageMixin
+
+
+@override_settings(HOME_PAGE_CACHE=True)
+class HomePageCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        role = Role.objects.create(user=user, type="SELLER")
+        self.seller = Seller.objects.create(role=role, collection_address="Test address")
+        self.create_auction("Vintage camera")
+
+        self.url = reverse("core:home")
+
+    def create_auction(self, title):
+        return Auction.objects.create(
+            seller=self.seller,
+            title=title,
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100,
+        )
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.client.get(self.url)["X-Page-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Page-Cache"], "HIT")
+        self.assertContains(response, "Vintage camera")
+
+        # Same search once normalized
+        self.client.get(self.url, {"q": "vintage  camera", "c": ""})
+        response = self.client.get(self.url, {"q": " vintage camera ", "c": "ALL", "utm_source": "x"})
+        self.assertEqual(response["X-Page-Cache"], "HIT")
+
+        self.assertEqual(page_cache.stats(), {"hit": 2, "stale": 0, "wait": 0, "miss": 2})
+
+    def test_auction_writes_invalidate(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_auction("Old radio")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Page-Cache"], "MISS")
+        self.assertContains(response, "Old radio")
+
+    def test_logged_users_bypass_the_cache(self):
+        self.client.force_login(self.seller.role.user)
+        self.assertNotIn("X-Page-Cache", self.client.get(self.url))
+
+    def test_single_flight(self):
+        key = page_cache.cache_key("home", {"q": "", "c": "ALL"})
+        self.client.get(self.url)
+
+        # Outdated while another request renders it: the old page is served
+        page_cache.invalidate()
+        cache.add(f"{key}:lock", 1)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Page-Cache"], "STALE")
+
+        # Not cached yet while another request renders it: wait, then render
+        cache.delete(key)
+        with mock.patch.object(page_cache, "WAIT_TIMEOUT", 0.1):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Page-Cache"], "MISS")
+        self.assertIsNone(cache.get(key))
+
+    def test_views_without_params_have_one_entry(self):
+        class View(CachedPageMixin):
+            page_cache_name = "static"
+
+        self.assertEqual(View().get_cache_params(), {})
@@ -0,0 +1,82 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+
+from accounts.models import User, Role, Seller
+from auctions.models import Auction
+
+
+@override_settings(AUCTION_LIST_PAGINATION="keyset")
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=seller_user,
+            type="SELLER"
+        )
+        seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        # Many ties on start_date and title, to exercise the tiebreakers
+        now = timezone.now()
+        Auction.objects.bulk_create([
+            Auction(
+                seller=seller,
+                title=f"Auction {i % 3}",
+                status="OPEN",
+                start_date=now - timedelta(hours=i % 4),
+                end_date=now + timedelta(days=1),
+                min_price_cents=100,
+            )
+            for i in range(40)
+        ])
+        self.expected = list(Auction.objects.order_by("-start_date", "title", "pk"))
+
+    def get(self, **params):
+        return self.client.get(reverse("core:home"), params)
+
+    def test_next_and_previous_walk_the_whole_listing(self):
+        seen, pages = [], []
+        response = self.get()
+        while True:
+            page = response.context["page_obj"]
+            pages.append(list(page))
+            seen.extend(page)
+            if not page.has_next():
+                break
+            response = self.get(cursor=page.next_cursor)
+
+        self.assertEqual(seen, self.expected)
+        self.assertEqual([len(p) for p in pages], [15, 15, 10])
+
+        # And back to the first page
+        for expected in reversed(pages[:-1]):
+            response = self.get(cursor=response.context["page_obj"].previous_cursor)
+            self.assertEqual(list(response.context["page_obj"]), expected)
+        self.assertFalse(response.context["page_obj"].has_previous())
+
+    def test_pages_are_not_counted(self):
+        first = self.get().context["page_obj"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(cursor=first.next_cursor)
+
+        self.assertContains(response, "cursor=")
+        for query in queries:
+            sql = query["sql"].upper()
+            self.assertFalse(sql.startswith("SELECT COUNT("), sql)
+            self.assertNotIn("OFFSET", sql)
+
+    def test_invalid_cursor_returns_404(self):
+        self.assertEqual(self.get(cursor="not-a-cursor").status_code, 404)
@@ -0,0 +1,69 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+
+from accounts.models import User, Role, Seller
+from auctions.models import Auction
+from core import search
+
+
+class AuctionSearchTest(TestCase):
+
+    def setUp(self):
+        seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=seller_user,
+            type="SELLER"
+        )
+        self.seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        self.in_description = self.create_auction("Old camera", "A vintage lens for photography")
+        self.in_title = self.create_auction("Vintage lens", "Manual focus")
+        self.other = self.create_auction("Bicycle", "Road bike")
+
+    def create_auction(self, title, description):
+        return Auction.objects.create(
+            seller=self.seller,
+            title=title,
+            description=description,
+            status="OPEN",
+            start_date=timezone.now() - timedelta(hours=1),
+            end_date=timezone.now() + timedelta(days=1),
+            min_price_cents=100,
+        )
+
+    def search(self, q):
+        response = self.client.get(reverse("core:home"), {"q": q})
+        return list(response.context["auctions"])
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.search("vintage lens"), [self.in_title, self.in_description])
+
+    def test_terms_match_as_prefix(self):
+        self.assertEqual(self.search("bicy"), [self.other])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.other.title = "Mountain bike"
+        self.other.save()
+        self.assertEqual(self.search("bicycle"), [])
+        self.assertEqual(self.search("mountain"), [self.other])
+
+        self.other.delete()
+        self.assertEqual(self.search("mountain"), [])
+
+    def test_rebuild_indexes_existing_auctions(self):
+        # Rows written without signals are picked up by the rebuild
+        Auction.objects.filter(pk=self.other.pk).update(title="Tandem")
+        self.assertEqual(self.search("tandem"), [])
+
+        search.rebuild()
+        self.assertEqual(self.search("tandem"), [self.other])
@@ -0,0 +1,101 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from datetime import timedelta
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction
+from favorites.models import FavoriteAuction
+
+
+class SharedPagesTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(user=self.seller_user, type="SELLER")
+        self.seller = Seller.objects.create(role=seller_role, collection_address="Test address")
+
+        self.buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(user=self.buyer_user, type="BUYER")
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+        self.auctions = [
+            Auction.objects.create(
+                seller=self.seller,
+                title=f"Auction {i}",
+                status="OPEN",
+                start_date=timezone.now() - timedelta(hours=1),
+                end_date=timezone.now() + timedelta(days=1),
+                min_price_cents=100,
+            )
+            for i in range(2)
+        ]
+        FavoriteAuction.objects.create(user=self.buyer_user, auction=self.auctions[0])
+
+        self.urls = [
+            reverse("core:home"),
+            reverse("auctions:auction-detail", args=[self.auctions[0].pk]),
+            reverse("accounts:profile", args=[self.seller_user.pk]),
+        ]
+
+    @override_settings(SHARED_PAGES=True, SHARED_PAGES_MAX_AGE=30)
+    def test_shared_pages_are_the_same_for_every_user(self):
+        self.client.force_login(self.buyer_user)
+
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+            self.assertIn("public", response["Cache-Control"])
+            self.assertIn("max-age=30", response["Cache-Control"])
+            self.assertNotIn("Cookie", response.get("Vary", ""))
+            self.assertFalse(response.cookies)
+
+            # Rendered as for an anonymous visitor
+            self.assertNotContains(response, "Welcome buyer!")
+            self.assertNotContains(response, "bi-bookmark-fill")
+            self.assertContains(response, "user_state.js")
+
+    def test_user_pages_are_private(self):
+        self.client.force_login(self.buyer_user)
+
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertIn("private", response["Cache-Control"])
+            self.assertIn("Cookie", response["Vary"])
+            self.assertNotContains(response, "user_state.js")
+
+        self.assertContains(self.client.get(self.urls[0]), "Welcome buyer!")
+
+    def test_user_state(self):
+        url = reverse("accounts:state")
+
+        response = self.client.get(url)
+        self.assertEqual(response.json(), {"authenticated": False})
+
+        self.client.force_login(self.buyer_user)
+        response = self.client.get(url, {
+            "auctions": ",".join(str(a.pk) for a in self.auctions),
+            "profile": self.seller_user.pk,
+        })
+        state = response.json()
+
+        self.assertIn("no-store", response["Cache-Control"])
+        self.assertEqual(state["user"]["id"], self.buyer_user.pk)
+        self.assertTrue(state["is_buyer"])
+        self.assertFalse(state["is_seller"])
+        self.assertEqual(state["favorites"], [self.auctions[0].pk])
+        self.assertEqual(state["reviewable_auctions"], [])
+        self.assertTrue(state["csrf_token"])
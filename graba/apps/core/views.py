@@ -1,53 +1,98 @@
+from django.conf import settings
+from django.http import Http404
 from django.views.generic import ListView
-from django.db.models import Q
 
+from typing import Dict
+from urllib.parse import urlencode
 
-from auctions.models import Auction, Category
-from favorites.models import FavoriteAuction
+from . import search
+from .categories import get_category_tree
+from .page_cache import CachedPageMixin
+from .pagination import EstimatedCountPaginator, KeysetPaginator
+from .shared_pages import SharedPageMixin
 
+from auctions.models import Auction
 
-class HomePageView(ListView):
+
+class HomePageView(SharedPageMixin, CachedPageMixin, ListView):
     model = Auction
     template_name = 'core/index.html'
     context_object_name = 'auctions'
     paginate_by = 15
+    page_cache_name = 'home'
+
+    def get_search_params(self) -> Dict[str, str]:
+        """
+        Search query and category, normalized: the page depends on nothing else.
+        """
+        return {
+            'q': ' '.join(self.request.GET.get('q', '').split()),
+            'c': self.request.GET.get('c', '').strip() or 'ALL',
+        }
+
+    def get_cache_params(self) -> Dict[str, str]:
+        params = self.get_search_params()
+        for name in ('page', 'cursor'):
+            value = self.request.GET.get(name, '').strip()
+            if value and value != '1':
+                params[name] = value
+        return params
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        q = self.request.GET.get('q', '')
-        c = self.request.GET.get('c', '')
+        queryset = super().get_queryset().with_card_data(self.request.user)
+        params = self.get_search_params()
+        q = params['q']
+        c = params['c']
 
         if q:
-            queryset = queryset.filter(title__icontains=q) | \
-            queryset.filter(description__icontains=q)
+            queryset = search.search(queryset, q)
 
+        # The category and its subcategories, resolved in memory
         if c and c != "ALL":
-            queryset = queryset.filter(category__name=c)
+            queryset = queryset.filter(category_id__in=get_category_tree().subtree(c))
+
+        # Best matches first
+        if search.is_ranked(queryset):
+            queryset = queryset.order_by('-search_rank', 'pk')
 
         return queryset
 
+    def uses_keyset(self, queryset) -> bool:
+        # Ranked search results are ordered by an expression: numbered pages
+        return settings.AUCTION_LIST_PAGINATION == 'keyset' and not search.is_ranked(queryset)
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        if settings.AUCTION_LIST_ESTIMATE_COUNT:
+            return EstimatedCountPaginator(queryset, per_page, **kwargs)
+        return super().get_paginator(queryset, per_page, **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_keyset(queryset):
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, estimate_count=settings.AUCTION_LIST_ESTIMATE_COUNT)
+        try:
+            page = paginator.get_page(self.request.GET.get('cursor'))
+        except ValueError:
+            raise Http404("Invalid cursor.")
+        return (paginator, page, page.object_list, page.has_other_pages())
+
     def get_context_data(self, **kwargs):
         context = super(HomePageView, self).get_context_data(**kwargs)
 
-        # Copy GET and remove 'page'
-        params = self.request.GET.copy()
-        params._mutable = True
-        params.pop('page', None)
+        # Only the search parameters: other ones would not change the page
+        params = self.get_search_params()
+        context['search_query'] = params['q']
+        context['search_category'] = params['c']
+
+        page_obj = context.get('page_obj')
+        context['page_arg_name'] = 'cursor' if getattr(page_obj, 'is_keyset', False) else 'page'
+        context['show_count'] = settings.AUCTION_LIST_ESTIMATE_COUNT
 
         # Querystring clear for pagination
-        context['querystring'] = params.urlencode()
-        
-        # Add favorites to context ONLY if user is authenticated
-        context['user_favorites'] = set(
-            FavoriteAuction.objects.filter(user=self.request.user)
-            .values_list('auction_id', flat=True)
-        ) if self.request.user.is_authenticated else set()
+        context['querystring'] = urlencode({k: v for k, v in params.items() if v and v != 'ALL'})
         
         # Add categories and subcategories to the context
-        context["categories"] = (
-            Category.objects
-            .filter(level=1)
-            .prefetch_related("subcategories")
-        )
+        context["categories"] = get_category_tree().roots
 
         return context
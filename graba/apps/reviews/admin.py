@@ -3,5 +3,6 @@ from .models import *
 
 
 admin.site.register([
-    Review
+    Review,
+    SellerRating,
 ])
\ No newline at end of file
@@ -0,0 +1,20 @@
+# Execute the command with:
+#     python manage.py rebuild_seller_ratings [--seller ID ...]
+
+from django.core.management.base import BaseCommand
+
+from reviews.models import SellerRating
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the rating counters of the sellers from the Review table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seller", type=int, nargs="+", dest="seller_ids",
+            help="Only rebuild the given seller IDs.",
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = SellerRating.rebuild(options["seller_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating counters of {rebuilt} sellers."))
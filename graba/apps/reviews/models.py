@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator, EmailValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from typing import Dict, Iterable
+
 
 class Review(models.Model):
     review_text = models.TextField(blank=True, null=True)
@@ -21,3 +23,84 @@ class Review(models.Model):
         verbose_name = "Review"
         verbose_name_plural = "Reviews"
         ordering = ["-review_date"]
+        indexes = [
+            # Reviews section of the seller profile (keyset pagination key)
+            models.Index(fields=['seller', '-review_date', 'id'], name='review_seller_listing_idx'),
+        ]
+
+
+class SellerRating(models.Model):
+    """
+    Rating counters of a seller, kept up to date as reviews are created and
+    deleted (see core.signals), so reading a rating needs no aggregate.
+    """
+    STARS = range(1, 6)
+
+    seller = models.OneToOneField('accounts.Seller', on_delete=models.CASCADE, primary_key=True,
+                                  related_name='rating_summary')
+    count = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    stars_1 = models.IntegerField(default=0)
+    stars_2 = models.IntegerField(default=0)
+    stars_3 = models.IntegerField(default=0)
+    stars_4 = models.IntegerField(default=0)
+    stars_5 = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Rating of seller {self.seller_id}: {self.avg} ({self.count})"
+
+    @property
+    def avg(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    @property
+    def histogram(self) -> Dict[int, int]:
+        """Number of reviews by rating, 5 stars first."""
+        return {stars: getattr(self, f"stars_{stars}") for stars in reversed(self.STARS)}
+
+    # === Counters ===
+
+    @classmethod
+    def record(cls, seller_id: int, rating: int, delta: int = 1):
+        """
+        Adds (or with delta=-1 removes) a review to the counters of the seller,
+        with a single atomic UPDATE.
+        """
+        if delta > 0:
+            cls.objects.get_or_create(seller_id=seller_id)
+        cls.objects.filter(pk=seller_id).update(**{
+            "count": models.F("count") + delta,
+            "total": models.F("total") + delta * rating,
+            f"stars_{rating}": models.F(f"stars_{rating}") + delta,
+        })
+
+    @classmethod
+    def rebuild(cls, seller_ids: Iterable[int] | None = None) -> int:
+        """
+        Recomputes the counters of the given sellers (all by default) from
+        the Review table. Returns the number of sellers with reviews.
+        """
+        reviews = Review.objects.order_by()
+        summaries = cls.objects.all()
+        if seller_ids is not None:
+            seller_ids = list(seller_ids)
+            reviews = reviews.filter(seller_id__in=seller_ids)
+            summaries = summaries.filter(seller_id__in=seller_ids)
+
+        rows = reviews.values('seller').annotate(
+            count=models.Count('id'),
+            total=models.Sum('rating'),
+            **{f"stars_{n}": models.Count('id', filter=models.Q(rating=n)) for n in cls.STARS},
+        )
+
+        with transaction.atomic():
+            summaries.delete()
+            created = cls.objects.bulk_create([
+                cls(seller_id=row.pop('seller'), **row) for row in rows
+            ])
+        return len(created)
+
+    class Meta:
+        verbose_name = "Seller Rating"
+        verbose_name_plural = "Seller Ratings"
+        db_table_comment = "Rating counters of a seller"
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -10,6 +11,9 @@ from reviews.models import Review
 class LeaveReviewTest(TestCase):
 
     def setUp(self):
+        # Profile summaries are cached across tests
+        cache.clear()
+
         # Seller
         self.seller_user = User.objects.create_user(
             email="seller@email.com",
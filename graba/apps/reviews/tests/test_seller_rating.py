@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction, Offer, WinnerOffer
+from reviews.models import Review, SellerRating
+
+
+class SellerRatingTest(TestCase):
+
+    def setUp(self):
+        # Profile summaries are cached across tests
+        cache.clear()
+
+        self.seller_user = User.objects.create_user(
+            email="seller@email.com",
+            username="seller",
+            password="testpass"
+        )
+        seller_role = Role.objects.create(
+            user=self.seller_user,
+            type="SELLER"
+        )
+        self.seller = Seller.objects.create(
+            role=seller_role,
+            collection_address="Test address"
+        )
+
+        buyer_user = User.objects.create_user(
+            email="buyer@email.com",
+            username="buyer",
+            password="testpass"
+        )
+        buyer_role = Role.objects.create(
+            user=buyer_user,
+            type="BUYER"
+        )
+        self.buyer = Buyer.objects.create(role=buyer_role)
+
+    def review(self, rating):
+        auction = Auction.objects.create(
+            seller=self.seller,
+            title="Test Auction",
+            status="CLOSED",
+            min_price_cents=100,
+        )
+        offer = Offer.objects.create(auction=auction, buyer=self.buyer, type="BUY_NOW", amount_cents=100)
+        winner_offer = WinnerOffer.objects.create(auction=auction, offer=offer)
+        return Review.objects.create(winner_offer=winner_offer, seller=self.seller, rating=rating)
+
+    def stats(self):
+        return Seller.objects.get(pk=self.seller.pk).rating_stats
+
+    def test_counters_follow_creates_and_deletes(self):
+        self.assertEqual(self.stats()["count"], 0)
+
+        reviews = [self.review(rating) for rating in (5, 4, 4, 1)]
+        stats = self.stats()
+        self.assertEqual(stats["count"], 4)
+        self.assertEqual(stats["avg"], 3.5)
+        self.assertEqual(stats["histogram"], {5: 1, 4: 2, 3: 0, 2: 0, 1: 1})
+
+        reviews[-1].delete()
+        stats = self.stats()
+        self.assertEqual(stats["count"], 3)
+        self.assertAlmostEqual(stats["avg"], 13 / 3)
+        self.assertEqual(stats["histogram"][1], 0)
+
+    def test_rebuild_matches_the_counters(self):
+        for rating in (5, 3, 3):
+            self.review(rating)
+        expected = self.stats()
+
+        SellerRating.objects.all().delete()
+        self.assertEqual(SellerRating.rebuild(), 1)
+        self.assertEqual(self.stats(), expected)
+
+    def test_profile_page_runs_no_rating_aggregate(self):
+        self.review(5)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("accounts:profile", args=[self.seller_user.pk]))
+
+        self.assertContains(response, "5.0 / 5")
+        self.assertFalse(any("AVG(" in q["sql"].upper() for q in queries))
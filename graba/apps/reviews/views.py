@@ -2,10 +2,9 @@ from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
 from django.shortcuts import get_object_or_404
 from django.http import JsonResponse
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.urls import reverse
 
-from accounts.models import Buyer
 from auctions.models import WinnerOffer
 from .models import Review
 
@@ -16,9 +15,8 @@ def leave_review(request):
     user = request.user
 
     # Check BUYER role
-    try:
-        buyer = Buyer.objects.get(role__user=user)
-    except Buyer.DoesNotExist:
+    buyer = request.roles.buyer
+    if buyer is None:
         return JsonResponse({"error": "Only buyers can leave reviews."}, status=403)
 
     # Check AJAX fields
@@ -56,12 +54,14 @@ def leave_review(request):
     
     # Create review
     try:
-        review = Review.objects.create(
-            winner_offer=winner_offer,
-            seller=seller_instance,
-            rating=rating,
-            review_text=review_text or None
-        )
+        # Together with the seller rating counters
+        with transaction.atomic():
+            review = Review.objects.create(
+                winner_offer=winner_offer,
+                seller=seller_instance,
+                rating=rating,
+                review_text=review_text or None
+            )
     except IntegrityError:
         return JsonResponse({"error": "Review already left for this auction."}, status=403)
 
@@ -86,6 +86,7 @@ def leave_review(request):
             },
             "total_rating": {
                 "reviews_count": rating_stats.get('count'),
-                "average_rating": float(rating_stats.get('avg') or 0)
+                "average_rating": float(rating_stats.get('avg') or 0),
+                "histogram": rating_stats.get('histogram'),
             } if rating_stats else None
     }, status=200)
@@ -1,21 +1,21 @@
+/* Ajax call to toggle favorites (delegated: cards can be loaded later) */
+document.addEventListener('click', event => {
+    const btn = event.target.closest('.favorite-toggle');
+    if (!btn) return;
 
-/* Ajax call to toggle favorites */
-document.querySelectorAll('.favorite-toggle').forEach(btn => {
-    btn.addEventListener('click', () => {
-        const auctionId = btn.dataset.auction;
+    const auctionId = btn.dataset.auction;
 
-        fetch(`/favorites/${auctionId}/toggle/`)
-            .then(response => response.json())
-            .then(data => {
-                const icon = btn.querySelector('i');
+    fetch(`/favorites/${auctionId}/toggle/`)
+        .then(response => response.json())
+        .then(data => {
+            const icon = btn.querySelector('i');
 
-                if (data.favorite) {
-                    icon.classList.remove('bi-bookmark');
-                    icon.classList.add('bi-bookmark-fill');
-                } else {
-                    icon.classList.remove('bi-bookmark-fill');
-                    icon.classList.add('bi-bookmark');
-                }
-            });
-    });
-});
\ No newline at end of file
+            if (data.favorite) {
+                icon.classList.remove('bi-bookmark');
+                icon.classList.add('bi-bookmark-fill');
+            } else {
+                icon.classList.remove('bi-bookmark-fill');
+                icon.classList.add('bi-bookmark');
+            }
+        });
+});
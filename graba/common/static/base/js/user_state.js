@@ -0,0 +1,78 @@
+/* ============================================================
+   USER STATE OF SHARED PAGES
+   Shared pages render the same for everybody (see core.shared_pages):
+   the user's own state comes from the state endpoint and fills the
+   elements marked with:
+     data-user-state="authenticated|anonymous"  shown to (not) logged users
+     data-user-owner="<user id>"                shown to that user only
+     data-requires-role="buyer"                 shown to buyers, except the
+       (data-seller="<seller id>")              seller of the auction
+     data-user-field="username"                 text from the user
+     data-user-href="profile"                   link to the user profile
+     input[data-csrf]                           CSRF token
+     .favorite-toggle[data-auction]             shown and filled for users
+     data-state-profile="<user id>"             asks the reviewable auctions
+   Page scripts get the state from the "user-state" event.
+============================================================ */
+(() => {
+    const stateUrl = document.currentScript.dataset.url;
+
+    function apply(state, root) {
+        const all = selector => root.querySelectorAll(selector);
+        const user = state.user || {};
+
+        all('[data-user-state]').forEach(el => {
+            el.hidden = (el.dataset.userState === 'authenticated') !== state.authenticated;
+        });
+        all('[data-user-owner]').forEach(el => {
+            el.hidden = Number(el.dataset.userOwner) !== user.id;
+        });
+        all('[data-requires-role="buyer"]').forEach(el => {
+            el.hidden = !state.is_buyer || Number(el.dataset.seller) === state.seller_id;
+        });
+        all('[data-user-field]').forEach(el => {
+            el.textContent = user[el.dataset.userField] ?? '';
+        });
+        all('[data-user-href="profile"]').forEach(el => {
+            if (user.profile_url) el.href = user.profile_url;
+        });
+        all('input[data-csrf]').forEach(el => {
+            el.value = state.csrf_token || '';
+        });
+
+        const favorites = new Set(state.favorites || []);
+        all('.favorite-toggle[data-auction]').forEach(el => {
+            el.hidden = !state.authenticated;
+            const icon = el.querySelector('i');
+            const saved = favorites.has(Number(el.dataset.auction));
+            icon.classList.toggle('bi-bookmark-fill', saved);
+            icon.classList.toggle('bi-bookmark', !saved);
+        });
+    }
+
+    /* Loads the state for the elements under root and applies it */
+    function refresh(root = document) {
+        const params = new URLSearchParams();
+
+        const auctions = [...root.querySelectorAll('.favorite-toggle[data-auction]')].map(el => el.dataset.auction);
+        if (auctions.length) params.set('auctions', auctions.join(','));
+
+        const profile = root.querySelector('[data-state-profile]');
+        if (profile) params.set('profile', profile.dataset.stateProfile);
+
+        return fetch(`${stateUrl}?${params}`, { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(state => {
+                apply(state, root);
+                return state;
+            });
+    }
+
+    window.userState = { refresh };
+
+    document.addEventListener('DOMContentLoaded', () => {
+        refresh().then(state => {
+            document.dispatchEvent(new CustomEvent('user-state', { detail: state }));
+        });
+    });
+})();
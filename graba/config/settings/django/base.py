@@ -101,6 +101,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.roles.RolesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -227,6 +228,26 @@ else:
     }
 
 
+# ======================================================== #
+# ========================= Cache ======================== #
+# ======================================================== #
+
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+if env('CACHE_URL', default=None) is not None:
+
+    # Enable cache config through environment (e.g. redis://localhost:6379/1)
+    CACHES = {'default': env.cache()}
+
+else:
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # ======================================================== #
 # ================= Internationalization ================= #
 # ======================================================== #
@@ -295,6 +316,20 @@ AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
 
+# Keep the role and profile ids of the user in the session: requests then
+# check a version key in the cache instead of querying the roles
+ACCOUNTS_ROLES_SESSION_CACHE = env.bool('ACCOUNTS_ROLES_SESSION_CACHE', default=False)
+
+# Seconds a profile summary stays cached. Changes invalidate it anyway: this
+# only bounds how long bulk updates that skip the signals can go unnoticed
+ACCOUNTS_PROFILE_CACHE_TIMEOUT = env.int('ACCOUNTS_PROFILE_CACHE_TIMEOUT', default=60 * 60)
+
+# Render the home, auction and profile pages the same for every user and send
+# them as publicly cacheable (for max-age seconds): the user's own state is
+# loaded by the page from a small JSON endpoint (see core.shared_pages)
+SHARED_PAGES = env.bool('SHARED_PAGES', default=False)
+SHARED_PAGES_MAX_AGE = env.int('SHARED_PAGES_MAX_AGE', default=60)
+
 
 # ======================================================== #
 # =================== Jazzmin Settings =================== #
@@ -317,3 +352,77 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 
+
+# ======================================================== #
+# =================== Auctions Settings ================== #
+# ======================================================== #
+
+# Redis URL of the in-memory order book ("memory://", a process-local one, is
+# only meant for the tests: the Celery workers would not see its bids).
+# When empty, bids are checked and persisted directly on the database.
+AUCTION_ORDER_BOOK_URL = env('AUCTION_ORDER_BOOK_URL', default=None)
+
+# Seconds to wait before persisting a batch of order book bids
+AUCTION_ORDER_BOOK_FLUSH_DELAY = env.int('AUCTION_ORDER_BOOK_FLUSH_DELAY', default=1)
+
+
+# Window in milliseconds in which accepted bids are merged into a single
+# WebSocket "state_update" message per auction (0 sends every bid at once)
+AUCTION_BROADCAST_WINDOW_MS = env.int('AUCTION_BROADCAST_WINDOW_MS', default=100)
+
+# Subscribe each Daphne process once per auction group and dispatch the
+# events to its sockets in memory, instead of one subscription per socket
+AUCTION_WS_FANOUT = env.bool('AUCTION_WS_FANOUT', default=False)
+
+# Seconds between two watcher count heartbeats (and count updates pushed)
+AUCTION_WATCHERS_INTERVAL = env.int('AUCTION_WATCHERS_INTERVAL', default=5)
+
+# WebSocket events kept per auction for clients resuming after a reconnect
+# (clients that missed more get a state snapshot). They are kept in the default
+# cache, which must then be shared by every process (set CACHE_URL)
+AUCTION_EVENT_BUFFER_SIZE = env.int('AUCTION_EVENT_BUFFER_SIZE', default=100)
+
+# Serve the bid and Buy Now endpoints with the native async views
+AUCTION_ASYNC_VIEWS = env.bool('AUCTION_ASYNC_VIEWS', default=False)
+
+# Seconds the static fragments of the auction page stay cached.
+# Fragments are versioned, so edits, bids and status changes show at once.
+AUCTION_FRAGMENT_CACHE_TIMEOUT = env.int('AUCTION_FRAGMENT_CACHE_TIMEOUT', default=60 * 60)
+
+# Home page pagination:
+#   "offset": numbered pages (COUNT plus an OFFSET growing with the page)
+#   "keyset": previous/next links with opaque cursors, same cost at any depth
+# Search results ranked by relevance always use numbered pages.
+AUCTION_LIST_PAGINATION = env('AUCTION_LIST_PAGINATION', default='offset')
+
+# Estimate the number of home page results instead of counting them all
+# (PostgreSQL planner estimate, elsewhere counted up to 1000)
+AUCTION_LIST_ESTIMATE_COUNT = env.bool('AUCTION_LIST_ESTIMATE_COUNT', default=False)
+
+# Cache the whole home page per search, page and content version (anonymous
+# and shared pages only): fresh for TIMEOUT seconds, then served as stale
+# for STALE_TIMEOUT more while one request renders it again (see core.page_cache).
+# One request across processes with a shared cache (CACHE_URL), else per process
+HOME_PAGE_CACHE = env.bool('HOME_PAGE_CACHE', default=False)
+HOME_PAGE_CACHE_TIMEOUT = env.int('HOME_PAGE_CACHE_TIMEOUT', default=10)
+HOME_PAGE_CACHE_STALE_TIMEOUT = env.int('HOME_PAGE_CACHE_STALE_TIMEOUT', default=60)
+
+
+# How auctions are opened and closed on time:
+#   "clocked": django-celery-beat ClockedSchedule/PeriodicTask rows, one per
+#              auction open and one per minute in which auctions end
+#   "sweeper": a single periodic task opening and closing the due auctions
+# Run "python manage.py purge_auction_schedules" after switching to "sweeper".
+AUCTION_SCHEDULER = env('AUCTION_SCHEDULER', default='clocked')
+
+# Seconds between two sweeps, and auctions closed per transaction (both modes)
+AUCTION_SWEEP_INTERVAL = env.int('AUCTION_SWEEP_INTERVAL', default=5)
+AUCTION_SWEEP_BATCH_SIZE = env.int('AUCTION_SWEEP_BATCH_SIZE', default=500)
+
+if AUCTION_SCHEDULER == 'sweeper':
+    CELERY_BEAT_SCHEDULE = {
+        'sweep-auctions': {
+            'task': 'auctions.tasks.sweep_auctions_task',
+            'schedule': AUCTION_SWEEP_INTERVAL,
+        },
+    }
@@ -0,0 +1,126 @@
+# Execute the script with:
+#     python manage.py runscript bench_async_bidding --script-args <requests> <concurrency>
+#
+# Compares the sync and the async bid endpoints when served by the ASGI
+# handler used by Daphne, with the in-memory channel layer. Every bid is
+# accepted, so both paths do the same amount of work. Prints requests/s
+# and latency percentiles. All the rows created are removed at the end.
+
+from django.test import AsyncClient
+from django.test.utils import override_settings
+from django.db import transaction
+from django.urls import path
+from django.utils import timezone
+
+from asgiref.sync import async_to_sync
+from datetime import timedelta
+from itertools import count
+from typing import List
+import logging
+import asyncio
+import time
+
+
+logger = logging.getLogger('custom')
+
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction
+from auctions.views import AuctionBidView, AsyncAuctionBidView
+
+
+# Both variants mounted side by side (used as ROOT_URLCONF)
+urlpatterns = [
+    path("sync/<int:key>/", AuctionBidView.as_view()),
+    path("async/<int:key>/", AsyncAuctionBidView.as_view()),
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values: return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+@transaction.atomic
+def setup(buyers: int):
+    seller_user = User.objects.create_user(email="bench.seller@graba.test", username="bench_seller")
+    seller_role = Role.objects.create(user=seller_user, type="SELLER")
+    seller = Seller.objects.create(role=seller_role, collection_address="-")
+
+    users = []
+    for i in range(buyers):
+        user = User.objects.create_user(email=f"bench.buyer{i}@graba.test", username=f"bench_buyer{i}")
+        role = Role.objects.create(user=user, type="BUYER")
+        Buyer.objects.create(role=role)
+        users.append(user)
+
+    auctions = [
+        Auction.objects.create(
+            seller=seller,
+            title=f"Benchmark Auction ({variant})",
+            status="OPEN",
+            start_date=timezone.now() - timedelta(minutes=1),
+            end_date=timezone.now() + timedelta(hours=1),
+            min_price_cents=100,
+        )
+        for variant in ("sync", "async")
+    ]
+    return auctions, users
+
+
+@transaction.atomic
+def teardown():
+    User.objects.filter(email__endswith="@graba.test", username__startswith="bench_").delete()
+
+
+async def bench(prefix: str, auction: Auction, users: List[User], requests: int, concurrency: int):
+    clients = []
+    for user in users:
+        client = AsyncClient()
+        await client.aforce_login(user)
+        clients.append(client)
+
+    amounts = count(auction.min_price_cents + 1)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            response = await clients[i % len(clients)].post(
+                f"/{prefix}/{auction.pk}/", {"amount": f"{next(amounts) / 100:.2f}"}
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"{prefix:>5}: {requests / elapsed:.0f} req/s, "
+        f"p50={percentile(latencies, 50) * 1000:.1f}ms p99={percentile(latencies, 99) * 1000:.1f}ms, "
+        f"{failures} failed"
+    )
+
+
+def run(*args):
+    # runscript entry point
+    requests = int(args[0]) if len(args) > 0 else 1000
+    concurrency = int(args[1]) if len(args) > 1 else 50
+
+    (sync_auction, async_auction), users = setup(buyers=10)
+    try:
+        with override_settings(
+            ROOT_URLCONF=__name__,
+            ALLOWED_HOSTS=["testserver"],
+            CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+        ):
+            async_to_sync(bench)("sync", sync_auction, users, requests, concurrency)
+            async_to_sync(bench)("async", async_auction, users, requests, concurrency)
+    finally:
+        teardown()
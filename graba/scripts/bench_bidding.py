@@ -0,0 +1,118 @@
+# Execute the script with:
+#     python manage.py runscript bench_bidding --script-args <threads> <bids_per_thread>
+#
+# Fires parallel bids at a single auction through the bid-placement
+# service, then prints the latency percentiles and checks that the
+# accepted bids are strictly increasing in insertion order.
+# All the rows created by the benchmark are removed at the end.
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import List
+import logging
+import random
+import time
+
+
+logger = logging.getLogger('custom')
+
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.bidding import BidError, place_bid
+from auctions.models import Auction, Offer
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values: return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+@transaction.atomic
+def setup(threads: int):
+    seller_user = User.objects.create_user(email="bench.seller@graba.test", username="bench_seller")
+    seller_role = Role.objects.create(user=seller_user, type="SELLER")
+    seller = Seller.objects.create(role=seller_role, collection_address="-")
+
+    buyers = []
+    for i in range(threads):
+        user = User.objects.create_user(email=f"bench.buyer{i}@graba.test", username=f"bench_buyer{i}")
+        role = Role.objects.create(user=user, type="BUYER")
+        buyers.append(Buyer.objects.create(role=role))
+
+    auction = Auction.objects.create(
+        seller=seller,
+        title="Benchmark Auction",
+        status="OPEN",
+        start_date=timezone.now() - timedelta(minutes=1),
+        end_date=timezone.now() + timedelta(hours=1),
+        min_price_cents=100,
+    )
+    return auction, buyers
+
+
+@transaction.atomic
+def teardown():
+    User.objects.filter(email__endswith="@graba.test", username__startswith="bench_").delete()
+
+
+def bidder(auction_id: int, buyer: Buyer, bids: int):
+    rng = random.Random(buyer.pk)
+    latencies, accepted = [], 0
+    try:
+        for _ in range(bids):
+            auction = Auction.objects.get(pk=auction_id)
+            amount = (auction.highest_bid_cents or 100) + rng.randint(-50, 100)
+
+            start = time.perf_counter()
+            try:
+                place_bid(auction, buyer, amount)
+                accepted += 1
+            except BidError:
+                pass
+            latencies.append(time.perf_counter() - start)
+    finally:
+        connection.close()
+    return latencies, accepted
+
+
+def run(*args):
+    # runscript entry point
+    threads = int(args[0]) if len(args) > 0 else 16
+    bids = int(args[1]) if len(args) > 1 else 100
+
+    auction, buyers = setup(threads)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(lambda b: bidder(auction.pk, b, bids), buyers))
+        elapsed = time.perf_counter() - start
+
+        latencies = [lat for lats, _ in results for lat in lats]
+        accepted = sum(acc for _, acc in results)
+
+        amounts = list(
+            Offer.objects
+            .filter(auction=auction, type="BID")
+            .order_by("pk")
+            .values_list("amount_cents", flat=True)
+        )
+        auction.refresh_from_db()
+
+        consistent = (
+            len(amounts) == accepted == auction.bids_count
+            and all(a < b for a, b in zip(amounts, amounts[1:]))
+            and (not amounts or auction.highest_bid_cents == amounts[-1])
+        )
+
+        logger.info(f"{len(latencies)} bids in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} bids/s), {accepted} accepted")
+        logger.info(f"latency p50={percentile(latencies, 50) * 1000:.1f}ms p99={percentile(latencies, 99) * 1000:.1f}ms")
+        logger.info(f"ordering consistent: {consistent}")
+
+        assert consistent, "Accepted bids are not strictly increasing."
+    finally:
+        teardown()
@@ -0,0 +1,131 @@
+# Execute the script with:
+#     python manage.py runscript bench_close --script-args <auctions> <bids_per_auction> <batch_size>
+#
+# Closes the same number of expired auctions twice: once one by one with
+# Auction.close() (what close_auction_task does) and once in batches with
+# Auction.close_many() (what the sweeper does), broadcasting the status
+# updates on the in-memory channel layer. Checks that both assign the same
+# winners. All the rows created are removed at the end.
+
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from datetime import timedelta
+from typing import List
+import logging
+import random
+import time
+
+
+logger = logging.getLogger('custom')
+
+
+from accounts.models import User, Role, Buyer, Seller
+from auctions.models import Auction, Offer, WinnerOffer
+from auctions.tasks import broadcast_auction_status, broadcast_auction_statuses
+
+
+@transaction.atomic
+def setup(auctions: int, bids: int, variant: str) -> List[int]:
+    seller_user = User.objects.create_user(email=f"bench.seller.{variant}@graba.test", username=f"bench_seller_{variant}")
+    seller_role = Role.objects.create(user=seller_user, type="SELLER")
+    seller = Seller.objects.create(role=seller_role, collection_address="-")
+
+    buyers = []
+    for i in range(5):
+        user = User.objects.create_user(email=f"bench.buyer{i}.{variant}@graba.test", username=f"bench_buyer{i}_{variant}")
+        role = Role.objects.create(user=user, type="BUYER")
+        buyers.append(Buyer.objects.create(role=role))
+
+    now = timezone.now()
+    created = Auction.objects.bulk_create([
+        Auction(
+            seller=seller,
+            title=f"Benchmark Auction {i}",
+            status="OPEN",
+            start_date=now - timedelta(days=7),
+            end_date=now - timedelta(minutes=1),
+            min_price_cents=100,
+        )
+        for i in range(auctions)
+    ], batch_size=1000)
+
+    # Same seed for both variants, so both must pick the same winners
+    rng = random.Random(42)
+    Offer.objects.bulk_create([
+        Offer(
+            auction=auction,
+            buyer=rng.choice(buyers),
+            type="BID",
+            amount_cents=rng.randint(101, 10000),
+            offer_time=now - timedelta(minutes=rng.randint(2, 1000)),
+        )
+        for auction in created
+        for _ in range(rng.randint(0, bids))
+    ], batch_size=1000)
+
+    return [auction.pk for auction in created]
+
+
+@transaction.atomic
+def teardown():
+    User.objects.filter(email__endswith="@graba.test", username__startswith="bench_").delete()
+
+
+def winners(auction_ids: List[int]) -> List[int]:
+    return list(
+        WinnerOffer.objects
+        .filter(auction_id__in=auction_ids)
+        .order_by("auction_id")
+        .values_list("offer__amount_cents", flat=True)
+    )
+
+
+def close_one_by_one(auction_ids: List[int]):
+    for pk in auction_ids:
+        auction = Auction.objects.get(pk=pk)
+        auction.close()
+        broadcast_auction_status(auction)
+
+
+def close_in_batches(auction_ids: List[int], batch_size: int):
+    for i in range(0, len(auction_ids), batch_size):
+        closed = Auction.close_many(auction_ids[i:i + batch_size])
+        broadcast_auction_statuses(closed, "CLOSED")
+
+
+def run(*args):
+    # runscript entry point
+    auctions = int(args[0]) if len(args) > 0 else 10000
+    bids = int(args[1]) if len(args) > 1 else 5
+    batch_size = int(args[2]) if len(args) > 2 else 500
+
+    try:
+        single_ids = setup(auctions, bids, "single")
+        bulk_ids = setup(auctions, bids, "bulk")
+
+        with override_settings(
+            CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+            AUCTION_ORDER_BOOK_URL=None,
+        ):
+            start = time.perf_counter()
+            close_one_by_one(single_ids)
+            single = time.perf_counter() - start
+
+            start = time.perf_counter()
+            close_in_batches(bulk_ids, batch_size)
+            bulk = time.perf_counter() - start
+
+        logger.info(f"one by one: {auctions} auctions in {single:.2f}s ({auctions / single:.0f} auctions/s)")
+        logger.info(f"   batched: {auctions} auctions in {bulk:.2f}s ({auctions / bulk:.0f} auctions/s), batch size {batch_size}")
+
+        consistent = (
+            winners(single_ids) == winners(bulk_ids)
+            and not Auction.objects.filter(pk__in=single_ids + bulk_ids).exclude(status="CLOSED").exists()
+        )
+        logger.info(f"same winners: {consistent}")
+
+        assert consistent, "Bulk closing assigned different winners."
+    finally:
+        teardown()
@@ -0,0 +1,151 @@
+# Execute the script with:
+#     python manage.py runscript bench_fanout --script-args <connections> <events> [memory|layer] [socket|hub]
+#
+# Simulates WebSocket watchers of one auction with AuctionConsumer instances
+# whose socket only counts the frames, then publishes events to the group
+# and waits until every socket got all of them. Compares one group
+# subscription per socket with the process-local fan-out hub, and reports
+# how many channel layer deliveries each event costs. Uses CHANNEL_LAYERS
+# unless "memory" is given; runs both modes unless one is given.
+
+from django.test.utils import override_settings
+
+from asgiref.sync import async_to_sync
+import logging
+import asyncio
+import time
+
+
+logger = logging.getLogger('custom')
+
+
+from channels.layers import get_channel_layer
+
+from auctions.broadcast import group_name
+from auctions.consumers import AuctionConsumer
+from auctions.encoding import prepare
+from auctions.fanout import FanoutHub
+
+
+AUCTION_ID = 999_999
+
+# Seconds to wait for the delivery of all the events
+TIMEOUT = 300
+
+
+class CountingSocket:
+
+    def __init__(self, expected: int, done: asyncio.Event, remaining: list):
+        self.frames = 0
+        self.expected = expected
+        self.done = done
+        self.remaining = remaining
+
+    async def send(self, message):
+        self.frames += 1
+        if self.frames == self.expected:
+            self.remaining[0] -= 1
+            if not self.remaining[0]:
+                self.done.set()
+
+
+def make_consumers(connections: int, events: int):
+    done, remaining = asyncio.Event(), [connections]
+    consumers = []
+    for _ in range(connections):
+        consumer = AuctionConsumer()
+        consumer.auction_id = str(AUCTION_ID)
+        consumer.group_name = group_name(AUCTION_ID)
+        consumer.subprotocol = None
+        consumer.base_send = CountingSocket(events, done, remaining).send
+        consumers.append(consumer)
+    return consumers, done
+
+
+async def subscribe_per_socket(layer, consumers):
+    readers = []
+
+    async def read(consumer, channel):
+        while True:
+            await consumer.dispatch(await layer.receive(channel))
+
+    for consumer in consumers:
+        channel = await layer.new_channel()
+        await layer.group_add(group_name(AUCTION_ID), channel)
+        readers.append((channel, asyncio.create_task(read(consumer, channel))))
+
+    async def cleanup():
+        for channel, reader in readers:
+            reader.cancel()
+            await layer.group_discard(group_name(AUCTION_ID), channel)
+
+    return cleanup
+
+
+async def subscribe_hub(layer, consumers):
+    hub = FanoutHub(layer)
+    for consumer in consumers:
+        await hub.subscribe(AUCTION_ID, consumer)
+
+    async def cleanup():
+        for consumer in consumers:
+            await hub.unsubscribe(AUCTION_ID, consumer)
+
+    return cleanup
+
+
+async def bench(name: str, subscribe, connections: int, events: int):
+    layer = get_channel_layer()
+    consumers, done = make_consumers(connections, events)
+
+    start = time.perf_counter()
+    cleanup = await subscribe(layer, consumers)
+    subscribed = time.perf_counter() - start
+
+    members = await layer_group_size(layer)
+
+    start = time.perf_counter()
+    for i in range(events):
+        await layer.group_send(group_name(AUCTION_ID), prepare({
+            "type": "auction_status_update", "auction_id": AUCTION_ID, "status": "OPEN", "seq": i + 1,
+        }))
+    try:
+        await asyncio.wait_for(done.wait(), timeout=TIMEOUT)
+    except asyncio.TimeoutError:
+        await cleanup()
+        logger.info(f"{name:>10}: {events} events to {connections} sockets not delivered within {TIMEOUT}s")
+        return
+    elapsed = time.perf_counter() - start
+
+    await cleanup()
+
+    logger.info(
+        f"{name:>10}: subscribe {subscribed:.2f}s, {events} events to {connections} sockets in {elapsed:.2f}s "
+        f"({connections * events / elapsed:.0f} frames/s), {members} layer deliveries per event"
+    )
+
+
+async def layer_group_size(layer) -> int | str:
+    # Only the in-memory layer exposes its groups
+    groups = getattr(layer, "groups", None)
+    if groups is None:
+        return "?"
+    return len(groups.get(group_name(AUCTION_ID), {}))
+
+
+def run(*args):
+    # runscript entry point
+    connections = int(args[0]) if len(args) > 0 else 10000
+    events = int(args[1]) if len(args) > 1 else 5
+
+    layers = None
+    if len(args) > 2 and args[2] == "memory":
+        layers = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer", "CONFIG": {"capacity": events + 10}}}
+
+    modes = [args[3]] if len(args) > 3 else ["socket", "hub"]
+
+    with override_settings(**({"CHANNEL_LAYERS": layers} if layers else {})):
+        if "socket" in modes:
+            async_to_sync(bench)("per socket", subscribe_per_socket, connections, events)
+        if "hub" in modes:
+            async_to_sync(bench)("hub", subscribe_hub, connections, events)
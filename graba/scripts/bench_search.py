@@ -0,0 +1,136 @@
+# Execute the script with:
+#     python manage.py runscript bench_search --script-args <auctions> <repeat>
+#
+# Compares the home page search before (icontains on every term) and after
+# the full-text index (core.search), on synthetic auctions. For each query
+# prints the time to count the matches and to load the first page, as the
+# paginated home page does. All the rows created are removed at the end.
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.utils import timezone
+
+from datetime import timedelta
+from itertools import accumulate
+from typing import List
+import logging
+import random
+import time
+
+
+logger = logging.getLogger('custom')
+
+
+from accounts.models import User, Role, Seller
+from auctions.models import Auction
+from core import search
+from core.signals import unindex_auction
+
+
+SYLLABLES = "ka lo mi ne ru ta vi so pe da gu ri mo ze la fi no be tu sa".split()
+
+PAGE_SIZE = 15
+
+
+def vocabulary(size: int) -> List[str]:
+    rng = random.Random(7)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+# Word frequencies follow Zipf's law, as in real listings
+VOCABULARY = vocabulary(20000)
+WEIGHTS = list(accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+# Common, medium and rare words, several terms, a prefix and no match
+QUERIES = [
+    VOCABULARY[5],
+    VOCABULARY[500],
+    VOCABULARY[10000],
+    f"{VOCABULARY[20]} {VOCABULARY[300]}",
+    VOCABULARY[500][:4],
+    "zeppelin",
+]
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, cum_weights=WEIGHTS, k=words))
+
+
+@transaction.atomic
+def setup(auctions: int) -> List[int]:
+    seller_user = User.objects.create_user(email="bench.seller@graba.test", username="bench_seller")
+    seller_role = Role.objects.create(user=seller_user, type="SELLER")
+    seller = Seller.objects.create(role=seller_role, collection_address="-")
+
+    rng = random.Random(42)
+    now = timezone.now()
+    ids = []
+    for i in range(0, auctions, 10000):
+        created = Auction.objects.bulk_create([
+            Auction(
+                seller=seller,
+                title=text(rng, 4),
+                description=text(rng, 40),
+                technical_details=text(rng, 10),
+                status="OPEN",
+                start_date=now - timedelta(days=1),
+                end_date=now + timedelta(days=7),
+                min_price_cents=100,
+            )
+            for _ in range(min(10000, auctions - i))
+        ])
+        ids.extend(auction.pk for auction in created)
+
+    # bulk_create sends no signals
+    search.rebuild()
+    return ids
+
+
+@transaction.atomic
+def teardown(auction_ids: List[int]):
+    # One statement per batch instead of one post_delete per auction
+    search.remove(auction_ids)
+    post_delete.disconnect(unindex_auction, sender=Auction)
+    try:
+        User.objects.filter(email__endswith="@graba.test", username__startswith="bench_").delete()
+    finally:
+        post_delete.connect(unindex_auction, sender=Auction)
+
+
+def timed(queryset, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        total = queryset.count()
+        list(queryset[:PAGE_SIZE])
+    return total, (time.perf_counter() - start) / repeat
+
+
+def run(*args):
+    # runscript entry point
+    auctions = int(args[0]) if len(args) > 0 else 1000000
+    repeat = int(args[1]) if len(args) > 1 else 5
+
+    start = time.perf_counter()
+    auction_ids = setup(auctions)
+    logger.info(f"{auctions} auctions created and indexed in {time.perf_counter() - start:.1f}s")
+
+    try:
+        fallback = search.FallbackBackend(Auction)
+        backend = search.get_backend()
+
+        for q in QUERIES:
+            queryset = Auction.objects.all()
+
+            before, before_time = timed(fallback.search(queryset, q).order_by("-start_date", "title"), repeat)
+            after, after_time = timed(backend.search(queryset, q).order_by("-search_rank", "pk"), repeat)
+
+            logger.info(
+                f"{q!r:>20}: icontains {before} matches in {before_time * 1000:.1f}ms, "
+                f"{backend.__class__.__name__} {after} matches in {after_time * 1000:.1f}ms "
+                f"({before_time / after_time:.1f}x)"
+            )
+    finally:
+        teardown(auction_ids)